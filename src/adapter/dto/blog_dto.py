@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List
+from typing import List, Optional
 
 class VisitorStats(BaseModel):
     today_visitor: int
@@ -16,8 +16,13 @@ class PostDetail(PostSummary):
     thumbnail_url: HttpUrl
     category: str
 
+class PostPageResponse(BaseModel):
+    posts: List[PostDetail] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
 class GetBlogMainResponse(BaseModel):
     all_posts: List[PostDetail] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
     popular_posts: List[PostSummary] = Field(default_factory=list)
     latest_posts: List[PostSummary] = Field(default_factory=list)
     visitor_stats: List[VisitorStats] = Field(default_factory=list)
\ No newline at end of file
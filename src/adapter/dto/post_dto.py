@@ -2,6 +2,11 @@ from core.domain import Post,Category
 from infrastructure.sqlalchemy.model import Post as PostEntity
 from pydantic import BaseModel, Field, HttpUrl
 from typing import Annotated
+from datetime import datetime
+
+def format_date(value: datetime) -> str:
+    # Same output as strftime("%Y-%m-%d") at a fraction of the cost, this runs once per post per listing
+    return value.date().isoformat()
 
 class PostCreateRequest(BaseModel):
     title: str = Field(min_length=1, max_length=255)
@@ -35,7 +40,7 @@ class PostCreateResponse(BaseModel):
             title=post.title,
             summary=post.summary,
             content=post.content,
-            created_at=post.created_at.strftime("%Y-%m-%d"),
+            created_at=format_date(post.created_at),
             likes_count=post.likes_count,
             category = post.category,
             thumbnail_url = post.thumbnail_url
@@ -66,7 +71,7 @@ class PostUpdateResponse(BaseModel):
             title=post.title,
             summary=post.summary,
             content=post.content,
-            created_at=post.created_at.strftime("%Y-%m-%d"),
+            created_at=format_date(post.created_at),
             likes_count=post.likes_count,
             category = post.category,
             thumbnail_url = post.thumbnail_url
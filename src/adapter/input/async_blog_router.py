@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from port.input.async_post_app_service import AsyncPostApplicationService
+from port.input.async_visit_app_service import AsyncVisitApplicationService
+from adapter.input.async_dependency import get_post_application_service, get_visit_application_service
+from adapter.dto.visit_dto import VisitCreateRequest
+from adapter.dto.blog_dto import GetBlogMainResponse
+from adapter.input.conditional import BLOG_CACHE_CONTROL, is_not_modified, validator_headers, not_modified_response
+from core.validator import homepage_validator
+from infrastructure.slowapi.config import limiter
+from infrastructure.sqlalchemy.query_budget import query_budget
+
+router = APIRouter()
+
+@router.get(path='/blog',
+            status_code=status.HTTP_200_OK,
+            responses={
+                304: {"description": "Not Modified"},
+                400: {"description": "Bad Request - Invalid Input"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=GetBlogMainResponse)
+@query_budget(4)
+@limiter.limit("30/minute") 
+async def get_blog_main(request: Request,
+                visit_app_service: AsyncVisitApplicationService = Depends(get_visit_application_service), 
+                post_app_service: AsyncPostApplicationService = Depends(get_post_application_service)):
+    try:
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        client_ip = forwarded_for.split(",")[0].strip() if forwarded_for else request.client.host
+
+        await visit_app_service.create_visit(VisitCreateRequest(visitor_ip=client_ip))
+
+        homepage_posts = await post_app_service.get_homepage_posts()
+        visitor_stats = await visit_app_service.get_visitor_stats()
+
+        validator = homepage_validator(homepage_posts["stamp"], visitor_stats)
+        if is_not_modified(request, validator):
+            return not_modified_response(validator, BLOG_CACHE_CONTROL)
+
+        # Sections are trusted DB-origin dicts, serialized once by orjson without another pydantic pass
+        return ORJSONResponse({
+            "all_posts": homepage_posts["all_posts"],
+            "next_cursor": homepage_posts["next_cursor"],
+            "popular_posts": homepage_posts["popular_posts"],
+            "latest_posts": homepage_posts["latest_posts"],
+            "visitor_stats": [visitor_stats]
+        }, headers=validator_headers(validator, BLOG_CACHE_CONTROL))
+
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except KeyError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing required field: {str(err)}") from err
+    except HTTPException as http_ex:
+        raise http_ex 
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error - {str(e)}") from e
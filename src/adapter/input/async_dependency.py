@@ -0,0 +1,36 @@
+from fastapi import Depends, Request
+from infrastructure.sqlalchemy.async_config import AsyncSessionLocal, AsyncReadSessionLocal
+from infrastructure.sqlalchemy.unit_of_work import AsyncUnitOfWork
+from adapter.input.dependency import report_pool_wait
+from adapter.output.async_post_repository_impl import AsyncPostRepositoryImpl
+from adapter.output.async_visit_repository_impl import AsyncVisitRepositoryImpl
+from core.async_usecase import AsyncPostUseCase, AsyncVisitUseCase
+from port.input.async_post_app_service import AsyncPostApplicationService
+from port.input.async_visit_app_service import AsyncVisitApplicationService
+
+async def get_unit_of_work(request: Request):
+    """One session per request, FastAPI caches the dependency so every service in the request shares it"""
+    uow = AsyncUnitOfWork(AsyncSessionLocal, read_session_factory=AsyncReadSessionLocal)
+    try:
+        async with uow:
+            yield uow
+    finally:
+        report_pool_wait(request, uow)
+
+async def get_read_only_unit_of_work(request: Request):
+    uow = AsyncUnitOfWork(AsyncSessionLocal, read_only=True, read_session_factory=AsyncReadSessionLocal)
+    try:
+        async with uow:
+            yield uow
+    finally:
+        report_pool_wait(request, uow)
+
+async def get_post_application_service(uow: AsyncUnitOfWork = Depends(get_unit_of_work)) -> AsyncPostApplicationService:
+    """Provide AsyncPostApplicationService instance"""
+    return AsyncPostApplicationService(AsyncPostUseCase(AsyncPostRepositoryImpl(uow.session, uow.read_session)))
+
+async def get_read_only_post_application_service(uow: AsyncUnitOfWork = Depends(get_read_only_unit_of_work)) -> AsyncPostApplicationService:
+    return AsyncPostApplicationService(AsyncPostUseCase(AsyncPostRepositoryImpl(uow.session, uow.read_session)))
+
+async def get_visit_application_service(uow: AsyncUnitOfWork = Depends(get_unit_of_work)) -> AsyncVisitApplicationService:
+    return AsyncVisitApplicationService(AsyncVisitUseCase(AsyncVisitRepositoryImpl(uow.session, uow.read_session)))
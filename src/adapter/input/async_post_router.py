@@ -0,0 +1,220 @@
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Request, Query
+from fastapi.responses import ORJSONResponse
+from typing import Dict, List
+from core.domain import Category
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse, PostDetailResponse
+from adapter.dto.blog_dto import PostPageResponse, PostSummary
+from adapter.input.conditional import POST_DETAIL_CACHE_CONTROL, is_conditional, is_not_modified, validator_headers, not_modified_response
+from port.input.async_post_app_service import AsyncPostApplicationService
+from adapter.input.async_dependency import get_post_application_service, get_read_only_post_application_service
+from adapter.input.post_router import check_global_rate_limit
+from infrastructure.slowapi.config import limiter
+from infrastructure.sqlalchemy.query_budget import query_budget
+from infrastructure.env_variable import POST_PAGE_SIZE, SEARCH_PAGE_SIZE
+import asyncio
+
+router = APIRouter(prefix="/posts")
+
+@router.post("",
+            status_code=status.HTTP_201_CREATED,
+            responses={
+                400: {"description": "Bad Request - Invalid Input"},
+                403: {"description": "Authentication Code Error"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=PostCreateResponse)
+@query_budget(2)
+@limiter.limit("5/minute") 
+async def create_post(request: Request, post_create_request: PostCreateRequest, service: AsyncPostApplicationService = Depends(get_post_application_service)):
+    """Create a new post"""
+    try:
+        post_create_response = await service.create_post(post_create_request)
+        # Returning the response directly skips FastAPI re-validating the DTO against response_model
+        return ORJSONResponse(post_create_response.model_dump(mode="json"), status_code=status.HTTP_201_CREATED)
+    except HTTPException as err:
+        raise err
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.delete("/{post_id}",
+            status_code=status.HTTP_200_OK,
+            responses={
+                403: {"description": "Authentication Code Error"},
+                404: {"description": "Post Not Found"},
+                500: {"description": "Internal Server Error"},
+            })
+@query_budget(2)
+@limiter.limit("3/minute") 
+async def delete_post(request: Request, post_id: str, authentication_code=Header(None, convert_underscores=False), service: AsyncPostApplicationService = Depends(get_post_application_service)):
+    """Delete a post by ID"""
+    try:
+        await service.delete_post(post_id, authentication_code)
+        return {"message": "Post deleted successfully."}
+    except HTTPException as err:
+        raise err
+    except KeyError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Missing authentication code: {str(err)}") from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.patch("/{post_id}",
+            status_code=status.HTTP_200_OK,
+            responses={
+                400: {"description": "Bad Request - Invalid Input"},
+                403: {"description": "Authentication Code Error"},
+                404: {"description": "Post Not Found"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=PostUpdateResponse)
+@query_budget(3)
+@limiter.limit("10/minute") 
+async def update_post(request: Request, post_id: str, post_update_request: PostUpdateRequest, service: AsyncPostApplicationService = Depends(get_post_application_service)):
+    """Update an existing post"""
+    try:
+        return ORJSONResponse((await service.update_post(post_id, post_update_request)).model_dump(mode="json"))
+    except HTTPException as err:
+        raise err
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("",
+            status_code=status.HTTP_200_OK,
+            responses={
+                400: {"description": "Bad Request - Invalid Cursor"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=PostPageResponse)
+@query_budget(1)
+@limiter.limit("50/minute") 
+async def get_post_page(request: Request,
+                limit: int = Query(default=POST_PAGE_SIZE, ge=1, le=100),
+                cursor: str | None = Query(default=None),
+                category: Category | None = Query(default=None),
+                service: AsyncPostApplicationService = Depends(get_read_only_post_application_service)):
+    """Retrieve posts newest first, one keyset page at a time, optionally from one category"""
+    try:
+        return ORJSONResponse(await service.get_post_page(limit, cursor, category))
+    except HTTPException as err:
+        raise err
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/search",
+            status_code=status.HTTP_200_OK,
+            responses={
+                422: {"description": "Validation Error - Empty Query"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=List[PostSummary])
+@query_budget(1)
+@limiter.limit("50/minute") 
+async def search_posts(request: Request,
+                q: str = Query(min_length=1, max_length=100),
+                limit: int = Query(default=SEARCH_PAGE_SIZE, ge=1, le=50),
+                service: AsyncPostApplicationService = Depends(get_read_only_post_application_service)):
+    """Search title, summary and content, best BM25 match first"""
+    try:
+        return ORJSONResponse(await service.search_posts(q, limit))
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/categories",
+            status_code=status.HTTP_200_OK,
+            responses={
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=Dict[str, int])
+@query_budget(1)
+@limiter.limit("50/minute") 
+async def get_category_counts(request: Request, service: AsyncPostApplicationService = Depends(get_read_only_post_application_service)):
+    """Count posts per category, served from memory"""
+    try:
+        return ORJSONResponse(await service.get_category_counts())
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/cache-stats",
+            status_code=status.HTTP_200_OK,
+            responses={
+                403: {"description": "Authentication Code Error"},
+                500: {"description": "Internal Server Error"},
+            },
+            include_in_schema=False)
+@query_budget(0)
+async def get_detail_cache_stats(authentication_code=Header(None, convert_underscores=False), service: AsyncPostApplicationService = Depends(get_read_only_post_application_service)):
+    """Report post detail cache counters, for sizing POST_DETAIL_CACHE_SIZE and POST_DETAIL_CACHE_TTL_SECONDS"""
+    try:
+        return await service.get_detail_cache_stats(authentication_code)
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/{post_id}",
+            status_code=status.HTTP_200_OK,
+            responses={
+                304: {"description": "Not Modified"},
+                404: {"description": "Post Not Found"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=PostDetailResponse)
+@query_budget(1)
+@limiter.limit("50/minute") 
+async def get_post_detail(request: Request, post_id: str, service: AsyncPostApplicationService = Depends(get_read_only_post_application_service)):
+    """Retrieve post details by ID, answering 304 from the post version alone when the client copy is current"""
+    try:
+        if is_conditional(request):
+            validator = await service.get_post_validator(post_id)
+            if is_not_modified(request, validator):
+                return not_modified_response(validator, POST_DETAIL_CACHE_CONTROL)
+        
+        post_detail, validator = await service.get_post_detail_with_validator(post_id)
+        return ORJSONResponse(post_detail, headers=validator_headers(validator, POST_DETAIL_CACHE_CONTROL))
+    except HTTPException as err:
+        raise err
+    except KeyError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid post ID: {str(err)}") from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.post("/{post_id}/likes",
+            status_code=status.HTTP_200_OK,
+            responses={
+                404: {"description": "Post Not Found"},
+                429: {"description": "Too Many Request"},
+                500: {"description": "Internal Server Error"},
+            })
+@query_budget(0)
+@limiter.limit("10/minute") 
+async def add_like_post(request: Request, post_id: str, service: AsyncPostApplicationService = Depends(get_post_application_service)):
+    """Add a like to a post"""
+    # The limiter storage may be a SQLite file or a RESP server, so the blocking hit runs on a worker thread
+    await asyncio.to_thread(check_global_rate_limit)
+    try:
+        await service.add_like_post(post_id)
+        return {"message": "Added like successfully"}
+    except HTTPException as err:
+        raise err
+    except KeyError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid post ID: {str(err)}") from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
\ No newline at end of file
@@ -1,45 +1,28 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, status
-from infrastructure.sqlalchemy.config import SessionLocal
-from adapter.output.post_repository_impl import PostRepositoryImpl
-from adapter.output.visit_repository_impl import VisitRepositoryImpl
-from core.usecase import PostUseCase, VisitUseCase
+from fastapi.responses import ORJSONResponse
 from port.input.post_app_service import PostApplicationService
 from port.input.visit_app_service import VisitApplicationService
+from adapter.input.dependency import get_post_application_service, get_visit_application_service
 from adapter.dto.visit_dto import VisitCreateRequest
-from adapter.dto.blog_dto import GetBlogMainResponse, VisitorStats
+from adapter.dto.blog_dto import GetBlogMainResponse
+from adapter.input.conditional import BLOG_CACHE_CONTROL, is_not_modified, validator_headers, not_modified_response
+from core.validator import homepage_validator
 from infrastructure.slowapi.config import limiter
+from infrastructure.sqlalchemy.query_budget import query_budget
 
 router = APIRouter()
 
-def get_visit_application_service():
-    db = SessionLocal()
-    try:
-        adapter = VisitRepositoryImpl(db)
-        usecase = VisitUseCase(adapter)
-        service = VisitApplicationService(usecase)
-        yield service
-    finally:
-        db.close()
-
-def get_post_application_service():
-    db = SessionLocal()
-    try:
-        adapter = PostRepositoryImpl(db)
-        usecase = PostUseCase(adapter)
-        service = PostApplicationService(usecase)
-        yield service
-    finally:
-        db.close()
-
 @router.get(path='/blog',
             status_code=status.HTTP_200_OK,
             responses={
+                304: {"description": "Not Modified"},
                 400: {"description": "Bad Request - Invalid Input"},
                 500: {"description": "Internal Server Error"},
             },
             response_model=GetBlogMainResponse)
+@query_budget(4)
 @limiter.limit("30/minute") 
-def get_blog_main(request: Request, 
+def get_blog_main(request: Request,
                 visit_app_service: VisitApplicationService = Depends(get_visit_application_service), 
                 post_app_service: PostApplicationService = Depends(get_post_application_service)):
     try:
@@ -48,19 +31,21 @@ def get_blog_main(request: Request,
 
         visit_app_service.create_visit(VisitCreateRequest(visitor_ip=client_ip))
 
-        all_posts = post_app_service.get_all_post() or []
-        popular_posts = post_app_service.get_popular_posts() or []
-        latest_posts = post_app_service.get_latest_posts() or []
+        homepage_posts = post_app_service.get_homepage_posts()
         visitor_stats = visit_app_service.get_visitor_stats()
 
-        sanitized_data = {
-            "all_posts": all_posts if all_posts is not None else [],
-            "popular_posts": popular_posts if popular_posts is not None else [],
-            "latest_posts": latest_posts if latest_posts is not None else [],
-            "visitor_stats": [VisitorStats(**visitor_stats)] if isinstance(visitor_stats, dict) else visitor_stats or []
-        }
-
-        return GetBlogMainResponse(**sanitized_data)
+        validator = homepage_validator(homepage_posts["stamp"], visitor_stats)
+        if is_not_modified(request, validator):
+            return not_modified_response(validator, BLOG_CACHE_CONTROL)
+
+        # Sections are trusted DB-origin dicts, serialized once by orjson without another pydantic pass
+        return ORJSONResponse({
+            "all_posts": homepage_posts["all_posts"],
+            "next_cursor": homepage_posts["next_cursor"],
+            "popular_posts": homepage_posts["popular_posts"],
+            "latest_posts": homepage_posts["latest_posts"],
+            "visitor_stats": [visitor_stats]
+        }, headers=validator_headers(validator, BLOG_CACHE_CONTROL))
 
     except ValueError as err:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
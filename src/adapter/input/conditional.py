@@ -0,0 +1,42 @@
+from fastapi import Request, status
+from fastapi.responses import Response
+from core.validator import Validator
+from infrastructure.env_variable import POST_DETAIL_MAX_AGE
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+
+# /blog records a visit on every request, so shared caches must always come back to revalidate
+BLOG_CACHE_CONTROL = "no-cache"
+POST_DETAIL_CACHE_CONTROL = f"public, max-age={POST_DETAIL_MAX_AGE}, must-revalidate"
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """RFC 9110 evaluation for GET: If-None-Match wins over If-Modified-Since when both are sent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # GET compares weakly, so a W/ prefix added by a proxy still matches
+        return any(tag.strip().removeprefix("W/") == validator.etag for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validator.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validator.last_modified.replace(tzinfo=timezone.utc) <= since
+
+def validator_headers(validator: Validator, cache_control: str) -> dict:
+    headers = {"ETag": validator.etag, "Cache-Control": cache_control}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(validator.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+def not_modified_response(validator: Validator, cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(validator, cache_control))
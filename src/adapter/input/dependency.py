@@ -0,0 +1,77 @@
+from datetime import date
+from fastapi import Depends, Request
+from infrastructure.sqlalchemy.config import SessionLocal, ReadSessionLocal
+from infrastructure.sqlalchemy.unit_of_work import UnitOfWork
+from infrastructure.env_variable import DB_POOL_WAIT_WARN_MS
+from infrastructure.log.logger import logger
+from adapter.output.post_repository_impl import PostRepositoryImpl
+from adapter.output.visit_repository_impl import VisitRepositoryImpl
+from core.usecase import PostUseCase, VisitUseCase
+from port.input.post_app_service import PostApplicationService
+from port.input.visit_app_service import VisitApplicationService
+from infrastructure.cache.invalidation_bus import PostChanged, POST_LIKED, evict_post_caches
+from infrastructure.visit.ingest_buffer import visit_ingest_buffer
+
+def report_pool_wait(request: Request, uow: UnitOfWork) -> None:
+    request.state.pool_wait = uow.pool_wait
+    wait_ms = uow.pool_wait * 1000
+    if wait_ms >= DB_POOL_WAIT_WARN_MS:
+        logger.warning(f"⚠️ Waited {wait_ms:.1f}ms for a pooled connection on {request.method} {request.url.path}")
+
+def get_unit_of_work(request: Request):
+    """One session per request, FastAPI caches the dependency so every service in the request shares it"""
+    uow = UnitOfWork(SessionLocal, read_session_factory=ReadSessionLocal)
+    try:
+        with uow:
+            yield uow
+    finally:
+        report_pool_wait(request, uow)
+
+def get_read_only_unit_of_work(request: Request):
+    uow = UnitOfWork(SessionLocal, read_only=True, read_session_factory=ReadSessionLocal)
+    try:
+        with uow:
+            yield uow
+    finally:
+        report_pool_wait(request, uow)
+
+def get_post_application_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> PostApplicationService:
+    """Provide PostApplicationService instance"""
+    return PostApplicationService(PostUseCase(PostRepositoryImpl(uow.session, uow.read_session)))
+
+def get_read_only_post_application_service(uow: UnitOfWork = Depends(get_read_only_unit_of_work)) -> PostApplicationService:
+    return PostApplicationService(PostUseCase(PostRepositoryImpl(uow.session, uow.read_session)))
+
+def get_visit_application_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> VisitApplicationService:
+    return VisitApplicationService(VisitUseCase(VisitRepositoryImpl(uow.session, uow.read_session)))
+
+def flush_like_buffer(deltas: dict) -> None:
+    with UnitOfWork(SessionLocal) as uow:
+        PostUseCase(PostRepositoryImpl(uow.session)).save_likes(deltas)
+
+def flush_visit_buffer(rows: list) -> None:
+    with UnitOfWork(SessionLocal) as uow:
+        VisitUseCase(VisitRepositoryImpl(uow.session)).save_visits(rows)
+
+def load_visitor_ips(visit_date: date) -> list:
+    with UnitOfWork(SessionLocal, read_only=True) as uow:
+        return VisitUseCase(VisitRepositoryImpl(uow.session)).get_visitor_ips(visit_date)
+
+def sync_search_index() -> int:
+    with UnitOfWork(SessionLocal, read_only=True) as uow:
+        return PostUseCase(PostRepositoryImpl(uow.session)).sync_search_index()
+
+def prime_hot_paths() -> None:
+    """Fill the homepage snapshot and category counts and load today's visitors, the first requests would pay for them"""
+    with UnitOfWork(SessionLocal, read_only=True, read_session_factory=ReadSessionLocal) as uow:
+        post_usecase = PostUseCase(PostRepositoryImpl(uow.session))
+        post_usecase.get_homepage_posts()
+        post_usecase.get_category_counts()
+    visit_ingest_buffer.prime()
+
+def apply_remote_post_change(event: PostChanged) -> None:
+    """Bus handler: evict what another worker's write made stale and re-index the posts it edited"""
+    evict_post_caches(event)
+    if event.kind != POST_LIKED and event.post_ids:
+        with UnitOfWork(SessionLocal, read_only=True) as uow:
+            PostUseCase(PostRepositoryImpl(uow.session)).reindex_posts(event.post_ids)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+from infrastructure.startup.readiness import readiness
+from infrastructure.sqlalchemy.query_budget import query_budget
+
+router = APIRouter(include_in_schema=False)
+
+# Probes are async so a saturated threadpool cannot make a healthy worker look dead
+
+@router.get("/healthz", status_code=status.HTTP_200_OK)
+@query_budget(0)
+async def get_liveness():
+    """The process is up and serving, warm or not"""
+    return {"status": "ok"}
+
+@router.get("/readyz",
+            status_code=status.HTTP_200_OK,
+            responses={
+                503: {"description": "Warmup Not Finished"},
+            })
+@query_budget(0)
+async def get_readiness():
+    """Ready once pools are open, hot caches are filled and the search index is loaded"""
+    snapshot = readiness.snapshot()
+    return ORJSONResponse(snapshot, status_code=status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE)
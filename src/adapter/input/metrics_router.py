@@ -0,0 +1,18 @@
+from fastapi import APIRouter, status, HTTPException, Header
+from fastapi.responses import PlainTextResponse
+from infrastructure.env_variable import METRICS_TOKEN
+from infrastructure.metrics.registry import metrics_registry
+import hmac
+
+router = APIRouter(include_in_schema=False)
+
+@router.get("/metrics",
+            status_code=status.HTTP_200_OK,
+            responses={
+                403: {"description": "Metrics Token Error"},
+            })
+def get_metrics(authorization: str | None = Header(None)):
+    """Prometheus text exposition of this worker's metrics, guarded by `Authorization: Bearer $METRICS_TOKEN` when set"""
+    if METRICS_TOKEN and (authorization is None or not hmac.compare_digest(authorization, f"Bearer {METRICS_TOKEN}")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics token not correct.")
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, status, HTTPException, Header, Query
+from infrastructure.env_variable import AUTHENTICATION_CODE
+from infrastructure.sentry.profiling import on_demand_profiler, MAX_PROFILE_SECONDS
+from infrastructure.sentry.tracing import traces_sampler
+import hmac
+
+router = APIRouter(prefix="/ops", include_in_schema=False)
+
+def verify_authentication_code(authentication_code: str | None) -> None:
+    if authentication_code is None or not hmac.compare_digest(authentication_code, AUTHENTICATION_CODE):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Authentication code not correct.")
+
+@router.post("/profiler",
+             status_code=status.HTTP_200_OK,
+             responses={
+                 400: {"description": "Bad Request - Profiling Disabled"},
+                 403: {"description": "Authentication Code Error"},
+             })
+def start_profiler(seconds: int = Query(default=60, ge=1, le=MAX_PROFILE_SECONDS),
+                   authentication_code=Header(None, convert_underscores=False)):
+    """Profile the worker that serves this request for `seconds`, other workers are not affected"""
+    verify_authentication_code(authentication_code)
+    try:
+        return {"running": True, "seconds": on_demand_profiler.start(seconds)}
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+
+@router.delete("/profiler",
+               status_code=status.HTTP_200_OK,
+               responses={
+                   403: {"description": "Authentication Code Error"},
+               })
+def stop_profiler(authentication_code=Header(None, convert_underscores=False)):
+    verify_authentication_code(authentication_code)
+    on_demand_profiler.stop()
+    return {"running": False}
+
+@router.get("/tracing",
+            status_code=status.HTTP_200_OK,
+            responses={
+                403: {"description": "Authentication Code Error"},
+            })
+def get_tracing_stats(authentication_code=Header(None, convert_underscores=False)):
+    """Report how many transactions this worker traced and how many the per-second cap turned away"""
+    verify_authentication_code(authentication_code)
+    return {"sampled": traces_sampler.sampled, "capped": traces_sampler.capped, "profiling": on_demand_profiler.running}
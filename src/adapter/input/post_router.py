@@ -1,44 +1,26 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Header, Request
-from core.usecase import PostUseCase
-from adapter.output.post_repository_impl import PostRepositoryImpl
-from infrastructure.sqlalchemy.config import SessionLocal
+from fastapi import APIRouter, Depends, status, HTTPException, Header, Request, Query
+from fastapi.responses import ORJSONResponse
+from typing import Dict, List
+from core.domain import Category
 from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse, PostDetailResponse
+from adapter.dto.blog_dto import PostPageResponse, PostSummary
+from adapter.input.conditional import POST_DETAIL_CACHE_CONTROL, is_conditional, is_not_modified, validator_headers, not_modified_response
 from port.input.post_app_service import PostApplicationService
+from adapter.input.dependency import get_post_application_service, get_read_only_post_application_service
 from infrastructure.slowapi.config import limiter
-from cachetools import TTLCache
-from time import time
+from infrastructure.sqlalchemy.query_budget import query_budget
+from infrastructure.env_variable import POST_PAGE_SIZE, SEARCH_PAGE_SIZE
+from limits import parse
 
 router = APIRouter(prefix="/posts")
 
-global_request_limit = TTLCache(maxsize=1000, ttl=3600)
+GLOBAL_LIKE_LIMIT = parse("10/hour")
 
 def check_global_rate_limit():
-    """Check global request rate limit (Max: 10 requests per hour)"""
-    current_time = int(time())
-
-    if "requests" not in global_request_limit:
-        global_request_limit["requests"] = []
-
-    # Filter requests within the last hour
-    recent_requests = [t for t in global_request_limit["requests"] if t > current_time - 3600]
-    recent_requests.append(current_time)
-
-    if len(recent_requests) > 10:
+    """Check global request rate limit (Max: 10 requests per hour), shared by every worker through the limiter storage"""
+    if not limiter.limiter.hit(GLOBAL_LIKE_LIMIT, "global", "likes"):
         raise HTTPException(status_code=429, detail="Too many overall requests, up to 10 requests per hour")
 
-    global_request_limit["requests"] = recent_requests
-
-def get_post_application_service():
-    """Provide PostApplicationService instance"""
-    db = SessionLocal()
-    try:
-        adapter = PostRepositoryImpl(db)
-        usecase = PostUseCase(adapter)
-        service = PostApplicationService(usecase)
-        yield service
-    finally:
-        db.close()
-
 @router.post("",
             status_code=status.HTTP_201_CREATED,
             responses={
@@ -47,11 +29,14 @@ def get_post_application_service():
                 500: {"description": "Internal Server Error"},
             },
             response_model=PostCreateResponse)
+@query_budget(2)
 @limiter.limit("5/minute") 
 def create_post(request: Request, post_create_request: PostCreateRequest, service: PostApplicationService = Depends(get_post_application_service)):
     """Create a new post"""
     try:
-        return service.create_post(post_create_request)
+        post_create_response = service.create_post(post_create_request)
+        # Returning the response directly skips FastAPI re-validating the DTO against response_model
+        return ORJSONResponse(post_create_response.model_dump(mode="json"), status_code=status.HTTP_201_CREATED)
     except HTTPException as err:
         raise err
     except ValueError as err:
@@ -67,6 +52,7 @@ def create_post(request: Request, post_create_request: PostCreateRequest, servic
                 404: {"description": "Post Not Found"},
                 500: {"description": "Internal Server Error"},
             })
+@query_budget(2)
 @limiter.limit("3/minute") 
 def delete_post(request: Request, post_id: str, authentication_code=Header(None, convert_underscores=False), service: PostApplicationService = Depends(get_post_application_service)):
     """Delete a post by ID"""
@@ -90,11 +76,37 @@ def delete_post(request: Request, post_id: str, authentication_code=Header(None,
                 500: {"description": "Internal Server Error"},
             },
             response_model=PostUpdateResponse)
+@query_budget(3)
 @limiter.limit("10/minute") 
 def update_post(request: Request, post_id: str, post_update_request: PostUpdateRequest, service: PostApplicationService = Depends(get_post_application_service)):
     """Update an existing post"""
     try:
-        return service.update_post(post_id, post_update_request)
+        return ORJSONResponse(service.update_post(post_id, post_update_request).model_dump(mode="json"))
+    except HTTPException as err:
+        raise err
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("",
+            status_code=status.HTTP_200_OK,
+            responses={
+                400: {"description": "Bad Request - Invalid Cursor"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=PostPageResponse)
+@query_budget(1)
+@limiter.limit("50/minute") 
+def get_post_page(request: Request,
+                limit: int = Query(default=POST_PAGE_SIZE, ge=1, le=100),
+                cursor: str | None = Query(default=None),
+                category: Category | None = Query(default=None),
+                service: PostApplicationService = Depends(get_read_only_post_application_service)):
+    """Retrieve posts newest first, one keyset page at a time, optionally from one category"""
+    try:
+        return ORJSONResponse(service.get_post_page(limit, cursor, category))
     except HTTPException as err:
         raise err
     except ValueError as err:
@@ -103,18 +115,84 @@ def update_post(request: Request, post_id: str, post_update_request: PostUpdateR
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail=f"Internal Server Error - {str(err)}") from err
 
+@router.get("/search",
+            status_code=status.HTTP_200_OK,
+            responses={
+                422: {"description": "Validation Error - Empty Query"},
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=List[PostSummary])
+@query_budget(1)
+@limiter.limit("50/minute") 
+def search_posts(request: Request,
+                q: str = Query(min_length=1, max_length=100),
+                limit: int = Query(default=SEARCH_PAGE_SIZE, ge=1, le=50),
+                service: PostApplicationService = Depends(get_read_only_post_application_service)):
+    """Search title, summary and content, best BM25 match first"""
+    try:
+        return ORJSONResponse(service.search_posts(q, limit))
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/categories",
+            status_code=status.HTTP_200_OK,
+            responses={
+                500: {"description": "Internal Server Error"},
+            },
+            response_model=Dict[str, int])
+@query_budget(1)
+@limiter.limit("50/minute") 
+def get_category_counts(request: Request, service: PostApplicationService = Depends(get_read_only_post_application_service)):
+    """Count posts per category, served from memory"""
+    try:
+        return ORJSONResponse(service.get_category_counts())
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
+@router.get("/cache-stats",
+            status_code=status.HTTP_200_OK,
+            responses={
+                403: {"description": "Authentication Code Error"},
+                500: {"description": "Internal Server Error"},
+            },
+            include_in_schema=False)
+@query_budget(0)
+def get_detail_cache_stats(authentication_code=Header(None, convert_underscores=False), service: PostApplicationService = Depends(get_read_only_post_application_service)):
+    """Report post detail cache counters, for sizing POST_DETAIL_CACHE_SIZE and POST_DETAIL_CACHE_TTL_SECONDS"""
+    try:
+        return service.get_detail_cache_stats(authentication_code)
+    except HTTPException as err:
+        raise err
+    except Exception as err:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Internal Server Error - {str(err)}") from err
+
 @router.get("/{post_id}",
             status_code=status.HTTP_200_OK,
             responses={
+                304: {"description": "Not Modified"},
                 404: {"description": "Post Not Found"},
                 500: {"description": "Internal Server Error"},
             },
             response_model=PostDetailResponse)
+@query_budget(1)
 @limiter.limit("50/minute") 
-def get_post_detail(request: Request, post_id: str, service: PostApplicationService = Depends(get_post_application_service)):
-    """Retrieve post details by ID"""
+def get_post_detail(request: Request, post_id: str, service: PostApplicationService = Depends(get_read_only_post_application_service)):
+    """Retrieve post details by ID, answering 304 from the post version alone when the client copy is current"""
     try:
-        return service.get_post_detail(post_id)
+        if is_conditional(request):
+            validator = service.get_post_validator(post_id)
+            if is_not_modified(request, validator):
+                return not_modified_response(validator, POST_DETAIL_CACHE_CONTROL)
+        
+        post_detail, validator = service.get_post_detail_with_validator(post_id)
+        return ORJSONResponse(post_detail, headers=validator_headers(validator, POST_DETAIL_CACHE_CONTROL))
     except HTTPException as err:
         raise err
     except KeyError as err:
@@ -130,6 +208,7 @@ def get_post_detail(request: Request, post_id: str, service: PostApplicationServ
                 429: {"description": "Too Many Request"},
                 500: {"description": "Internal Server Error"},
             })
+@query_budget(0)
 @limiter.limit("10/minute") 
 def add_like_post(request: Request, post_id: str, service: PostApplicationService = Depends(get_post_application_service)):
     """Add a like to a post"""
@@ -0,0 +1,119 @@
+from port.output.async_post_repository import AsyncPostRepository
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from infrastructure.sqlalchemy.model import Post as PostEntity
+from fastapi import HTTPException, status
+from infrastructure.log.logger import logger
+from infrastructure.sqlalchemy.query_timing import label_statements
+from core.pagination import PostCursor
+from adapter.output.post_repository_impl import POST_SUMMARY_COLUMNS, homepage_rows_statement, posts_page_statement, category_counts_statement
+
+@label_statements
+class AsyncPostRepositoryImpl(AsyncPostRepository):
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
+        self.db = db
+        self.read_db = read_db or db
+        
+    async def save(self, post: PostEntity) -> PostEntity:        
+        try:
+            self.db.add(post)
+            await self.db.commit()
+            await self.db.refresh(post)
+            return post
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"❌ Database error in save(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - DB Operation Failed"
+            )
+    
+    async def find_by_id(self, post_id: str) -> PostEntity:
+        post = (await self.db.execute(select(PostEntity).where(PostEntity.id == post_id))).scalar_one_or_none()
+        if post is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        return post
+
+    async def find_version_by_id(self, post_id: str):
+        row = (await self.db.execute(select(PostEntity.version, PostEntity.updated_at).where(PostEntity.id == post_id))).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        return row
+
+    async def delete_by_id(self, post_id: str) -> str:
+        post = await self.find_by_id(post_id)
+        category = post.category
+        try:
+            await self.db.delete(post)
+            await self.db.commit()
+            return category
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(f"❌ Database error in delete_by_id(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to delete post"
+            )
+    
+    async def update_post_likes_by_id(self, post_id: str) -> None:
+        try:
+            sql = (
+                update(PostEntity)
+                .where(PostEntity.id == post_id)
+                .values(likes_count=PostEntity.likes_count + 1, version=PostEntity.version + 1) 
+                .execution_options(synchronize_session=False)  
+            )
+            await self.db.execute(sql)
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in update_post_likes_by_id(): {e}") 
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to update post likes"
+            )
+    
+    async def get_homepage_rows(self, limit: int, popular_limit: int) -> list:
+        try:
+            return (await self.read_db.execute(homepage_rows_statement(limit, popular_limit))).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in get_homepage_rows(): {e}") 
+            await self.read_db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch posts"
+            )
+    
+    async def get_posts_page(self, limit: int, cursor: PostCursor | None = None, category: str | None = None) -> list:
+        try:
+            return (await self.read_db.execute(posts_page_statement(limit, cursor, category))).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in get_posts_page(): {e}") 
+            await self.read_db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch posts"
+            )
+            
+    async def count_posts_by_category(self) -> dict:
+        try:
+            return dict((await self.read_db.execute(category_counts_statement())).all())
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in count_posts_by_category(): {e}") 
+            await self.read_db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to count posts"
+            )
+            
+    async def find_summaries_by_ids(self, post_ids: list) -> list:
+        try:
+            return (await self.read_db.execute(select(*POST_SUMMARY_COLUMNS).where(PostEntity.id.in_(post_ids)))).all()
+        except SQLAlchemyError as e:
+            await self.read_db.rollback()
+            logger.error(f"❌ Database error in find_summaries_by_ids(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch posts"
+            )
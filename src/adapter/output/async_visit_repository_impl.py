@@ -0,0 +1,55 @@
+from port.output.async_visit_repository import AsyncVisitRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select
+from sqlalchemy.exc import SQLAlchemyError
+from infrastructure.sqlalchemy.model import VisitDailyStat as VisitDailyStatEntity
+from infrastructure.sqlalchemy.model import VisitTotalStat as VisitTotalStatEntity
+from infrastructure.sqlalchemy.model import VisitorSketch as VisitorSketchEntity
+from adapter.output.visit_repository_impl import TOTAL_STAT_ID
+from fastapi import HTTPException, status
+from infrastructure.log.logger import logger
+from infrastructure.sqlalchemy.query_timing import label_statements
+from datetime import date
+
+@label_statements
+class AsyncVisitRepositoryImpl(AsyncVisitRepository):
+    """Read side of visit statistics, visits themselves are written by the write-behind flusher"""
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None) -> None:
+        self.db = db
+        self.read_db = read_db or db
+
+    async def get_today_visitor_count(self) -> int:
+        try:
+            stmt = select(VisitDailyStatEntity.visitor_count).where(VisitDailyStatEntity.visit_date == date.today())
+            return (await self.read_db.execute(stmt)).scalar() or 0
+        except SQLAlchemyError as e:
+            await self.read_db.rollback()
+            logger.error(f"❌ Database error in get_today_visitor_count(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch visitor count"
+            )
+
+    async def get_total_visitor_count(self) -> int:
+        try:
+            stmt = select(VisitTotalStatEntity.visitor_count).where(VisitTotalStatEntity.id == TOTAL_STAT_ID)
+            return (await self.read_db.execute(stmt)).scalar() or 0
+        except SQLAlchemyError as e:
+            await self.read_db.rollback()
+            logger.error(f"❌ Database error in get_total_visitor_count(): {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch total visitor count"
+            )
+
+    async def get_visitor_sketch_estimate(self, sketch_key: str) -> int:
+        try:
+            stmt = select(VisitorSketchEntity.estimate).where(VisitorSketchEntity.sketch_key == sketch_key)
+            return (await self.read_db.execute(stmt)).scalar() or 0
+        except SQLAlchemyError as e:
+            await self.read_db.rollback()
+            logger.error(f"❌ Database error in get_visitor_sketch_estimate(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch visitor estimate"
+            )
@@ -1,14 +1,48 @@
 from port.output.post_repository import PostRepository
-from sqlalchemy import update
+from sqlalchemy import update, case, select, or_, and_, func, literal, union_all
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from infrastructure.sqlalchemy.model import Post as PostEntity
 from fastapi import HTTPException, status
 from infrastructure.log.logger import logger
+from infrastructure.sqlalchemy.query_timing import label_statements
+from core.pagination import PostCursor
 
+# Listing read models never load post.content
+POST_SUMMARY_COLUMNS = (PostEntity.id, PostEntity.title, PostEntity.created_at, PostEntity.likes_count)
+POST_LISTING_COLUMNS = POST_SUMMARY_COLUMNS + (PostEntity.summary, PostEntity.thumbnail_url, PostEntity.category, PostEntity.version)
+POST_SEARCH_COLUMNS = (PostEntity.id, PostEntity.version, PostEntity.title, PostEntity.summary, PostEntity.content)
+# Keeps IN lists well under driver parameter limits when re-indexing many posts at once
+SEARCH_DOCUMENT_BATCH = 500
+
+def homepage_rows_statement(limit: int, popular_limit: int):
+    """First listing page and the most liked posts in one round trip, tagged by section"""
+    latest = (select(*POST_LISTING_COLUMNS, literal("latest").label("section"))
+              .order_by(PostEntity.created_at.desc(), PostEntity.id.desc()).limit(limit).subquery())
+    popular = (select(*POST_LISTING_COLUMNS, literal("popular").label("section"))
+               .order_by(PostEntity.likes_count.desc(), PostEntity.created_at.desc(), PostEntity.id.desc()).limit(popular_limit).subquery())
+    return union_all(select(latest), select(popular))
+
+def posts_page_statement(limit: int, cursor: PostCursor | None = None, category: str | None = None):
+    stmt = select(*POST_LISTING_COLUMNS).order_by(PostEntity.created_at.desc(), PostEntity.id.desc()).limit(limit)
+    if category is not None:
+        stmt = stmt.where(PostEntity.category == category)
+    if cursor is not None:
+        stmt = stmt.where(or_(
+            PostEntity.created_at < cursor.created_at,
+            and_(PostEntity.created_at == cursor.created_at, PostEntity.id < cursor.id)
+        ))
+    return stmt
+
+def category_counts_statement():
+    return select(PostEntity.category, func.count()).group_by(PostEntity.category)
+
+@label_statements
 class PostRepositoryImpl(PostRepository):
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, read_db: Session | None = None) -> None:
         self.db = db
+        # Listings tolerate replica lag and opt into read_db; lookups feeding a write and read-after-write paths stay on db
+        self.read_db = read_db or db
         
     def save(self, post: PostEntity) -> PostEntity:        
         try:
@@ -30,11 +64,19 @@ class PostRepositoryImpl(PostRepository):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
         return post
 
-    def delete_by_id(self, post_id: str) -> None:
+    def find_version_by_id(self, post_id: str):
+        row = self.db.execute(select(PostEntity.version, PostEntity.updated_at).where(PostEntity.id == post_id)).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        return row
+
+    def delete_by_id(self, post_id: str) -> str:
         post = self.find_by_id(post_id)
+        category = post.category
         try:
             self.db.delete(post)
             self.db.commit()
+            return category
         except SQLAlchemyError as e:
             self.db.rollback()
             logger.error(f"❌ Database error in delete_by_id(): {e}") 
@@ -48,7 +90,7 @@ class PostRepositoryImpl(PostRepository):
             sql = (
                 update(PostEntity)
                 .where(PostEntity.id == post_id)
-                .values(likes_count=PostEntity.likes_count + 1) 
+                .values(likes_count=PostEntity.likes_count + 1, version=PostEntity.version + 1) 
                 .execution_options(synchronize_session="fetch")  
             )
             self.db.execute(sql)
@@ -61,35 +103,93 @@ class PostRepositoryImpl(PostRepository):
                 detail="Internal Server Error - Unable to update post likes"
             )
     
-    def get_all_post(self) -> list:
+    def update_posts_likes(self, deltas: dict) -> None:
+        if not deltas:
+            return
         try:
-            return self.db.query(PostEntity).order_by(PostEntity.created_at.desc()).all()
+            sql = (
+                update(PostEntity)
+                .where(PostEntity.id.in_(deltas))
+                .values(likes_count=PostEntity.likes_count + case(deltas, value=PostEntity.id, else_=0), version=PostEntity.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.execute(sql)
+            self.db.commit()
         except SQLAlchemyError as e:
-            logger.error(f"❌ Database error in get_all_post(): {e}") 
+            logger.error(f"❌ Database error in update_posts_likes(): {e}") 
             self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to update post likes"
+            )
+    
+    def get_homepage_rows(self, limit: int, popular_limit: int) -> list:
+        try:
+            return self.read_db.execute(homepage_rows_statement(limit, popular_limit)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in get_homepage_rows(): {e}") 
+            self.read_db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch posts"
+            )
+    
+    def get_posts_page(self, limit: int, cursor: PostCursor | None = None, category: str | None = None) -> list:
+        try:
+            return self.read_db.execute(posts_page_statement(limit, cursor, category)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"❌ Database error in get_posts_page(): {e}") 
+            self.read_db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal Server Error - Unable to fetch posts"
             )
             
-    def get_popular_posts(self) -> list:
+    def count_posts_by_category(self) -> dict:
         try:
-            return self.db.query(PostEntity).order_by(PostEntity.likes_count.desc()).limit(3).all()
+            return dict(self.read_db.execute(category_counts_statement()).all())
         except SQLAlchemyError as e:
-            self.db.rollback()
-            logger.error(f"❌ Database error in get_popular_posts(): {e}") 
+            logger.error(f"❌ Database error in count_posts_by_category(): {e}") 
+            self.read_db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal Server Error - Unable to fetch popular posts"
+                detail="Internal Server Error - Unable to count posts"
             )
             
-    def get_latest_posts(self) -> list:
+    def find_summaries_by_ids(self, post_ids: list) -> list:
         try:
-            return self.db.query(PostEntity).order_by(PostEntity.created_at.desc()).limit(3).all()
+            return self.read_db.execute(select(*POST_SUMMARY_COLUMNS).where(PostEntity.id.in_(post_ids))).all()
+        except SQLAlchemyError as e:
+            self.read_db.rollback()
+            logger.error(f"❌ Database error in find_summaries_by_ids(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch posts"
+            )
+    
+    def get_post_versions(self) -> list:
+        try:
+            return self.db.execute(select(PostEntity.id, PostEntity.version)).all()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"❌ Database error in get_post_versions(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch post versions"
+            )
+    
+    def find_search_documents(self, post_ids: list) -> list:
+        """Primary reads, the index follows writes that a lagging replica may not have yet"""
+        try:
+            rows = []
+            for start in range(0, len(post_ids), SEARCH_DOCUMENT_BATCH):
+                batch = post_ids[start:start + SEARCH_DOCUMENT_BATCH]
+                rows.extend(self.db.execute(select(*POST_SEARCH_COLUMNS).where(PostEntity.id.in_(batch))).all())
+            return rows
         except SQLAlchemyError as e:
             self.db.rollback()
-            logger.error(f"❌ Database error in get_latest_posts(): {e}") 
+            logger.error(f"❌ Database error in find_search_documents(): {e}") 
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal Server Error - Unable to fetch latest posts"
-            )
\ No newline at end of file
+                detail="Internal Server Error - Unable to fetch posts"
+            )
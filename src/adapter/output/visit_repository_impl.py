@@ -1,14 +1,27 @@
 from port.output.visit_repository import VisitRepository
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func, select, exists
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import func, select, exists, insert, update, delete
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from infrastructure.sqlalchemy.model import VisitLog as VisitLogEntity
+from infrastructure.sqlalchemy.model import Visitor as VisitorEntity
+from infrastructure.sqlalchemy.model import DailyVisitor as DailyVisitorEntity
+from infrastructure.sqlalchemy.model import VisitDailyStat as VisitDailyStatEntity
+from infrastructure.sqlalchemy.model import VisitTotalStat as VisitTotalStatEntity
+from infrastructure.sqlalchemy.model import VisitorSketch as VisitorSketchEntity
+from infrastructure.sketch.hyperloglog import HyperLogLog
 from fastapi import HTTPException, status
 from infrastructure.log.logger import logger
+from infrastructure.sqlalchemy.query_timing import label_statements
+from datetime import date
+from collections import defaultdict
 
+TOTAL_STAT_ID = 1
+
+@label_statements
 class VisitRepositoryImpl(VisitRepository):
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, read_db: Session | None = None) -> None:
         self.db = db
+        self.read_db = read_db or db
         
     def save(self, visit_log: VisitLogEntity) -> VisitLogEntity:        
         try:
@@ -24,11 +37,155 @@ class VisitRepositoryImpl(VisitRepository):
                 detail="Internal Server Error - DB Operation Failed"
             )
     
+    def save_all(self, visit_logs: list, record_stats: bool = True) -> None:
+        if not visit_logs:
+            return
+        try:
+            self.db.execute(
+                insert(VisitLogEntity),
+                [{"visitor_ip": visit_log.visitor_ip, "visit_date": visit_log.visit_date} for visit_log in visit_logs]
+            )
+            if record_stats:
+                self._record_visitor_stats(visit_logs)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"❌ Database error in save_all(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - DB Operation Failed"
+            )
+    
+    def _insert_ignore(self, entity, rows: list) -> int:
+        """Insert `rows`, skipping the keys that already exist, and return how many were new"""
+        return self.db.execute(
+            insert(entity.__table__).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite"), rows
+        ).rowcount
+
+    def _record_visitor_stats(self, visit_logs: list) -> None:
+        # Visitors already seen on another day are ignored, so the rowcount is the number of new all-time visitors
+        new_visitors = self._insert_ignore(VisitorEntity, [{"visitor_ip": visit_log.visitor_ip, "first_visit_date": visit_log.visit_date}
+                                                           for visit_log in visit_logs])
+
+        # Likewise per day: an IP another worker already flushed for that day adds nothing
+        visitors_by_date = defaultdict(list)
+        for visit_log in visit_logs:
+            visitors_by_date[visit_log.visit_date].append({"visit_date": visit_log.visit_date, "visitor_ip": visit_log.visitor_ip})
+        for visit_date, rows in visitors_by_date.items():
+            new_daily_visitors = self._insert_ignore(DailyVisitorEntity, rows)
+            if new_daily_visitors:
+                self._increment(VisitDailyStatEntity, VisitDailyStatEntity.visit_date == visit_date,
+                                {"visit_date": visit_date}, new_daily_visitors)
+        if new_visitors:
+            self._increment(VisitTotalStatEntity, VisitTotalStatEntity.id == TOTAL_STAT_ID,
+                            {"id": TOTAL_STAT_ID}, new_visitors)
+
+    def _increment(self, entity, criteria, key: dict, count: int) -> None:
+        stmt = update(entity).where(criteria).values(visitor_count=entity.visitor_count + count)
+        if self.db.execute(stmt).rowcount:
+            return
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(entity).values(**key, visitor_count=count))
+        except IntegrityError:
+            # Another worker created the row first
+            self.db.execute(stmt)
+
+    def merge_visitor_sketches(self, sketches: dict) -> None:
+        try:
+            try:
+                self._merge_visitor_sketches(sketches)
+            except IntegrityError:
+                # Another worker inserted the same sketch first, merge into its row instead
+                self.db.rollback()
+                self._merge_visitor_sketches(sketches)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"❌ Database error in merge_visitor_sketches(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to update visitor sketches"
+            )
+
+    def _merge_visitor_sketches(self, sketches: dict) -> None:
+        stmt = select(VisitorSketchEntity).where(VisitorSketchEntity.sketch_key.in_(sketches)).with_for_update()
+        stored = {row.sketch_key: row for row in self.db.execute(stmt).scalars()}
+        for sketch_key, sketch in sketches.items():
+            row = stored.get(sketch_key)
+            if row is None:
+                self.db.add(VisitorSketchEntity(sketch_key=sketch_key, registers=sketch.to_bytes(), estimate=sketch.count()))
+                continue
+            merged = HyperLogLog.from_bytes(row.registers)
+            merged.merge(sketch)
+            row.registers = merged.to_bytes()
+            row.estimate = merged.count()
+        self.db.commit()
+
+    def get_visitor_sketch_estimate(self, sketch_key: str) -> int:
+        try:
+            stmt = select(VisitorSketchEntity.estimate).where(VisitorSketchEntity.sketch_key == sketch_key)
+            return self.read_db.execute(stmt).scalar() or 0
+        except SQLAlchemyError as e:
+            self.read_db.rollback()
+            logger.error(f"❌ Database error in get_visitor_sketch_estimate(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch visitor estimate"
+            )
+
+    def rebuild_visitor_stats(self) -> None:
+        try:
+            self.db.execute(delete(VisitorEntity))
+            self.db.execute(delete(DailyVisitorEntity))
+            self.db.execute(delete(VisitDailyStatEntity))
+            self.db.execute(delete(VisitTotalStatEntity))
+            self.db.execute(insert(VisitorEntity).from_select(
+                ["visitor_ip", "first_visit_date"],
+                select(VisitLogEntity.visitor_ip, func.min(VisitLogEntity.visit_date)).group_by(VisitLogEntity.visitor_ip)
+            ))
+            self.db.execute(insert(DailyVisitorEntity).from_select(
+                ["visit_date", "visitor_ip"],
+                select(VisitLogEntity.visit_date, VisitLogEntity.visitor_ip).distinct()
+            ))
+            self.db.execute(insert(VisitDailyStatEntity).from_select(
+                ["visit_date", "visitor_count"],
+                select(DailyVisitorEntity.visit_date, func.count()).group_by(DailyVisitorEntity.visit_date)
+            ))
+            self.db.execute(insert(VisitTotalStatEntity).from_select(
+                ["id", "visitor_count"],
+                select(TOTAL_STAT_ID, func.count()).select_from(VisitorEntity)
+            ))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"❌ Database error in rebuild_visitor_stats(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to rebuild visitor stats"
+            )
+    
+    def iter_visits(self, batch_size: int = 10000):
+        stmt = select(VisitLogEntity.visitor_ip, VisitLogEntity.visit_date).execution_options(yield_per=batch_size)
+        for visitor_ip, visit_date in self.db.execute(stmt):
+            yield visitor_ip, visit_date
+    
+    def find_visitor_ips_by_date(self, visit_date: date) -> list:
+        try:
+            stmt = select(VisitLogEntity.visitor_ip).where(VisitLogEntity.visit_date == visit_date).distinct()
+            return list(self.db.execute(stmt).scalars())
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"❌ Database error in find_visitor_ips_by_date(): {e}") 
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error - Unable to fetch visitors"
+            )
+    
     def exist_by_ip_and_date(self, ip: str) -> bool:
         try:
             stmt = select(exists().where(
-                VisitLogEntity.visitor_ip == ip,
-                func.date(VisitLogEntity.visit_date) == func.current_date()
+                VisitLogEntity.visit_date == date.today(),
+                VisitLogEntity.visitor_ip == str(ip)
             ))
 
             return self.db.execute(stmt).scalar()
@@ -42,13 +199,10 @@ class VisitRepositoryImpl(VisitRepository):
 
     def get_today_visitor_count(self) -> int:
         try:
-            return (
-                self.db.query(func.count(func.distinct(VisitLogEntity.visitor_ip)))
-                .filter(func.date(VisitLogEntity.visit_date) == func.current_date())
-                .scalar()
-            )
+            stmt = select(VisitDailyStatEntity.visitor_count).where(VisitDailyStatEntity.visit_date == date.today())
+            return self.read_db.execute(stmt).scalar() or 0
         except SQLAlchemyError as e:
-            self.db.rollback()
+            self.read_db.rollback()
             logger.error(f"❌ Database error in get_today_visitor_count(): {e}") 
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -57,12 +211,10 @@ class VisitRepositoryImpl(VisitRepository):
 
     def get_total_visitor_count(self) -> int:
         try:
-            return (
-                self.db.query(func.count(func.distinct(VisitLogEntity.visitor_ip)))
-                .scalar()
-            )
+            stmt = select(VisitTotalStatEntity.visitor_count).where(VisitTotalStatEntity.id == TOTAL_STAT_ID)
+            return self.read_db.execute(stmt).scalar() or 0
         except SQLAlchemyError as e:
-            self.db.rollback()
+            self.read_db.rollback()
             logger.error(f"❌ Database error in get_total_visitor_count(): {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
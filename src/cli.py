@@ -0,0 +1,781 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import logging
+import platform
+import random
+import statistics
+import sys
+import threading
+import uuid
+from time import perf_counter, process_time, sleep, monotonic
+from sqlalchemy import event, insert, select, func
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from datetime import date
+from fastapi import HTTPException
+from infrastructure.sqlalchemy.config import Base, SessionLocal, engine
+from infrastructure.sqlalchemy.migration import MIGRATIONS, migrate
+from infrastructure.sqlalchemy.model import Post, VisitLog
+from infrastructure.sqlalchemy.query_timing import QueryStats, current_query_stats
+from infrastructure.sqlalchemy.query_budget import budget_for
+from infrastructure.startup.readiness import readiness
+from infrastructure.sqlalchemy.explain import capture_statements, explain
+from infrastructure.sketch.hyperloglog import HyperLogLog
+from adapter.output.post_repository_impl import PostRepositoryImpl, POST_SUMMARY_COLUMNS
+from adapter.output.visit_repository_impl import VisitRepositoryImpl
+from core.domain import Category
+from core.usecase import PostUseCase, VisitUseCase, TOTAL_SKETCH_KEY, LATEST_POSTS_SIZE
+from adapter.dto.blog_dto import GetBlogMainResponse, PostDetail, PostSummary, VisitorStats
+from infrastructure.like.like_buffer import LikeBuffer
+from infrastructure.cache.homepage_snapshot import HomepageSnapshot, POPULAR_POSTS_SIZE
+from infrastructure.env_variable import POST_PAGE_SIZE
+from infrastructure.log.logger import logger
+from limits import parse
+from limits.storage import storage_from_string
+from infrastructure.ratelimit.sliding_window import SlidingWindowCounterRateLimiter
+import infrastructure.ratelimit.storage
+
+def migrate_schema(args: argparse.Namespace) -> None:
+    """Bring the database schema up to the latest (or --target) version"""
+    applied = migrate(engine, target=args.target)
+    if not applied:
+        logger.info(f"Schema is up to date (version {MIGRATIONS[-1].version})")
+
+def backfill_visitor_stats(args: argparse.Namespace) -> None:
+    """Rebuild the visitor rollup tables from visit_log, run once while traffic is stopped"""
+    migrate(engine)
+    db = SessionLocal()
+    try:
+        VisitUseCase(VisitRepositoryImpl(db)).rebuild_visitor_stats()
+    finally:
+        db.close()
+    logger.info("Visitor stats rebuilt from visit_log")
+
+def backfill_visitor_sketches(args: argparse.Namespace) -> None:
+    """Fold every visit_log row into the HyperLogLog sketches used by VISITOR_STATS_MODE=approximate"""
+    migrate(engine)
+    db = SessionLocal()
+    try:
+        VisitUseCase(VisitRepositoryImpl(db)).rebuild_visitor_sketches()
+    finally:
+        db.close()
+    logger.info("Visitor sketches rebuilt from visit_log")
+
+def hll_error_rate(args: argparse.Namespace) -> None:
+    """Compare HyperLogLog estimates with exact counts on a synthetic IP stream"""
+    rng = random.Random(args.seed)
+    sketch = HyperLogLog(args.precision)
+    exact = set()
+    for visits in range(1, args.visits + 1):
+        visitor_ip = ".".join(str(rng.randrange(256)) for _ in range(4))
+        sketch.add(visitor_ip)
+        exact.add(visitor_ip)
+        if visits % args.report_every == 0 or visits == args.visits:
+            estimate = sketch.count()
+            error = (estimate - len(exact)) / len(exact) * 100
+            print(f"visits={visits} exact={len(exact)} estimate={estimate} error={error:+.3f}%")
+    print(f"sketch size: {len(sketch.to_bytes())} bytes (expected standard error {104 / sketch.size ** 0.5:.3f}%)")
+
+def explain_queries(args: argparse.Namespace) -> None:
+    """EXPLAIN every SELECT issued by the repository read paths and fail if one scans a whole table"""
+    db = SessionLocal()
+    post_repository = PostRepositoryImpl(db)
+    visit_repository = VisitRepositoryImpl(db)
+    checks = {
+        "PostRepositoryImpl.find_by_id": lambda: post_repository.find_by_id(str(uuid.uuid4())),
+        "PostRepositoryImpl.find_version_by_id": lambda: post_repository.find_version_by_id(str(uuid.uuid4())),
+        "PostRepositoryImpl.get_posts_page": lambda: post_repository.get_posts_page(POST_PAGE_SIZE + 1),
+        "PostRepositoryImpl.get_posts_page(category)": lambda: post_repository.get_posts_page(POST_PAGE_SIZE + 1, category=Category.RECAP.value),
+        "PostRepositoryImpl.get_homepage_rows": lambda: post_repository.get_homepage_rows(POST_PAGE_SIZE + 1, POPULAR_POSTS_SIZE),
+        "VisitRepositoryImpl.exist_by_ip_and_date": lambda: visit_repository.exist_by_ip_and_date("127.0.0.1"),
+        "VisitRepositoryImpl.find_visitor_ips_by_date": lambda: visit_repository.find_visitor_ips_by_date(date.today()),
+        "VisitRepositoryImpl.get_today_visitor_count": visit_repository.get_today_visitor_count,
+        "VisitRepositoryImpl.get_total_visitor_count": visit_repository.get_total_visitor_count,
+        "VisitRepositoryImpl.get_visitor_sketch_estimate": lambda: visit_repository.get_visitor_sketch_estimate(TOTAL_SKETCH_KEY),
+    }
+
+    failures = 0
+    try:
+        for name, check in checks.items():
+            with capture_statements(engine) as statements:
+                try:
+                    check()
+                except HTTPException:
+                    pass
+            with engine.connect() as conn:
+                for statement, parameters in statements:
+                    query_plan = explain(conn, statement, parameters, Base.metadata.tables.keys())
+                    failures += not query_plan.uses_index
+                    print(f"[{'OK' if query_plan.uses_index else 'FULL SCAN'}] {name}")
+                    for line in query_plan.plan:
+                        print(f"    {line}")
+    finally:
+        db.close()
+
+    if failures:
+        print(f"{failures} repository queries do not use an index")
+        sys.exit(1)
+
+def bench_homepage(args: argparse.Namespace) -> None:
+    """Time the homepage as three separate SELECTs, as the single UNION ALL pass, and served from a warm snapshot"""
+    if args.round_trip_ms:
+        # SQLite answers in-process, so model the network round trip a MySQL statement pays
+        event.listen(engine, "before_cursor_execute", lambda *_: sleep(args.round_trip_ms / 1000))
+    db = SessionLocal()
+    usecase = PostUseCase(PostRepositoryImpl(db), snapshot=HomepageSnapshot())
+
+    def three_queries() -> tuple:
+        # The assembly the single pass replaced: the first page, then the popular and latest sections, one round trip each
+        popular = db.execute(select(*POST_SUMMARY_COLUMNS).order_by(Post.likes_count.desc()).limit(POPULAR_POSTS_SIZE)).all()
+        latest = db.execute(select(*POST_SUMMARY_COLUMNS).order_by(Post.created_at.desc()).limit(LATEST_POSTS_SIZE)).all()
+        pending = usecase.like_buffer.pending_counts()
+        return (usecase.get_post_page(), [usecase._format_post_response(row, pending) for row in popular],
+                [usecase._format_post_response(row, pending) for row in latest])
+
+    strategies = {
+        "three queries": three_queries,
+        "single pass": lambda: usecase._assemble_homepage_sections(usecase.post_repository.get_homepage_rows(POST_PAGE_SIZE + 1, POPULAR_POSTS_SIZE)),
+        "snapshot": usecase.get_homepage_posts,
+    }
+    try:
+        for name, build in strategies.items():
+            for _ in range(args.warmup):
+                build()
+            samples = []
+            for _ in range(args.iterations):
+                started = perf_counter()
+                build()
+                samples.append((perf_counter() - started) * 1000)
+            percentiles = statistics.quantiles(samples, n=100)
+            print(f"{name}: mean={statistics.fmean(samples):.2f}ms p50={percentiles[49]:.2f}ms p95={percentiles[94]:.2f}ms")
+    finally:
+        db.close()
+
+def bench_serialization(args: argparse.Namespace) -> None:
+    """Time rendering a /blog body from listing rows: pydantic models plus response_model against trusted dicts plus orjson"""
+    field = create_model_field("Response_get_blog_main", GetBlogMainResponse)
+    usecase = PostUseCase(None, snapshot=HomepageSnapshot(), like_buffer=LikeBuffer(flush_threshold=1, flush_interval_ms=1000))
+    visitor_stats = {"today_visitor": 42, "total_visitor": 4242}
+
+    async def validated(rows: list) -> bytes:
+        # What get_blog_main did before: strftime, a model per post, then FastAPI validating and encoding it again
+        posts = [{"id": row.id, "title": row.title, "created_at": row.created_at.strftime("%Y-%m-%d"), "likes_count": row.likes_count,
+                  "summary": row.summary, "thumbnail_url": row.thumbnail_url, "category": row.category} for row in rows]
+        response = GetBlogMainResponse(all_posts=[PostDetail(**post) for post in posts],
+                                       popular_posts=[PostSummary(**post) for post in posts[:POPULAR_POSTS_SIZE]],
+                                       latest_posts=[PostSummary(**post) for post in posts[:LATEST_POSTS_SIZE]],
+                                       visitor_stats=[VisitorStats(**visitor_stats)])
+        return JSONResponse(await serialize_response(field=field, response_content=response)).body
+
+    async def trusted(rows: list) -> bytes:
+        sections = usecase._assemble_homepage_sections(rows, limit=len(rows))
+        return ORJSONResponse({"all_posts": sections["all_posts"], "next_cursor": sections["next_cursor"],
+                               "popular_posts": sections["popular_posts"], "latest_posts": sections["latest_posts"],
+                               "visitor_stats": [visitor_stats]}).body
+
+    async def run() -> None:
+        now = datetime(2025, 1, 1)
+        for size in args.sizes:
+            rows = [SimpleNamespace(id=str(uuid.uuid4()), title=f"Post {i}", created_at=now - timedelta(hours=i), likes_count=i % 50,
+                                    summary="s" * 200, thumbnail_url=f"https://example.com/thumbnails/{i}.png", category="Develop",
+                                    version=1, section="latest") for i in range(size)]
+            iterations = max(args.min_iterations, args.budget_posts // size)
+            for name, render in {"response_model": validated, "orjson trusted": trusted}.items():
+                await render(rows)
+                started = perf_counter()
+                for _ in range(iterations):
+                    body = await render(rows)
+                elapsed_ms = (perf_counter() - started) * 1000 / iterations
+                print(f"{size:>6} posts  {name:<15} {elapsed_ms:8.3f}ms/response  {elapsed_ms * 1000 / size:6.2f}us/post  {len(body)} bytes")
+
+    asyncio.run(run())
+
+def resp_stand_in(args: argparse.Namespace) -> None:
+    """Serve the RESP commands the rate limit storage uses, so resp:// can be exercised without a Redis install"""
+    data, expires = {}, {}
+
+    def alive(key: bytes) -> bool:
+        if key in expires and expires[key] <= monotonic():
+            data.pop(key, None)
+            expires.pop(key, None)
+        return key in data
+
+    def bulk(value) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def run_command(command: list) -> bytes:
+        name, keys = command[0].upper(), command[1:]
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"SELECT", b"FLUSHDB"):
+            if name == b"FLUSHDB":
+                data.clear()
+                expires.clear()
+            return b"+OK\r\n"
+        if name == b"GET":
+            return bulk(data[keys[0]] if alive(keys[0]) else None)
+        if name == b"MGET":
+            return b"*%d\r\n" % len(keys) + b"".join(bulk(data[key] if alive(key) else None) for key in keys)
+        if name in (b"INCRBY", b"DECRBY"):
+            delta = int(keys[1]) * (1 if name == b"INCRBY" else -1)
+            value = (int(data[keys[0]]) if alive(keys[0]) else 0) + delta
+            data[keys[0]] = str(value).encode()
+            return b":%d\r\n" % value
+        if name == b"PEXPIRE":
+            if not alive(keys[0]):
+                return b":0\r\n"
+            expires[keys[0]] = monotonic() + int(keys[1]) / 1000
+            return b":1\r\n"
+        if name == b"DEL":
+            return b":%d\r\n" % sum(data.pop(key, None) is not None for key in keys if alive(key))
+        return b"-ERR unknown command '%s'\r\n" % name
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                command = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    command.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(run_command(command))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, args.host, args.port)
+        print(f"RESP stand-in listening on {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+def bench_rate_limit(args: argparse.Namespace) -> None:
+    """Hammer one sliding window limit from several threads and report throughput and how many hits got through"""
+    storage = storage_from_string(args.storage)
+    rate_limiter = SlidingWindowCounterRateLimiter(storage)
+    item = parse(args.limit)
+    key = uuid.uuid4().hex
+    allowed = [0] * args.threads
+    latencies = [[] for _ in range(args.threads)]
+
+    def worker(index: int) -> None:
+        for _ in range(args.hits):
+            started = perf_counter()
+            allowed[index] += rate_limiter.hit(item, key)
+            latencies[index].append((perf_counter() - started) * 1_000_000)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.threads)]
+    started = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started
+    samples = [sample for thread_samples in latencies for sample in thread_samples]
+    percentiles = statistics.quantiles(samples, n=100)
+    print(f"{args.storage}: {len(samples) / elapsed:,.0f} hits/s  p50={percentiles[49]:.1f}us p99={percentiles[98]:.1f}us  "
+          f"allowed {sum(allowed)} of {len(samples)} against {item}")
+
+def bench_tracing(args: argparse.Namespace) -> None:
+    """Time requests through the full app with Sentry off, tracing and profiling everything, and the adaptive sampler"""
+    import sentry_sdk
+    from fastapi.testclient import TestClient
+    from sentry_sdk.transport import Transport
+    from infrastructure.sentry.tracing import traces_sampler
+    from infrastructure.sentry.profiling import profiling_options, PROFILING_ALWAYS
+    import main as app_main
+
+    class DiscardingTransport(Transport):
+        def capture_envelope(self, envelope) -> None:
+            pass
+
+    # Envelopes are built in full and then discarded, so the numbers include everything but the network
+    dsn = "https://public@127.0.0.1/1"
+    modes = {
+        "off": {"dsn": None},
+        "trace all + profiler": {"dsn": dsn, "traces_sample_rate": 1.0, **profiling_options(PROFILING_ALWAYS)},
+        "adaptive sampler": {"dsn": dsn, "traces_sampler": traces_sampler},
+    }
+    app_main.limiter.enabled = False
+    with TestClient(app_main.app, headers={"X-Forwarded-For": "127.0.0.1"}) as client:
+        page = client.get("/posts", params={"limit": 1}).json()["posts"]
+        requests = {"OPTIONS /posts": ("OPTIONS", "/posts"), "GET /posts": ("GET", "/posts")}
+        if page:
+            requests["GET /posts/{post_id}"] = ("GET", f"/posts/{page[0]['id']}")
+        # Warm every route once up front, otherwise whichever mode runs first also pays for the first requests
+        for method, url in requests.values():
+            for _ in range(args.warmup):
+                client.request(method, url)
+        for mode, options in modes.items():
+            sentry_sdk.init(transport=DiscardingTransport, **options)
+            for label, (method, url) in requests.items():
+                for _ in range(args.warmup):
+                    client.request(method, url)
+                samples = []
+                cpu_started = process_time()
+                for _ in range(args.iterations):
+                    started = perf_counter()
+                    client.request(method, url)
+                    samples.append((perf_counter() - started) * 1000)
+                cpu_ms = (process_time() - cpu_started) * 1000 / args.iterations
+                percentiles = statistics.quantiles(samples, n=100)
+                print(f"{mode:<22} {label:<22} p50={percentiles[49]:.2f}ms p99={percentiles[98]:.2f}ms cpu={cpu_ms:.2f}ms/req")
+            if mode != "off":
+                print(f"{'':<22} profiler thread running: {any(thread.name.startswith('sentry.profiler') for thread in threading.enumerate())}")
+    sentry_sdk.init(dsn=None)
+    print(f"adaptive sampler traced {traces_sampler.sampled}, capped {traces_sampler.capped}")
+
+BENCH_WORDS = ("fastapi", "sqlalchemy", "index", "cache", "latency", "query", "python", "mysql", "deploy", "docker",
+               "recap", "retrospective", "sprint", "review", "migration", "async", "thread", "pool", "replica", "search",
+               "the", "a", "of", "and", "to", "in", "is", "for", "with", "on", "that", "this", "we", "it", "when", "how")
+
+def _bench_text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(BENCH_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+def seed_bench_data(args: argparse.Namespace) -> None:
+    """Fill an empty database with a deterministic dataset for bench-routes, then rebuild the visitor rollups"""
+    migrate(engine)
+    with engine.connect() as connection:
+        if connection.scalar(select(func.count()).select_from(Post)):
+            print("The post table is not empty, seed-bench-data only fills an empty database")
+            sys.exit(1)
+
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+    categories = [category.value for category in Category]
+    # Posts share a handful of long bodies, generating 10k distinct 20k-char texts costs more than inserting them
+    bodies = [_bench_text(rng, args.content_chars) for _ in range(16)]
+    started = perf_counter()
+    with engine.begin() as connection:
+        for offset in range(0, args.posts, args.batch_size):
+            rows = []
+            for index in range(offset, min(offset + args.batch_size, args.posts)):
+                created_at = now - timedelta(minutes=index * 7)
+                rows.append({
+                    "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    "title": _bench_text(rng, rng.randint(20, 80)),
+                    "summary": _bench_text(rng, rng.randint(80, 200)),
+                    "content": bodies[index % len(bodies)],
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "likes_count": int(rng.paretovariate(1.5)) - 1,
+                    "category": rng.choice(categories),
+                    "thumbnail_url": f"https://cdn.example.com/thumbnails/{index}.png",
+                    "version": 1,
+                })
+            connection.execute(insert(Post), rows)
+    print(f"{args.posts} posts in {perf_counter() - started:.1f}s")
+
+    started = perf_counter()
+    today = date.today()
+    for offset in range(0, args.visits, args.batch_size):
+        with engine.begin() as connection:
+            connection.execute(insert(VisitLog), [{
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "visitor_ip": f"10.{(visitor >> 16) & 255}.{(visitor >> 8) & 255}.{visitor & 255}",
+                "visit_date": today - timedelta(days=rng.randrange(args.days)),
+            } for visitor in (rng.randrange(args.visitors) for _ in range(min(args.batch_size, args.visits - offset)))])
+    print(f"{args.visits} visit_log rows in {perf_counter() - started:.1f}s")
+
+    backfill_visitor_stats(args)
+    backfill_visitor_sketches(args)
+
+@asynccontextmanager
+async def _in_process_client(app, ready_timeout: float):
+    """An httpx client calling the app in this event loop with its lifespan running, so context variables reach the handlers"""
+    import httpx
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with app.router.lifespan_context(app):
+        # Measure the warm app, the way traffic meets it once /readyz passes
+        deadline = monotonic() + ready_timeout
+        while not readiness.ready:
+            if monotonic() >= deadline:
+                print(f"App not ready after {ready_timeout:g}s: {json.dumps(readiness.snapshot())}")
+                sys.exit(1)
+            await asyncio.sleep(0.05)
+        async with httpx.AsyncClient(transport=transport, base_url="http://local") as client:
+            yield client
+
+def _bench_requests(post_ids: list, rng: random.Random) -> dict:
+    """Every read route. Writes would change the dataset between runs, and likes sit behind a global hourly limit"""
+    return {
+        "GET /blog": lambda: ("GET", "/blog", None),
+        "GET /posts": lambda: ("GET", "/posts", None),
+        "GET /posts?category": lambda: ("GET", "/posts", {"category": rng.choice(list(Category)).value}),
+        "GET /posts/{post_id}": lambda: ("GET", f"/posts/{rng.choice(post_ids)}", None),
+        "GET /posts/search": lambda: ("GET", "/posts/search", {"q": " ".join(rng.sample(BENCH_WORDS[:20], 2))}),
+        "GET /posts/categories": lambda: ("GET", "/posts/categories", None),
+    }
+
+def bench_routes(args: argparse.Namespace) -> None:
+    """Drive every route in-process at fixed concurrency and compare latency, throughput and statements per request to a baseline"""
+    import httpx
+    import main as app_main
+    from infrastructure.log.access_log import access_logger
+
+    with engine.connect() as connection:
+        post_ids = list(connection.scalars(select(Post.id).order_by(Post.id)))
+        visits = connection.scalar(select(func.count()).select_from(VisitLog))
+    if not post_ids:
+        print("No posts to benchmark, run seed-bench-data first")
+        sys.exit(1)
+
+    app_main.limiter.enabled = False
+    # One JSON line per request would measure the log writer as much as the routes
+    access_logger.setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    requests = _bench_requests(post_ids, rng)
+    if args.routes:
+        requests = {name: build for name, build in requests.items() if name in args.routes}
+
+    async def send(client: httpx.AsyncClient, build) -> tuple:
+        method, url, params = build()
+        stats = QueryStats()
+        # The middleware nests its own stats under these, so statements count here as well
+        token = current_query_stats.set(stats)
+        started = perf_counter()
+        try:
+            response = await client.request(method, url, params=params)
+        finally:
+            current_query_stats.reset(token)
+        elapsed_ms = (perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} answered {response.status_code}: {response.text[:200]}")
+        return elapsed_ms, stats.count
+
+    async def drive(client: httpx.AsyncClient, build, total: int) -> tuple:
+        samples, statements = [], []
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                elapsed_ms, count = await send(client, build)
+                samples.append(elapsed_ms)
+                statements.append(count)
+
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return samples, statements, perf_counter() - started
+
+    async def run() -> dict:
+        results = {}
+        async with _in_process_client(app_main.app, args.ready_timeout) as client:
+            for name, build in requests.items():
+                await drive(client, build, args.warmup)
+                samples, statements, elapsed = await drive(client, build, args.requests)
+                percentiles = statistics.quantiles(samples, n=100)
+                results[name] = {
+                    "p50_ms": round(percentiles[49], 3),
+                    "p95_ms": round(percentiles[94], 3),
+                    "p99_ms": round(percentiles[98], 3),
+                    "rps": round(len(samples) / elapsed, 1),
+                    "statements_per_request": round(statistics.fmean(statements), 3),
+                }
+                print(f"{name:<28} p50={percentiles[49]:7.2f}ms p95={percentiles[94]:7.2f}ms p99={percentiles[98]:7.2f}ms "
+                      f"{results[name]['rps']:8.1f} req/s  {results[name]['statements_per_request']:.2f} statements/req")
+        return results
+
+    report = {
+        "setup": {
+            "dialect": engine.dialect.name,
+            "database_mode": app_main.DATABASE_MODE,
+            "posts": len(post_ids),
+            "visits": visits,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "python": platform.python_version(),
+        },
+        "routes": asyncio.run(run()),
+    }
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["setup"] != report["setup"]:
+            print(f"Warning: baseline was recorded with {baseline['setup']}, this run used {report['setup']}")
+        regressions = _bench_regressions(baseline["routes"], report["routes"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+def _bench_regressions(baseline: dict, current: dict, tolerance: float) -> list:
+    regressions = []
+    for name, before in baseline.items():
+        after = current.get(name)
+        if after is None:
+            continue
+        # p99 rests on a handful of samples per route and swings with a single GC pause, so it is reported but not gated
+        for key in ("p50_ms", "p95_ms"):
+            if after[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name} {key} {before[key]} -> {after[key]}")
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name} rps {before['rps']} -> {after['rps']}")
+        # Statement counts do not jitter, any increase is a new query on the path
+        if after["statements_per_request"] > before["statements_per_request"] + 0.01:
+            regressions.append(f"{name} statements_per_request {before['statements_per_request']} -> {after['statements_per_request']}")
+    return regressions
+
+def check_query_budgets(args: argparse.Namespace) -> None:
+    """Call every API route once on cold caches and fail if one issues more SQL statements than its query_budget"""
+    from fastapi.routing import APIRoute
+    from infrastructure.env_variable import SERVER_ENV, AUTHENTICATION_CODE
+    from infrastructure.cache.post_detail_cache import post_detail_cache
+    from infrastructure.cache.homepage_snapshot import homepage_snapshot
+    from infrastructure.cache.category_counts import category_counts
+    import main as app_main
+
+    if SERVER_ENV == "Product":
+        print("check-query-budgets creates and deletes a post, point it at a scratch database instead")
+        sys.exit(1)
+    migrate(engine)
+    app_main.limiter.enabled = False
+    routes = {f"{method} {route.path}": route for route in app_main.app.routes
+              if isinstance(route, APIRoute) and route.include_in_schema for method in route.methods}
+    undeclared = [name for name, route in routes.items() if budget_for(route) is None]
+
+    post = {"title": "Query budget", "summary": "Created by check-query-budgets", "content": "Query budget " * 50,
+            "thumbnail_url": "https://example.com/thumbnail.png", "category": Category.DEVELOP.value,
+            "authentication_code": AUTHENTICATION_CODE}
+    auth = {"authentication_code": AUTHENTICATION_CODE}
+    # In order: the post created first is read, liked, updated and finally deleted
+    scenario = [
+        ("POST /posts", lambda post_id: ("POST", "/posts", {"json": post})),
+        ("GET /posts", lambda post_id: ("GET", "/posts", {})),
+        ("GET /posts", lambda post_id: ("GET", "/posts", {"params": {"category": Category.DEVELOP.value}})),
+        ("GET /posts/search", lambda post_id: ("GET", "/posts/search", {"params": {"q": "budget"}})),
+        ("GET /posts/categories", lambda post_id: ("GET", "/posts/categories", {})),
+        ("GET /posts/{post_id}", lambda post_id: ("GET", f"/posts/{post_id}", {})),
+        ("POST /posts/{post_id}/likes", lambda post_id: ("POST", f"/posts/{post_id}/likes", {})),
+        ("PATCH /posts/{post_id}", lambda post_id: ("PATCH", f"/posts/{post_id}", {"json": {"title": "Query budget, updated", **auth}})),
+        ("GET /blog", lambda post_id: ("GET", "/blog", {})),
+        ("DELETE /posts/{post_id}", lambda post_id: ("DELETE", f"/posts/{post_id}", {"headers": auth})),
+        ("OPTIONS /{full_path:path}", lambda post_id: ("OPTIONS", "/posts", {})),
+    ]
+
+    async def run() -> list:
+        failures = []
+        post_id = None
+        async with _in_process_client(app_main.app, args.ready_timeout) as client:
+            for name, build in scenario:
+                # Budgets hold for a cold cache, the worst case a request can meet
+                if post_id is not None:
+                    post_detail_cache.invalidate(post_id)
+                homepage_snapshot.invalidate()
+                category_counts.invalidate()
+                method, url, kwargs = build(post_id)
+                stats = QueryStats(record_statements=True)
+                token = current_query_stats.set(stats)
+                try:
+                    response = await client.request(method, url, **kwargs)
+                finally:
+                    current_query_stats.reset(token)
+                if response.status_code >= 400:
+                    failures.append(f"{name} answered {response.status_code}: {response.text[:200]}")
+                    continue
+                if name == "POST /posts":
+                    post_id = response.json()["id"]
+                budget = budget_for(routes.get(name))
+                print(f"{name:<28} {stats.count} statements (budget {budget})")
+                if budget is not None and stats.count > budget:
+                    failures.append(f"{name} issued {stats.count} statements, over its budget of {budget}:\n"
+                                    + "\n".join(f"    {statement}" for statement in stats.statements))
+        return failures
+
+    failures = asyncio.run(run())
+    untested = sorted(set(routes) - {name for name, _ in scenario})
+    failures += [f"{name} declares no query_budget" for name in undeclared]
+    failures += [f"{name} is not exercised by check-query-budgets" for name in untested]
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+def check_conditional_get(args: argparse.Namespace) -> None:
+    """Like a post with its detail cached and fail if If-None-Match and If-Modified-Since disagree about the new body"""
+    from infrastructure.env_variable import SERVER_ENV, AUTHENTICATION_CODE
+    from infrastructure.like.like_buffer import like_buffer
+    import main as app_main
+
+    if SERVER_ENV == "Product":
+        print("check-conditional-get creates and deletes a post, point it at a scratch database instead")
+        sys.exit(1)
+    migrate(engine)
+    app_main.limiter.enabled = False
+    post = {"title": "Conditional GET", "summary": "Created by check-conditional-get", "content": "Conditional GET " * 50,
+            "thumbnail_url": "https://example.com/thumbnail.png", "category": Category.DEVELOP.value,
+            "authentication_code": AUTHENTICATION_CODE}
+
+    async def run() -> list:
+        failures = []
+        async with _in_process_client(app_main.app, args.ready_timeout) as client:
+            post_id = (await client.post("/posts", json=post)).json()["id"]
+            try:
+                before = await client.get(f"/posts/{post_id}")
+                await client.post(f"/posts/{post_id}/likes")
+                # Wait for the buffered like to commit, the cached entry is patched rather than reloaded then
+                like_buffer.wake()
+                deadline = monotonic() + args.flush_timeout
+                while like_buffer.pending_for(post_id) and monotonic() < deadline:
+                    await asyncio.sleep(0.05)
+                checks = {"If-None-Match": before.headers["etag"], "If-Modified-Since": before.headers.get("last-modified")}
+                for header, value in checks.items():
+                    if value is None:
+                        continue
+                    response = await client.get(f"/posts/{post_id}", headers={header: value})
+                    print(f"{header} from before the like: {response.status_code}")
+                    if response.status_code != 200:
+                        failures.append(f"{header} answered {response.status_code} after likes_count changed")
+            finally:
+                await client.delete(f"/posts/{post_id}", headers={"authentication_code": AUTHENTICATION_CODE})
+        return failures
+
+    failures = asyncio.run(run())
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+IMPORT_PROBE = "import time; started = time.perf_counter(); import {module}; print((time.perf_counter() - started) * 1000)"
+
+def check_import_time(args: argparse.Namespace) -> None:
+    """Time importing the app module in fresh interpreters and fail over --budget-ms, listing the slowest imports"""
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(args.runs):
+        probe = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=args.module)],
+                               cwd=source_dir, capture_output=True, text=True, check=True)
+        samples.append(float(probe.stdout.split()[-1]))
+    median = statistics.median(samples)
+    print(f"import {args.module}: median {median:.0f}ms, min {min(samples):.0f}ms over {args.runs} runs (budget {args.budget_ms}ms)")
+    if median <= args.budget_ms:
+        return
+
+    trace = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+                           cwd=source_dir, capture_output=True, text=True, check=True)
+    modules = []
+    for line in trace.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            modules.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+    print("Slowest modules by own import time:")
+    for own, cumulative, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"    {own / 1000:7.1f}ms own {cumulative / 1000:7.1f}ms cumulative  {name}")
+    sys.exit(1)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bang maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.add_argument("--target", type=int, default=None)
+    migrate_parser.set_defaults(handler=migrate_schema)
+
+    explain_parser = subparsers.add_parser("explain-queries", help="Check that repository queries use an index")
+    explain_parser.set_defaults(handler=explain_queries)
+
+    backfill = subparsers.add_parser("backfill-visitor-stats", help="Rebuild visitor rollup tables from visit_log")
+    backfill.set_defaults(handler=backfill_visitor_stats)
+
+    backfill_sketches = subparsers.add_parser("backfill-visitor-sketches", help="Merge visit_log into the visitor HyperLogLog sketches")
+    backfill_sketches.set_defaults(handler=backfill_visitor_sketches)
+
+    bench = subparsers.add_parser("bench-homepage", help="Compare homepage assembly against the snapshot on the configured database")
+    bench.add_argument("--iterations", type=int, default=200)
+    bench.add_argument("--warmup", type=int, default=20)
+    bench.add_argument("--round-trip-ms", type=float, default=0)
+    bench.set_defaults(handler=bench_homepage)
+
+    serialization = subparsers.add_parser("bench-serialization", help="Measure /blog body rendering cost by post count")
+    serialization.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    serialization.add_argument("--budget-posts", type=int, default=200_000)
+    serialization.add_argument("--min-iterations", type=int, default=5)
+    serialization.set_defaults(handler=bench_serialization)
+
+    stand_in = subparsers.add_parser("resp-stand-in", help="Run a minimal in-memory RESP server for rate limit storage tests")
+    stand_in.add_argument("--host", default="127.0.0.1")
+    stand_in.add_argument("--port", type=int, default=6390)
+    stand_in.set_defaults(handler=resp_stand_in)
+
+    rate_limit = subparsers.add_parser("bench-rate-limit", help="Measure a rate limit storage under concurrent hits")
+    rate_limit.add_argument("--storage", default="local://")
+    rate_limit.add_argument("--limit", default="1000/minute")
+    rate_limit.add_argument("--threads", type=int, default=8)
+    rate_limit.add_argument("--hits", type=int, default=5_000)
+    rate_limit.set_defaults(handler=bench_rate_limit)
+
+    error_rate = subparsers.add_parser("hll-error-rate", help="Report HyperLogLog error against exact distinct counts")
+    error_rate.add_argument("--visits", type=int, default=1_000_000)
+    error_rate.add_argument("--precision", type=int, default=14)
+    error_rate.add_argument("--report-every", type=int, default=100_000)
+    error_rate.add_argument("--seed", type=int, default=0)
+    error_rate.set_defaults(handler=hll_error_rate)
+
+    tracing = subparsers.add_parser("bench-tracing", help="Measure Sentry tracing overhead per request with and without the adaptive sampler")
+    tracing.add_argument("--iterations", type=int, default=500)
+    tracing.add_argument("--warmup", type=int, default=50)
+    tracing.set_defaults(handler=bench_tracing)
+
+    seed = subparsers.add_parser("seed-bench-data", help="Fill an empty database with a deterministic dataset for bench-routes")
+    seed.add_argument("--posts", type=int, default=10_000)
+    seed.add_argument("--content-chars", type=int, default=20_000)
+    seed.add_argument("--visits", type=int, default=5_000_000)
+    seed.add_argument("--visitors", type=int, default=200_000)
+    seed.add_argument("--days", type=int, default=365)
+    seed.add_argument("--batch-size", type=int, default=5_000)
+    seed.add_argument("--seed", type=int, default=0)
+    seed.set_defaults(handler=seed_bench_data)
+
+    routes = subparsers.add_parser("bench-routes", help="Load test every route in-process and compare against a baseline JSON")
+    routes.add_argument("--concurrency", type=int, default=8)
+    routes.add_argument("--requests", type=int, default=1_000)
+    routes.add_argument("--warmup", type=int, default=100)
+    routes.add_argument("--routes", nargs="+", default=None)
+    routes.add_argument("--seed", type=int, default=0)
+    routes.add_argument("--baseline", default=None, help="Fail when a route regresses against this report")
+    routes.add_argument("--write-baseline", default=None, help="Save this run's report as a baseline")
+    routes.add_argument("--tolerance", type=float, default=0.25)
+    routes.add_argument("--ready-timeout", type=float, default=120, help="Seconds to wait for the warmup to finish")
+    routes.set_defaults(handler=bench_routes)
+
+    budgets = subparsers.add_parser("check-query-budgets", help="Fail if an API route issues more SQL statements than its query_budget")
+    budgets.add_argument("--ready-timeout", type=float, default=120, help="Seconds to wait for the warmup to finish")
+    budgets.set_defaults(handler=check_query_budgets)
+
+    conditional = subparsers.add_parser("check-conditional-get", help="Fail if a liked post still answers 304 to its old validators")
+    conditional.add_argument("--flush-timeout", type=float, default=10, help="Seconds to wait for the like to be written")
+    conditional.add_argument("--ready-timeout", type=float, default=120, help="Seconds to wait for the warmup to finish")
+    conditional.set_defaults(handler=check_conditional_get)
+
+    import_time = subparsers.add_parser("check-import-time", help="Fail if importing the app takes longer than its budget")
+    import_time.add_argument("--module", default="main")
+    import_time.add_argument("--budget-ms", type=int, default=450)
+    import_time.add_argument("--runs", type=int, default=5)
+    import_time.add_argument("--top", type=int, default=15)
+    import_time.set_defaults(handler=check_import_time)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+from core.domain import VisitLog, Category
+from core.usecase import PostUseCaseBase, APPROXIMATE_STATS_MODE, TOTAL_SKETCH_KEY
+from infrastructure.cache.homepage_snapshot import POPULAR_POSTS_SIZE
+from infrastructure.sqlalchemy.model import Post as PostEntity
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse
+from adapter.dto.visit_dto import VisitCreateRequest
+from port.input.async_post_service import AsyncPostService
+from port.input.async_visit_service import AsyncVisitService
+from port.output.async_post_repository import AsyncPostRepository
+from port.output.async_visit_repository import AsyncVisitRepository
+from infrastructure.env_variable import VISITOR_STATS_MODE, POST_PAGE_SIZE
+from core.pagination import decode_cursor
+from core.validator import Validator
+from infrastructure.cache.homepage_snapshot import HomepageSnapshot, homepage_snapshot
+from infrastructure.visit.ingest_buffer import VisitIngestBuffer, visit_ingest_buffer
+from infrastructure.like.like_buffer import LikeBuffer, like_buffer
+from infrastructure.cache.post_detail_cache import PostDetailCache, PostDetailEntry, post_detail_cache
+from infrastructure.cache.category_counts import CategoryCounts, category_counts
+from infrastructure.search.post_search_index import PostSearchIndex, post_search_index
+from infrastructure.cache.invalidation_bus import InvalidationBus, invalidation_bus, POST_CREATED, POST_UPDATED, POST_DELETED, POST_LIKED
+from datetime import date
+import asyncio
+
+class AsyncPostUseCase(PostUseCaseBase, AsyncPostService):
+    def __init__(self, post_repository:AsyncPostRepository, snapshot:HomepageSnapshot = homepage_snapshot,
+                 like_buffer:LikeBuffer = like_buffer, detail_cache:PostDetailCache = post_detail_cache,
+                 bus:InvalidationBus = invalidation_bus, search_index:PostSearchIndex = post_search_index,
+                 category_counts:CategoryCounts = category_counts) -> None:
+        super().__init__(post_repository, snapshot, like_buffer, detail_cache, bus, search_index, category_counts)
+        
+    async def create_post(self, post_create_request: PostCreateRequest) -> PostCreateResponse:
+        self._verify_authentication_code(post_create_request.authentication_code)
+        
+        with self.category_counts.track() as category_deltas:
+            post = await self.post_repository.save(self._to_entity(post_create_request))
+            category_deltas[post.category] += 1
+        post_create_response = PostCreateResponse.fromEntity(post)
+        # Tokenizing up to three long fields is CPU work, off the event loop so other requests keep being served
+        await asyncio.to_thread(self.search_index.add, post)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_CREATED, post_create_response.id)
+        return post_create_response
+    
+    async def delete_post(self, post_id, authentication_code) -> None:
+        self._verify_authentication_code(authentication_code)
+        
+        with self.category_counts.track() as category_deltas:
+            category_deltas[await self.post_repository.delete_by_id(post_id)] -= 1
+        self.like_buffer.discard(post_id)
+        self.detail_cache.invalidate(post_id)
+        self.search_index.remove(post_id)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_DELETED, post_id)
+    
+    async def update_post(self, post_id:str, post_update_request: PostUpdateRequest) -> PostUpdateResponse:
+        self._verify_authentication_code(post_update_request.authentication_code)
+        
+        post:PostEntity = await self.post_repository.find_by_id(post_id)
+        previous_category = post.category
+        self._apply_update(post, post_update_request)
+        
+        with self.category_counts.track() as category_deltas:
+            post = await self.post_repository.save(post)
+            if post.category != previous_category:
+                category_deltas[previous_category] -= 1
+                category_deltas[post.category] += 1
+        self.detail_cache.put(post.id, self._to_detail_entry(post))
+        await asyncio.to_thread(self.search_index.add, post)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_UPDATED, post.id)
+        return self._to_update_response(post)
+    
+    async def get_post_detail(self, post_id: str) -> dict:
+        return (await self.get_post_detail_with_validator(post_id))[0]
+    
+    async def get_post_detail_with_validator(self, post_id: str) -> tuple:
+        entry = self.detail_cache.get(post_id)
+        if entry is None:
+            entry = await self.detail_cache.load_async(post_id, lambda: self._load_detail_entry(post_id))
+        return self._render_detail(post_id, entry)
+    
+    async def _load_detail_entry(self, post_id: str) -> PostDetailEntry:
+        return self._to_detail_entry(await self.post_repository.find_by_id(post_id))
+    
+    async def get_post_validator(self, post_id: str) -> Validator:
+        entry = self.detail_cache.get(post_id)
+        if entry is not None:
+            return self._post_validator(post_id, entry.version, entry.updated_at)
+        row = await self.post_repository.find_version_by_id(post_id)
+        return self._post_validator(post_id, row.version, row.updated_at)
+    
+    async def get_detail_cache_stats(self, authentication_code: str) -> dict:
+        return self._detail_cache_stats(authentication_code)
+    
+    async def add_like_post(self, post_id: str) -> None:
+        if self.like_buffer.running:
+            self.like_buffer.add(post_id)
+        else:
+            await self.post_repository.update_post_likes_by_id(post_id)
+            self.detail_cache.patch_likes(post_id)
+            self.bus.publish(POST_LIKED, post_id)
+        self.snapshot.patch_likes(post_id)
+
+    async def search_posts(self, query: str, limit: int) -> list:
+        # BM25 scoring walks every posting of the query terms, so it runs on a worker thread like the index writes
+        hits = await asyncio.to_thread(self.search_index.search, query, limit)
+        if not hits:
+            return []
+        return self._format_search_results(hits, await self.post_repository.find_summaries_by_ids([post_id for post_id, _ in hits]))
+
+    async def get_post_page(self, limit: int = POST_PAGE_SIZE, cursor: str | None = None, category: Category | None = None) -> dict:
+        post_cursor = decode_cursor(cursor) if cursor else None
+        return self._to_page(await self.post_repository.get_posts_page(limit + 1, post_cursor, category and category.value), limit)
+
+    async def get_category_counts(self) -> dict:
+        counts = self.category_counts.get()
+        if counts is None:
+            version = self.category_counts.version
+            counts = await self.post_repository.count_posts_by_category()
+            self.category_counts.store(counts, version)
+        return self._format_category_counts(counts)
+
+    async def get_homepage_posts(self) -> dict:
+        sections = self.snapshot.get()
+        if sections is not None:
+            return sections
+
+        version = self.snapshot.version
+        sections = self._assemble_homepage_sections(await self.post_repository.get_homepage_rows(POST_PAGE_SIZE + 1, POPULAR_POSTS_SIZE))
+        self.snapshot.store(sections, version)
+        return sections
+
+class AsyncVisitUseCase(AsyncVisitService):
+    """Visits are only ever written through the write-behind buffer, whose flusher uses the sync engine"""
+    def __init__(self, visit_repository:AsyncVisitRepository, visit_buffer:VisitIngestBuffer = visit_ingest_buffer,
+                 stats_mode:str = VISITOR_STATS_MODE) -> None:
+        self.visit_repository = visit_repository
+        self.visit_buffer = visit_buffer
+        self.approximate = stats_mode == APPROXIMATE_STATS_MODE
+    
+    async def create_visit(self, visit_create_request: VisitCreateRequest) -> None:
+        visit_log: VisitLog = visit_create_request.toDomain()
+        self.visit_buffer.add(str(visit_log.visitor_ip))
+        
+    async def get_visitor_stats(self) -> dict:
+        if self.approximate:
+            today_visitor = await self.visit_repository.get_visitor_sketch_estimate(date.today().isoformat())
+            total_visitor = await self.visit_repository.get_visitor_sketch_estimate(TOTAL_SKETCH_KEY)
+        else:
+            today_visitor = await self.visit_repository.get_today_visitor_count()
+            total_visitor = await self.visit_repository.get_total_visitor_count()
+        return {
+            "today_visitor":today_visitor,
+            "total_visitor":total_visitor
+        }
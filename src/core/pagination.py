@@ -0,0 +1,19 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+class PostCursor(NamedTuple):
+    created_at: datetime
+    id: str
+
+def encode_cursor(cursor: PostCursor) -> str:
+    payload = json.dumps({"c": cursor.created_at.isoformat(), "i": cursor.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> PostCursor:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return PostCursor(datetime.fromisoformat(payload["c"]), str(payload["i"]))
+    except (ValueError, KeyError, TypeError) as err:
+        raise ValueError("Invalid cursor") from err
@@ -1,50 +1,66 @@
-from core.domain import Post, VisitLog
+from core.domain import Post, VisitLog, Category
+from core.pagination import PostCursor, encode_cursor, decode_cursor
+from core.validator import Validator, post_validator, homepage_stamp
 from infrastructure.sqlalchemy.model import Post as PostEntity
 from infrastructure.sqlalchemy.model import VisitLog as VisitLogEntity
 from fastapi import status, HTTPException
-from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostDetailResponse, PostUpdateRequest, PostUpdateResponse
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse, format_date
 from adapter.dto.visit_dto import VisitCreateRequest
+from adapter.dto.blog_dto import PostSummary
 from port.input.post_service import PostService
 from port.input.visit_service import VisitService
 from port.output.post_repository import PostRepository
 from port.output.visit_repository import VisitRepository
-from infrastructure.env_variable import AUTHENTICATION_CODE
+from infrastructure.env_variable import AUTHENTICATION_CODE, VISITOR_STATS_MODE, VISITOR_SKETCH_PRECISION, POST_PAGE_SIZE
+from infrastructure.cache.homepage_snapshot import HomepageSnapshot, homepage_snapshot, popular_rank, POPULAR_POSTS_SIZE
+from infrastructure.cache.post_detail_cache import PostDetailCache, PostDetailEntry, post_detail_cache
+from infrastructure.cache.category_counts import CategoryCounts, category_counts
+from infrastructure.search.post_search_index import PostSearchIndex, post_search_index
+from infrastructure.cache.invalidation_bus import InvalidationBus, invalidation_bus, POST_CREATED, POST_UPDATED, POST_DELETED, POST_LIKED
+from infrastructure.visit.ingest_buffer import VisitIngestBuffer, visit_ingest_buffer
+from infrastructure.like.like_buffer import LikeBuffer, like_buffer
+from infrastructure.sketch.hyperloglog import HyperLogLog
 import hmac
+import heapq
+from datetime import date
 from infrastructure.log.logger import logger
 
 if not AUTHENTICATION_CODE:
     raise ValueError("AUTHENTICATION_CODE 환경 변수가 설정되지 않았습니다.")
 
-class PostUseCase(PostService):
-    def __init__(self, post_repository:PostRepository) -> None:
+APPROXIMATE_STATS_MODE = "approximate"
+TOTAL_SKETCH_KEY = "total"
+LATEST_POSTS_SIZE = 3
+SUMMARY_KEYS = tuple(PostSummary.model_fields)
+
+class PostUseCaseBase:
+    """State and pure helpers shared by the sync and async post use cases"""
+    def __init__(self, post_repository, snapshot:HomepageSnapshot = homepage_snapshot,
+                 like_buffer:LikeBuffer = like_buffer, detail_cache:PostDetailCache = post_detail_cache,
+                 bus:InvalidationBus = invalidation_bus, search_index:PostSearchIndex = post_search_index,
+                 category_counts:CategoryCounts = category_counts) -> None:
         self.post_repository = post_repository
-        
-    def create_post(self, post_create_request: PostCreateRequest) -> PostCreateResponse:
-        if not hmac.compare_digest(post_create_request.authentication_code, AUTHENTICATION_CODE):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Authentication code not correct.")
-        
-        post:Post = post_create_request.toDomain()
-        
-        post_entity = PostEntity(title=post.title,
-                                summary=post.summary,
-                                content=post.content,
-                                category=post.category,
-                                thumbnail_url=post.thumbnail_url)
-        post_create_response = PostCreateResponse.fromEntity(self.post_repository.save(post_entity))
-        return post_create_response
+        self.snapshot = snapshot
+        self.like_buffer = like_buffer
+        self.detail_cache = detail_cache
+        self.bus = bus
+        self.search_index = search_index
+        self.category_counts = category_counts
     
-    def delete_post(self, post_id, authentication_code) -> None:
+    def _verify_authentication_code(self, authentication_code: str) -> None:
         if not hmac.compare_digest(authentication_code, AUTHENTICATION_CODE):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Authentication code not correct.")
-        
-        self.post_repository.delete_by_id(post_id)
     
-    def update_post(self, post_id:str, post_update_request: PostUpdateRequest) -> PostUpdateResponse:
-        if not hmac.compare_digest(post_update_request.authentication_code, AUTHENTICATION_CODE):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Authentication code not correct.")
-        
-        post:PostEntity = self.post_repository.find_by_id(post_id)
+    def _to_entity(self, post_create_request: PostCreateRequest) -> PostEntity:
+        post:Post = post_create_request.toDomain()
         
+        return PostEntity(title=post.title,
+                        summary=post.summary,
+                        content=post.content,
+                        category=post.category.value,
+                        thumbnail_url=str(post.thumbnail_url))
+    
+    def _apply_update(self, post: PostEntity, post_update_request: PostUpdateRequest) -> PostEntity:
         if post_update_request.title: 
             post.title = post_update_request.title
         if post_update_request.summary: 
@@ -52,61 +68,269 @@ class PostUseCase(PostService):
         if post_update_request.content: 
             post.content = post_update_request.content
         if post_update_request.category: 
-            post.category = post_update_request.category
+            post.category = post_update_request.category.value
         if post_update_request.thumbnail_url:
-            post.thumbnail_url = post_update_request.thumbnail_url
-        
-        return PostUpdateResponse.fromEntity(self.post_repository.save(post))
-    
-    def get_post_detail(self, post_id: str) -> PostDetailResponse:
-        post = self.post_repository.find_by_id(post_id)
-        return PostDetailResponse(title=post.title,
-                                summary=post.summary,
-                                content=post.content,
-                                created_at=post.created_at.strftime("%Y-%m-%d"),
-                                likes_count=post.likes_count,
-                                category=post.category,
-                                thumbnail_url=post.thumbnail_url)
+            post.thumbnail_url = str(post_update_request.thumbnail_url)
+        post.version = PostEntity.version + 1
+        return post
     
-    def add_like_post(self, post_id: str) -> None:
-        self.post_repository.update_post_likes_by_id(post_id)
+    def _to_update_response(self, post: PostEntity) -> PostUpdateResponse:
+        post_update_response = PostUpdateResponse.fromEntity(post)
+        post_update_response.likes_count += self.like_buffer.pending_for(post.id)
+        return post_update_response
+    
+    def _to_detail_entry(self, post: PostEntity) -> PostDetailEntry:
+        # Rows were validated on the way in, so read paths build plain dicts shaped like PostDetailResponse
+        detail = {
+            "title": post.title,
+            "summary": post.summary,
+            "content": post.content,
+            "created_at": format_date(post.created_at),
+            "likes_count": post.likes_count,
+            "category": post.category,
+            "thumbnail_url": post.thumbnail_url,
+        }
+        return PostDetailEntry(detail, post.version, post.updated_at)
+    
+    def _render_detail(self, post_id: str, entry: PostDetailEntry) -> tuple:
+        pending = self.like_buffer.pending_for(post_id)
+        detail = entry.detail | {"likes_count": entry.detail["likes_count"] + pending} if pending else entry.detail
+        return detail, post_validator(entry.version, pending, entry.updated_at)
+    
+    def _post_validator(self, post_id: str, version: int, updated_at) -> Validator:
+        return post_validator(version, self.like_buffer.pending_for(post_id), updated_at)
+    
+    def _detail_cache_stats(self, authentication_code: str) -> dict:
+        self._verify_authentication_code(authentication_code)
+        return self.detail_cache.stats()
         
-    def _format_post_response(self, post) -> dict:
+    def _format_post_response(self, post, pending: dict) -> dict:
         return {
             "id": post.id,
             "title": post.title,
-            "created_at": post.created_at.strftime("%Y-%m-%d"),
-            "likes_count": post.likes_count
+            "created_at": format_date(post.created_at),
+            "likes_count": post.likes_count + pending.get(post.id, 0)
         }
+    
+    def _format_post_detail(self, post, pending: dict) -> dict:
+        return self._format_post_response(post, pending) | {"summary": post.summary, "thumbnail_url": post.thumbnail_url, "category": post.category}
+    
+    def _format_search_results(self, hits: list, rows: list) -> list:
+        # Rows come back in table order and may miss posts deleted since they were indexed, hits keep the ranking
+        pending = self.like_buffer.pending_counts()
+        rows_by_id = {row.id: row for row in rows}
+        return [self._format_post_response(rows_by_id[post_id], pending) for post_id, _ in hits if post_id in rows_by_id]
+    
+    def _format_category_counts(self, counts: dict) -> dict:
+        return {category.value: counts.get(category.value, 0) for category in Category}
+    
+    def _to_page(self, posts: list, limit: int) -> dict:
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(PostCursor(posts[-1].created_at, posts[-1].id))
+        pending = self.like_buffer.pending_counts()
+        return {"posts": [self._format_post_detail(post, pending) for post in posts], "next_cursor": next_cursor}
+    
+    def _assemble_homepage_sections(self, rows: list, limit: int = POST_PAGE_SIZE) -> dict:
+        """Split the single homepage query into sections, `rows` holds limit + 1 newest posts then the most liked ones"""
+        pending = self.like_buffer.pending_counts()
+        newest = [row for row in rows if row.section == "latest"]
+        candidates = {row.id: row for row in rows}.values()
+        popular_rows = heapq.nlargest(POPULAR_POSTS_SIZE, candidates,
+                                      key=lambda row: popular_rank(row.likes_count + pending.get(row.id, 0), row.created_at, row.id))
+        next_cursor = encode_cursor(PostCursor(newest[limit - 1].created_at, newest[limit - 1].id)) if len(newest) > limit else None
+        first_page = [self._format_post_detail(row, pending) for row in newest[:limit]]
+        return {
+            "stamp": homepage_stamp(rows, pending),
+            "all_posts": first_page,
+            "next_cursor": next_cursor,
+            "popular_posts": [self._format_post_response(row, pending) for row in popular_rows],
+            "popular_created_at": {row.id: row.created_at for row in popular_rows},
+            "latest_posts": [{key: post[key] for key in SUMMARY_KEYS} for post in first_page[:LATEST_POSTS_SIZE]],
+        }
+
+class PostUseCase(PostUseCaseBase, PostService):
+    def __init__(self, post_repository:PostRepository, snapshot:HomepageSnapshot = homepage_snapshot,
+                 like_buffer:LikeBuffer = like_buffer, detail_cache:PostDetailCache = post_detail_cache,
+                 bus:InvalidationBus = invalidation_bus, search_index:PostSearchIndex = post_search_index,
+                 category_counts:CategoryCounts = category_counts) -> None:
+        super().__init__(post_repository, snapshot, like_buffer, detail_cache, bus, search_index, category_counts)
         
-    def get_all_post(self) -> list:
-        posts = self.post_repository.get_all_post()
-        return [self._format_post_response(post) | {"summary": post.summary, "thumbnail_url": post.thumbnail_url, "category": post.category} for post in posts]
+    def create_post(self, post_create_request: PostCreateRequest) -> PostCreateResponse:
+        self._verify_authentication_code(post_create_request.authentication_code)
+        
+        with self.category_counts.track() as category_deltas:
+            post = self.post_repository.save(self._to_entity(post_create_request))
+            category_deltas[post.category] += 1
+        post_create_response = PostCreateResponse.fromEntity(post)
+        self.search_index.add(post)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_CREATED, post_create_response.id)
+        return post_create_response
+    
+    def delete_post(self, post_id, authentication_code) -> None:
+        self._verify_authentication_code(authentication_code)
+        
+        with self.category_counts.track() as category_deltas:
+            category_deltas[self.post_repository.delete_by_id(post_id)] -= 1
+        self.like_buffer.discard(post_id)
+        self.detail_cache.invalidate(post_id)
+        self.search_index.remove(post_id)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_DELETED, post_id)
+    
+    def update_post(self, post_id:str, post_update_request: PostUpdateRequest) -> PostUpdateResponse:
+        self._verify_authentication_code(post_update_request.authentication_code)
+        
+        post:PostEntity = self.post_repository.find_by_id(post_id)
+        previous_category = post.category
+        self._apply_update(post, post_update_request)
+        
+        with self.category_counts.track() as category_deltas:
+            post = self.post_repository.save(post)
+            if post.category != previous_category:
+                category_deltas[previous_category] -= 1
+                category_deltas[post.category] += 1
+        self.detail_cache.put(post.id, self._to_detail_entry(post))
+        self.search_index.add(post)
+        self.snapshot.invalidate()
+        self.bus.publish(POST_UPDATED, post.id)
+        return self._to_update_response(post)
+    
+    def get_post_detail(self, post_id: str) -> dict:
+        return self.get_post_detail_with_validator(post_id)[0]
+    
+    def get_post_detail_with_validator(self, post_id: str) -> tuple:
+        entry = self.detail_cache.get(post_id)
+        if entry is None:
+            entry = self.detail_cache.load(post_id, lambda: self._to_detail_entry(self.post_repository.find_by_id(post_id)))
+        return self._render_detail(post_id, entry)
+    
+    def get_post_validator(self, post_id: str) -> Validator:
+        entry = self.detail_cache.get(post_id)
+        if entry is not None:
+            return self._post_validator(post_id, entry.version, entry.updated_at)
+        row = self.post_repository.find_version_by_id(post_id)
+        return self._post_validator(post_id, row.version, row.updated_at)
+    
+    def get_detail_cache_stats(self, authentication_code: str) -> dict:
+        return self._detail_cache_stats(authentication_code)
+    
+    def add_like_post(self, post_id: str) -> None:
+        if self.like_buffer.running:
+            self.like_buffer.add(post_id)
+        else:
+            self.post_repository.update_post_likes_by_id(post_id)
+            self.detail_cache.patch_likes(post_id)
+            self.bus.publish(POST_LIKED, post_id)
+        self.snapshot.patch_likes(post_id)
     
-    def get_popular_posts(self) -> list:
-        posts = self.post_repository.get_popular_posts()
-        return [self._format_post_response(post) for post in posts]
+    def save_likes(self, deltas: dict) -> None:
+        self.post_repository.update_posts_likes(deltas)
+        # Runs before the buffer drops these deltas from pending, so a cached detail never misses them. Until the buffer
+        # clears them, a detail read in between counts them twice, once patched in and once pending; that lasts one flush
+        for post_id, delta in deltas.items():
+            self.detail_cache.patch_likes(post_id, delta)
+        self.bus.publish(POST_LIKED, *deltas)
         
-    def get_latest_posts(self) -> list:
-        posts = self.post_repository.get_latest_posts()
-        return [self._format_post_response(post) for post in posts]
+    def get_post_page(self, limit: int = POST_PAGE_SIZE, cursor: str | None = None, category: Category | None = None) -> dict:
+        post_cursor = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether another page exists
+        return self._to_page(self.post_repository.get_posts_page(limit + 1, post_cursor, category and category.value), limit)
+    
+    def get_category_counts(self) -> dict:
+        counts = self.category_counts.get()
+        if counts is None:
+            version = self.category_counts.version
+            counts = self.post_repository.count_posts_by_category()
+            self.category_counts.store(counts, version)
+        return self._format_category_counts(counts)
+    
+    def search_posts(self, query: str, limit: int) -> list:
+        hits = self.search_index.search(query, limit)
+        if not hits:
+            return []
+        return self._format_search_results(hits, self.post_repository.find_summaries_by_ids([post_id for post_id, _ in hits]))
+    
+    def sync_search_index(self) -> int:
+        """Bring the index in line with the post table, re-reading only new posts and posts whose version moved"""
+        stale_ids = self.search_index.stale_ids(self.post_repository.get_post_versions())
+        self.reindex_posts(stale_ids)
+        return len(stale_ids)
+    
+    def reindex_posts(self, post_ids) -> None:
+        documents = self.post_repository.find_search_documents(list(post_ids))
+        for document in documents:
+            self.search_index.add(document)
+        for post_id in set(post_ids) - {document.id for document in documents}:
+            self.search_index.remove(post_id)
+    
+    def get_homepage_posts(self) -> dict:
+        sections = self.snapshot.get()
+        if sections is not None:
+            return sections
+
+        version = self.snapshot.version
+        sections = self._assemble_homepage_sections(self.post_repository.get_homepage_rows(POST_PAGE_SIZE + 1, POPULAR_POSTS_SIZE))
+        self.snapshot.store(sections, version)
+        return sections
 
 class VisitUseCase(VisitService):
-    def __init__(self, visit_repository:VisitRepository) -> None:
+    def __init__(self, visit_repository:VisitRepository, visit_buffer:VisitIngestBuffer = visit_ingest_buffer,
+                 stats_mode:str = VISITOR_STATS_MODE) -> None:
         self.visit_repository = visit_repository
+        self.visit_buffer = visit_buffer
+        self.approximate = stats_mode == APPROXIMATE_STATS_MODE
     
     def create_visit(self, visit_create_request: VisitCreateRequest) -> None:
         visit_log: VisitLog = visit_create_request.toDomain()
         
+        if self.visit_buffer.running:
+            self.visit_buffer.add(str(visit_log.visitor_ip))
+            return
+        
         if self.visit_repository.exist_by_ip_and_date(visit_log.visitor_ip):
             return
         
-        visit_log_entity = VisitLogEntity(visitor_ip=visit_log.visitor_ip)
-        self.visit_repository.save(visit_log_entity)
+        self.save_visits([(str(visit_log.visitor_ip), date.today())])
+    
+    def save_visits(self, rows:list) -> None:
+        visit_logs = [VisitLogEntity(visitor_ip=visitor_ip, visit_date=visit_date) for visitor_ip, visit_date in rows]
+        if not self.approximate:
+            self.visit_repository.save_all(visit_logs)
+            return
+        
+        self.visit_repository.save_all(visit_logs, record_stats=False)
+        self.visit_repository.merge_visitor_sketches(self._build_sketches(rows))
+    
+    def _build_sketches(self, rows:list) -> dict:
+        sketches = {TOTAL_SKETCH_KEY: HyperLogLog(VISITOR_SKETCH_PRECISION)}
+        for visitor_ip, visit_date in rows:
+            sketch_key = visit_date.isoformat()
+            if sketch_key not in sketches:
+                sketches[sketch_key] = HyperLogLog(VISITOR_SKETCH_PRECISION)
+            sketches[sketch_key].add(visitor_ip)
+            sketches[TOTAL_SKETCH_KEY].add(visitor_ip)
+        return sketches
+    
+    def get_visitor_ips(self, visit_date:date) -> list:
+        return self.visit_repository.find_visitor_ips_by_date(visit_date)
+    
+    def rebuild_visitor_stats(self) -> None:
+        self.visit_repository.rebuild_visitor_stats()
+    
+    def rebuild_visitor_sketches(self) -> None:
+        # Merging is idempotent, so replaying visit_log on top of live sketches is safe
+        self.visit_repository.merge_visitor_sketches(self._build_sketches(self.visit_repository.iter_visits()))
         
     def get_visitor_stats(self) -> dict:
-        today_visitor = self.visit_repository.get_today_visitor_count()
-        total_visitor = self.visit_repository.get_total_visitor_count()
+        if self.approximate:
+            today_visitor = self.visit_repository.get_visitor_sketch_estimate(date.today().isoformat())
+            total_visitor = self.visit_repository.get_visitor_sketch_estimate(TOTAL_SKETCH_KEY)
+        else:
+            today_visitor = self.visit_repository.get_today_visitor_count()
+            total_visitor = self.visit_repository.get_total_visitor_count()
         return {
             "today_visitor":today_visitor,
             "total_visitor":total_visitor
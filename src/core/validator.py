@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+import hashlib
+
+class Validator(NamedTuple):
+    """Strong ETag and optional Last-Modified for a rendered resource"""
+    etag: str
+    last_modified: Optional[datetime] = None
+
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode(), digest_size=8).hexdigest()
+
+def post_validator(version: int, pending_likes: int, updated_at: Optional[datetime]) -> Validator:
+    # Buffered likes change the body before updated_at moves, so only the ETag can vouch for it then
+    last_modified = updated_at if pending_likes == 0 else None
+    return Validator(f'"{version}-{pending_likes}"', last_modified)
+
+def homepage_stamp(rows: Iterable, pending: dict) -> str:
+    """Fingerprint of the homepage post sections from row ids and versions, without rendering them"""
+    return _digest(",".join(f"{row.id}:{row.version}:{pending.get(row.id, 0)}" for row in rows))
+
+def homepage_validator(stamp: str, visitor_stats: dict) -> Validator:
+    return Validator(f'"{stamp}-{visitor_stats["today_visitor"]}-{visitor_stats["total_visitor"]}"')
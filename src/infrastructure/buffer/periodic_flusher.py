@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from threading import Event, Lock, Thread
+from typing import Optional
+from infrastructure.log.logger import logger
+
+class PeriodicFlusher(ABC):
+    """Runs `flush()` on a daemon thread every `interval_ms`, or sooner when `wake()` is called.
+
+    `stop()` wakes the thread, waits for it and flushes one last time so buffered data is drained on shutdown.
+    """
+    def __init__(self, name: str, interval_ms: int) -> None:
+        self.name = name
+        self.interval = interval_ms / 1000
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._flush_lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stopped.is_set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        self._safe_flush()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self._safe_flush()
+
+    def _safe_flush(self) -> None:
+        try:
+            with self._flush_lock:
+                self.flush()
+        except Exception as e:
+            logger.error(f"❌ {self.name} flush failed: {e}")
+
+    @abstractmethod
+    def flush(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,196 @@
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import Dict, Iterator, List, Set, Tuple
+from urllib.parse import urlparse, parse_qs
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Engine
+from infrastructure.cache.invalidation_bus import PostChanged
+from infrastructure.sqlalchemy.config import engine
+from infrastructure.sqlalchemy.model import CacheChange
+import orjson
+import os
+import socket
+import struct
+import uuid
+
+# Keeps every datagram well below the Unix socket and UDP size limits
+IDS_PER_DATAGRAM = 256
+# A version still missing after this long belongs to a rolled back insert and is skipped
+VERSION_HOLE_GRACE_SECONDS = 10
+CHANGE_RETAIN_ROWS = 10000
+CHANGE_PRUNE_INTERVAL_SECONDS = 300
+
+class BusTransport(ABC):
+    @abstractmethod
+    def send(self, origin: str, events: List[PostChanged]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def receive(self) -> Iterator[Tuple[str, PostChanged]]:
+        """Yield (origin, event) for everything that arrived since the last call, without blocking"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class DatagramTransport(BusTransport):
+    """Events as JSON datagrams on a non-blocking socket, read by `receive()` until it would block"""
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.sock.setblocking(False)
+
+    @staticmethod
+    def _encode(origin: str, events: List[PostChanged]) -> Iterator[bytes]:
+        for event in events:
+            for start in range(0, max(len(event.post_ids), 1), IDS_PER_DATAGRAM):
+                yield orjson.dumps({"origin": origin, "kind": event.kind, "post_ids": list(event.post_ids[start:start + IDS_PER_DATAGRAM])})
+
+    def send(self, origin: str, events: List[PostChanged]) -> None:
+        for datagram in self._encode(origin, events):
+            self._send_datagram(datagram)
+
+    @abstractmethod
+    def _send_datagram(self, datagram: bytes) -> None:
+        raise NotImplementedError
+
+    def receive(self) -> Iterator[Tuple[str, PostChanged]]:
+        while True:
+            try:
+                datagram = self.sock.recv(65535)
+            except BlockingIOError:
+                return
+            message = orjson.loads(datagram)
+            yield message["origin"], PostChanged(message["kind"], tuple(message["post_ids"]))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class UnixSocketTransport(DatagramTransport):
+    """Single host: every worker binds a datagram socket in one directory and sends to all the others.
+
+    unix:///run/bang/cache-bus
+    """
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, f"{uuid.uuid4().hex}.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        super().__init__(sock)
+
+    def _send_datagram(self, datagram: bytes) -> None:
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self.path or not name.endswith(".sock"):
+                continue
+            try:
+                self.sock.sendto(datagram, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a worker that died without closing, nobody reads it any more
+                self._unlink(path)
+            except BlockingIOError:
+                # That worker's queue is full, its entries expire on their TTL instead
+                pass
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        super().close()
+        self._unlink(self.path)
+
+
+class MulticastTransport(DatagramTransport):
+    """UDP multicast, looped back to this host. ttl=0 keeps it on the host, ttl=1 reaches the local network.
+
+    udp://239.255.42.99:30099?ttl=0
+    """
+    def __init__(self, group: str, port: int, ttl: int = 0) -> None:
+        self.address = (group, port)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", port))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0")))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        super().__init__(sock)
+
+    def _send_datagram(self, datagram: bytes) -> None:
+        self.sock.sendto(datagram, self.address)
+
+
+class DatabaseTransport(BusTransport):
+    """Works wherever the database is shared: writes append to cache_change and every worker polls past its floor.
+
+    Versions can commit out of order on MySQL, so versions above the floor are tracked individually
+    and the floor only moves over a gap once the gap is older than VERSION_HOLE_GRACE_SECONDS.
+    """
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        with engine.connect() as conn:
+            self._floor = conn.execute(select(func.coalesce(func.max(CacheChange.version), 0))).scalar()
+        self._seen: Set[int] = set()
+        self._holes: Dict[int, float] = {}
+        self._next_prune = monotonic() + CHANGE_PRUNE_INTERVAL_SECONDS
+
+    def send(self, origin: str, events: List[PostChanged]) -> None:
+        rows = [{"origin": origin, "kind": event.kind, "post_id": post_id}
+                for event in events for post_id in (event.post_ids or (None,))]
+        if not rows:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(insert(CacheChange), rows)
+
+    def receive(self) -> Iterator[Tuple[str, PostChanged]]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(CacheChange.version, CacheChange.origin, CacheChange.kind, CacheChange.post_id)
+                .where(CacheChange.version > self._floor)
+                .order_by(CacheChange.version)
+            ).all()
+        for row in rows:
+            if row.version not in self._seen:
+                self._seen.add(row.version)
+                yield row.origin, PostChanged(row.kind, (row.post_id,) if row.post_id else ())
+        self._advance_floor()
+        self._prune()
+
+    def _advance_floor(self) -> None:
+        now = monotonic()
+        highest = max(self._seen, default=self._floor)
+        while self._floor < highest:
+            version = self._floor + 1
+            if version in self._seen:
+                self._seen.discard(version)
+            elif now - self._holes.setdefault(version, now) < VERSION_HOLE_GRACE_SECONDS:
+                return
+            else:
+                del self._holes[version]
+            self._floor = version
+
+    def _prune(self) -> None:
+        if monotonic() < self._next_prune:
+            return
+        self._next_prune = monotonic() + CHANGE_PRUNE_INTERVAL_SECONDS
+        with self.engine.begin() as conn:
+            conn.execute(delete(CacheChange).where(CacheChange.version <= self._floor - CHANGE_RETAIN_ROWS))
+
+
+def transport_from_url(url: str) -> BusTransport:
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return UnixSocketTransport(parsed.path)
+    if parsed.scheme == "udp":
+        ttl = int(parse_qs(parsed.query).get("ttl", ["0"])[0])
+        return MulticastTransport(parsed.hostname, parsed.port, ttl)
+    if parsed.scheme == "database":
+        return DatabaseTransport(engine)
+    raise ValueError(f"Unsupported CACHE_BUS_URL scheme: {parsed.scheme}")
@@ -0,0 +1,57 @@
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, Optional
+
+class CategoryCounts:
+    """Post count per category, loaded once with GROUP BY and then adjusted in place by every local write.
+
+    A load can read a row that a write has committed but not yet counted, so loads are refused while a write is
+    in flight or once one has finished since the load started. Writes from other workers arrive on the bus
+    without their categories, those drop the counts and the next read reloads them.
+    """
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counts: Optional[Dict[str, int]] = None
+        self._version = 0
+        self._writers = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self) -> Optional[Dict[str, int]]:
+        return self._counts
+
+    def store(self, counts: Dict[str, int], version: int) -> bool:
+        with self._lock:
+            if self._writers or version != self._version:
+                return False
+            self._counts = counts
+            return True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._counts = None
+
+    @contextmanager
+    def track(self) -> Iterator[Counter]:
+        """Wrap a write and fill the yielded Counter with its per-category deltas once it has committed"""
+        deltas = Counter()
+        with self._lock:
+            self._writers += 1
+            self._version += 1
+        try:
+            yield deltas
+        finally:
+            with self._lock:
+                self._writers -= 1
+                self._version += 1
+                if self._counts is not None and deltas:
+                    counts = dict(self._counts)
+                    for category, delta in deltas.items():
+                        counts[category] = counts.get(category, 0) + delta
+                    self._counts = counts
+
+category_counts = CategoryCounts()
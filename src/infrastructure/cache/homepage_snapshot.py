@@ -0,0 +1,76 @@
+from threading import Lock
+import hashlib
+from typing import Optional
+
+POPULAR_POSTS_SIZE = 3
+
+def popular_rank(likes_count: int, created_at, post_id: str) -> tuple:
+    """Sort key of the popular section: ties on likes go to the newer post, then to the larger id, so the
+    ranking is the same whether the section was just built or patched in place"""
+    return likes_count, created_at, post_id
+
+class HomepageSnapshot:
+    """In-memory snapshot of the post sections rendered on GET /blog.
+
+    Sections are replaced copy-on-write, so readers never see a half-patched list.
+    Every write bumps `version`; a snapshot built from data read before the bump is discarded.
+    """
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._sections: Optional[dict] = None
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self) -> Optional[dict]:
+        return self._sections
+
+    def store(self, sections: dict, version: int) -> bool:
+        with self._lock:
+            if version != self._version:
+                return False
+            self._sections = sections
+            return True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._sections = None
+
+    def patch_likes(self, post_id: str, delta: int = 1) -> None:
+        with self._lock:
+            self._version += 1
+            sections = self._sections
+            if sections is None:
+                return
+
+            def patch(posts: list) -> list:
+                return [{**post, "likes_count": post["likes_count"] + delta} if post["id"] == post_id else post
+                        for post in posts]
+
+            all_posts = patch(sections["all_posts"])
+            latest_posts = patch(sections["latest_posts"])
+            popular_posts = patch(sections["popular_posts"])
+
+            if not any(post["id"] == post_id for post in popular_posts):
+                liked = next((post for post in all_posts if post["id"] == post_id), None)
+                lowest = min((post["likes_count"] for post in popular_posts), default=None)
+                if liked is None or (lowest is not None and liked["likes_count"] >= lowest) or len(popular_posts) < POPULAR_POSTS_SIZE:
+                    # The ranking may change in a way the snapshot cannot decide on its own
+                    self._sections = None
+                    return
+
+            self._sections = {
+                **sections,
+                # Chain the fingerprint so the patched sections get a fresh ETag without rehashing every row
+                "stamp": hashlib.blake2b(f"{sections['stamp']}:{post_id}:{delta}".encode(), digest_size=8).hexdigest(),
+                "all_posts": all_posts,
+                # Rendered dates are day precision, so the full created_at of each popular post is kept beside them
+                "popular_posts": sorted(popular_posts, reverse=True,
+                                        key=lambda post: popular_rank(post["likes_count"], sections["popular_created_at"][post["id"]], post["id"])),
+                "latest_posts": latest_posts,
+            }
+
+homepage_snapshot = HomepageSnapshot()
@@ -0,0 +1,81 @@
+from threading import Lock
+from typing import Callable, List, NamedTuple, Optional, Tuple
+from infrastructure.buffer.periodic_flusher import PeriodicFlusher
+from infrastructure.cache.category_counts import category_counts
+from infrastructure.cache.homepage_snapshot import homepage_snapshot
+from infrastructure.cache.post_detail_cache import post_detail_cache
+from infrastructure.env_variable import CACHE_BUS_INTERVAL_MS
+import uuid
+
+POST_CREATED = "created"
+POST_UPDATED = "updated"
+POST_DELETED = "deleted"
+POST_LIKED = "liked"
+
+class PostChanged(NamedTuple):
+    kind: str
+    post_ids: Tuple[str, ...] = ()
+
+class InvalidationBus(PeriodicFlusher):
+    """Tells the other worker processes which posts changed so they can evict their copies.
+
+    `publish()` only queues the event, so it is safe to call from the event loop. The bus thread sends the
+    queue and drains what the other workers sent, every `interval_ms` or as soon as something is published.
+    Delivery is best effort: a lost event leaves a stale entry until its TTL runs out, never a wrong write.
+    """
+    def __init__(self, interval_ms: int) -> None:
+        super().__init__("cache-bus", interval_ms)
+        # Unique per process, so a worker ignores its own events when the transport loops them back
+        self.origin = uuid.uuid4().hex
+        self._lock = Lock()
+        self._outgoing: List[PostChanged] = []
+        self._transport = None
+        self._handler: Optional[Callable[[PostChanged], None]] = None
+        self.published = 0
+        self.received = 0
+
+    def configure(self, transport, handler: Callable[[PostChanged], None]) -> None:
+        self._transport = transport
+        self._handler = handler
+
+    @property
+    def pending(self) -> int:
+        return len(self._outgoing)
+
+    def publish(self, kind: str, *post_ids: str) -> None:
+        if not self.running:
+            return
+        with self._lock:
+            self._outgoing.append(PostChanged(kind, post_ids))
+        self.wake()
+
+    def flush(self) -> None:
+        with self._lock:
+            outgoing, self._outgoing = self._outgoing, []
+        try:
+            self._transport.send(self.origin, outgoing)
+        except Exception:
+            with self._lock:
+                self._outgoing[:0] = outgoing
+            raise
+        self.published += len(outgoing)
+
+        for origin, event in self._transport.receive():
+            if origin != self.origin:
+                self.received += 1
+                self._handler(event)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._transport is not None:
+            self._transport.close()
+
+def evict_post_caches(event: PostChanged) -> None:
+    """Drop what another worker's write made stale. Likes are evicted rather than patched, since events can be lost"""
+    for post_id in event.post_ids:
+        post_detail_cache.invalidate(post_id)
+    homepage_snapshot.invalidate()
+    if event.kind != POST_LIKED:
+        category_counts.invalidate()
+
+invalidation_bus = InvalidationBus(interval_ms=CACHE_BUS_INTERVAL_MS)
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+from infrastructure.env_variable import POST_DETAIL_CACHE_SIZE, POST_DETAIL_CACHE_TTL_SECONDS
+import asyncio
+
+class PostDetailEntry(NamedTuple):
+    """Rendered post detail as stored in the database, buffered likes are overlaid when it is served"""
+    detail: dict
+    version: int
+    updated_at: object
+
+class PostDetailCache:
+    """Bounded LRU + TTL cache of post details keyed by post id.
+
+    Concurrent misses on one post share a single load: the first caller runs the loader and the others
+    wait on its future, from threads or from the event loop. Every write bumps `generation`, and a load
+    that started before the bump is handed to its waiters but not stored.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+    def get(self, post_id: str) -> Optional[PostDetailEntry]:
+        with self._lock:
+            cached = self._entries.get(post_id)
+            if cached is None:
+                return None
+            expires_at, entry = cached
+            if expires_at <= monotonic():
+                del self._entries[post_id]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(post_id)
+            self.hits += 1
+            return entry
+
+    def _begin_load(self, post_id: str) -> tuple:
+        with self._lock:
+            future = self._loading.get(post_id)
+            if future is not None:
+                self.coalesced += 1
+                return future, False, self._generation
+            future = Future()
+            self._loading[post_id] = future
+            self.misses += 1
+            return future, True, self._generation
+
+    def _finish_load(self, post_id: str, future: Future, generation: int, entry: Optional[PostDetailEntry], error: Optional[BaseException]) -> None:
+        with self._lock:
+            del self._loading[post_id]
+            if error is None and generation == self._generation:
+                self._store(post_id, entry)
+        if error is None:
+            future.set_result(entry)
+        else:
+            future.set_exception(error)
+
+    def load(self, post_id: str, loader: Callable[[], PostDetailEntry]) -> PostDetailEntry:
+        future, leader, generation = self._begin_load(post_id)
+        if not leader:
+            return future.result()
+        try:
+            entry = loader()
+        except BaseException as error:
+            self._finish_load(post_id, future, generation, None, error)
+            raise
+        self._finish_load(post_id, future, generation, entry, None)
+        return entry
+
+    async def load_async(self, post_id: str, loader: Callable[[], Awaitable[PostDetailEntry]]) -> PostDetailEntry:
+        future, leader, generation = self._begin_load(post_id)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            entry = await loader()
+        except BaseException as error:
+            self._finish_load(post_id, future, generation, None, error)
+            raise
+        self._finish_load(post_id, future, generation, entry, None)
+        return entry
+
+    def _store(self, post_id: str, entry: PostDetailEntry) -> None:
+        self._entries[post_id] = (monotonic() + self.ttl_seconds, entry)
+        self._entries.move_to_end(post_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put(self, post_id: str, entry: PostDetailEntry) -> None:
+        with self._lock:
+            self._generation += 1
+            self._store(post_id, entry)
+
+    def invalidate(self, post_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(post_id, None)
+
+    def patch_likes(self, post_id: str, delta: int = 1) -> None:
+        """Mirror a committed likes UPDATE, which also bumped the row version and moved updated_at.
+
+        The database set updated_at with its own clock, so the entry drops it rather than guess, and the detail is
+        served without Last-Modified until it is reloaded. If-Modified-Since can then never answer 304 for a stale body.
+        """
+        with self._lock:
+            self._generation += 1
+            cached = self._entries.get(post_id)
+            if cached is None:
+                return
+            expires_at, entry = cached
+            detail = {**entry.detail, "likes_count": entry.detail["likes_count"] + delta}
+            self._entries[post_id] = (expires_at, entry._replace(detail=detail, version=entry.version + 1, updated_at=None))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+post_detail_cache = PostDetailCache(maxsize=POST_DETAIL_CACHE_SIZE, ttl_seconds=POST_DETAIL_CACHE_TTL_SECONDS)
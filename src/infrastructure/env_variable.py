@@ -7,4 +7,55 @@ AUTHENTICATION_CODE = os.getenv("AUTHENTICATION_CODE")
 DATABASE_URL = os.getenv("DATABASE_URL")
 CLIENT_DOMAIN = os.getenv("CLIENT_DOMAIN")
 SERVER_ENV = os.getenv("SERVER_ENV", "Development")
-SENTRY_DSN = os.getenv("SENTRY_DSN")
\ No newline at end of file
+SENTRY_DSN = os.getenv("SENTRY_DSN")
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL")
+DB_REPLICA_RETRY_SECONDS = int(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+VISIT_FLUSH_INTERVAL_MS = int(os.getenv("VISIT_FLUSH_INTERVAL_MS", "500"))
+VISIT_FLUSH_ROWS = int(os.getenv("VISIT_FLUSH_ROWS", "100"))
+VISIT_QUEUE_SIZE = int(os.getenv("VISIT_QUEUE_SIZE", "10000"))
+VISITOR_STATS_MODE = os.getenv("VISITOR_STATS_MODE", "exact")
+VISITOR_SKETCH_PRECISION = int(os.getenv("VISITOR_SKETCH_PRECISION", "14"))
+LIKE_FLUSH_INTERVAL_MS = int(os.getenv("LIKE_FLUSH_INTERVAL_MS", "1000"))
+LIKE_FLUSH_THRESHOLD = int(os.getenv("LIKE_FLUSH_THRESHOLD", "100"))
+POST_PAGE_SIZE = int(os.getenv("POST_PAGE_SIZE", "20"))
+POST_DETAIL_MAX_AGE = int(os.getenv("POST_DETAIL_MAX_AGE", "60"))
+POST_DETAIL_CACHE_SIZE = int(os.getenv("POST_DETAIL_CACHE_SIZE", "512"))
+POST_DETAIL_CACHE_TTL_SECONDS = int(os.getenv("POST_DETAIL_CACHE_TTL_SECONDS", "300"))
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "")
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "10"))
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "local://")
+
+CACHE_BUS_URL = os.getenv("CACHE_BUS_URL", "")
+CACHE_BUS_INTERVAL_MS = int(os.getenv("CACHE_BUS_INTERVAL_MS", "250"))
+DB_POOL_WAIT_WARN_MS = int(os.getenv("DB_POOL_WAIT_WARN_MS", "50"))
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+LOG_SLOW_REQUEST_MS = int(os.getenv("LOG_SLOW_REQUEST_MS", "500"))
+
+SENTRY_PROFILING = os.getenv("SENTRY_PROFILING", "off")
+TRACES_SAMPLE_RATES = os.getenv("TRACES_SAMPLE_RATES", "")
+TRACES_GET_SAMPLE_RATE = float(os.getenv("TRACES_GET_SAMPLE_RATE", "0.02"))
+TRACES_MAX_PER_SECOND = float(os.getenv("TRACES_MAX_PER_SECOND", "2"))
+TRACES_SLOW_REQUEST_MS = int(os.getenv("TRACES_SLOW_REQUEST_MS", "1000"))
+TRACES_BOOST_STATUS = int(os.getenv("TRACES_BOOST_STATUS", "500"))
+TRACES_BOOST_SECONDS = int(os.getenv("TRACES_BOOST_SECONDS", "60"))
+
+# /metrics exposes route names, latencies and pool state: off by default in production, and only served there behind METRICS_TOKEN
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", str(SERVER_ENV != "Product")).lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Reports X-DB-Query-Count on every response and warns when a route exceeds its query budget, off in production
+QUERY_COUNT_HEADER = os.getenv("QUERY_COUNT_HEADER", str(SERVER_ENV != "Product")).lower() == "true"
+
+# Connections each pool opens during warmup, before /readyz reports ready
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "2"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+WARMUP_RETRY_SECONDS = int(os.getenv("WARMUP_RETRY_SECONDS", "5"))
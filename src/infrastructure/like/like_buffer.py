@@ -0,0 +1,69 @@
+from collections import Counter
+from threading import Lock
+from typing import Callable, Dict, Optional
+from infrastructure.buffer.periodic_flusher import PeriodicFlusher
+from infrastructure.env_variable import LIKE_FLUSH_INTERVAL_MS, LIKE_FLUSH_THRESHOLD
+
+class LikeBuffer(PeriodicFlusher):
+    """Coalesces like increments per post and writes them in one batched UPDATE.
+
+    Deltas being written stay visible through `pending_for()` until the write commits,
+    and are merged back if it fails, so a graceful restart loses nothing and a crash loses at most one interval.
+    """
+    def __init__(self, flush_threshold: int, flush_interval_ms: int) -> None:
+        super().__init__("like-flush", flush_interval_ms)
+        self.flush_threshold = flush_threshold
+        self._lock = Lock()
+        self._pending: Counter = Counter()
+        self._inflight: Counter = Counter()
+        self._pending_total = 0
+        self._flush_handler: Optional[Callable[[Dict[str, int]], None]] = None
+
+    def configure(self, flush_handler: Callable[[Dict[str, int]], None]) -> None:
+        self._flush_handler = flush_handler
+
+    @property
+    def pending(self) -> int:
+        return self._pending_total
+
+    def add(self, post_id: str, delta: int = 1) -> None:
+        with self._lock:
+            self._pending[post_id] += delta
+            self._pending_total += delta
+            should_flush = self._pending_total >= self.flush_threshold
+        if should_flush:
+            self.wake()
+
+    def pending_for(self, post_id: str) -> int:
+        with self._lock:
+            return self._pending.get(post_id, 0) + self._inflight.get(post_id, 0)
+
+    def pending_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._pending + self._inflight)
+
+    def discard(self, post_id: str) -> None:
+        with self._lock:
+            self._pending_total -= self._pending.pop(post_id, 0)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            self._inflight, self._pending = self._pending, Counter()
+            self._pending_total = 0
+            deltas = dict(self._inflight)
+
+        try:
+            self._flush_handler(deltas)
+        except Exception:
+            with self._lock:
+                self._pending.update(self._inflight)
+                self._pending_total += sum(self._inflight.values())
+                self._inflight = Counter()
+            raise
+
+        with self._lock:
+            self._inflight = Counter()
+
+like_buffer = LikeBuffer(flush_threshold=LIKE_FLUSH_THRESHOLD, flush_interval_ms=LIKE_FLUSH_INTERVAL_MS)
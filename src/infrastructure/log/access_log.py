@@ -0,0 +1,32 @@
+from random import random
+from typing import Dict
+from infrastructure.env_variable import LOG_SAMPLE_RATES, LOG_SLOW_REQUEST_MS
+import logging
+
+access_logger = logging.getLogger("access")
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """"GET /blog=0.05,/posts/{post_id}=0.2,*=1" -> {[method ]route template: share of successful requests to log}"""
+    rates = {}
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        route, _, rate = entry.rpartition("=")
+        if not route:
+            raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {entry}")
+        rates[route.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+class AccessLogSampler:
+    """Logs a share of fast successful requests per route template, and every error or slow request"""
+    def __init__(self, rates: Dict[str, float], slow_ms: float) -> None:
+        self.default_rate = rates.pop("*", 1.0)
+        self.rates = rates
+        self.slow_ms = slow_ms
+
+    def sample_rate(self, method: str, route: str, status_code: int, duration_ms: float) -> float:
+        """Rate the request is logged at, or 0 when this one is skipped"""
+        if status_code >= 400 or duration_ms >= self.slow_ms:
+            return 1.0
+        rate = self.rates.get(f"{method} {route}", self.rates.get(route, self.default_rate)) if self.rates else self.default_rate
+        return rate if rate >= 1.0 or random() < rate else 0.0
+
+access_log_sampler = AccessLogSampler(parse_sample_rates(LOG_SAMPLE_RATES), LOG_SLOW_REQUEST_MS)
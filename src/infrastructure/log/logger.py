@@ -1,11 +1,72 @@
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from infrastructure.env_variable import LOG_LEVEL, LOG_FORMAT, LOG_QUEUE_SIZE
+import atexit
 import logging
+import orjson
+import queue
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# Attributes every LogRecord carries, anything else arrived through `extra=` and becomes a JSON field
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, then every `extra=` field"""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return orjson.dumps(payload, default=str).decode()
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues records unformatted, so `%` interpolation and encoding run on the writer thread, not the event loop.
+
+    Arguments are therefore rendered after the call returns: log immutable values, not objects the caller keeps
+    mutating. A full queue drops the record and counts it instead of blocking the caller on a stalled sink.
+    """
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks pin the caller's frames, render them now and let the frames go
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = DeferredQueueHandler(log_queue)
+
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
 
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    level=LOG_LEVEL,
     handlers=[
-        logging.StreamHandler() 
+        queue_handler
     ]
 )
 
+log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+log_listener.start()
+# Drains whatever is still queued when the process exits
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger(__name__)
@@ -0,0 +1,67 @@
+from typing import Dict
+from sqlalchemy.pool import Pool, QueuePool
+from infrastructure.metrics.registry import metrics_registry
+from infrastructure.cache.post_detail_cache import post_detail_cache
+from infrastructure.cache.homepage_snapshot import homepage_snapshot
+from infrastructure.cache.category_counts import category_counts
+from infrastructure.cache.invalidation_bus import invalidation_bus
+from infrastructure.search.post_search_index import post_search_index
+from infrastructure.like.like_buffer import like_buffer
+from infrastructure.visit.ingest_buffer import visit_ingest_buffer
+from infrastructure.log.logger import log_queue, queue_handler
+
+watched_pools: Dict[str, Pool] = {}
+
+def watch_pool(name: str, pool: Pool) -> None:
+    # Only queue pools have a size to report, SQLite and NullPool setups export no pool gauges
+    if isinstance(pool, QueuePool):
+        watched_pools[name] = pool
+
+def _per_pool(read) -> Dict[tuple, float]:
+    return {(name,): read(pool) for name, pool in watched_pools.items()}
+
+def _wait_stat(pool: Pool, key: str) -> float:
+    wait_stats = getattr(pool, "wait_stats", None)
+    return wait_stats.snapshot()[key] if wait_stats is not None else 0
+
+metrics_registry.gauge_callback("db_pool_checked_out", "Connections currently checked out", ("pool",),
+                                lambda: _per_pool(lambda pool: pool.checkedout()))
+metrics_registry.gauge_callback("db_pool_overflow", "Connections open beyond pool_size, negative while the pool is not full yet", ("pool",),
+                                lambda: _per_pool(lambda pool: pool.overflow()))
+metrics_registry.gauge_callback("db_pool_size", "Configured pool_size", ("pool",),
+                                lambda: _per_pool(lambda pool: pool.size()))
+metrics_registry.gauge_callback("db_pool_checkouts_total", "Connection checkouts", ("pool",),
+                                lambda: _per_pool(lambda pool: _wait_stat(pool, "checkouts")), kind="counter")
+metrics_registry.gauge_callback("db_pool_wait_seconds_total", "Time spent waiting for a pooled connection", ("pool",),
+                                lambda: _per_pool(lambda pool: _wait_stat(pool, "total_wait_ms") / 1000), kind="counter")
+metrics_registry.gauge_callback("db_pool_max_wait_seconds", "Longest single checkout wait since start", ("pool",),
+                                lambda: _per_pool(lambda pool: _wait_stat(pool, "max_wait_ms") / 1000))
+
+def _cache_entries() -> Dict[tuple, float]:
+    return {
+        ("post_detail",): post_detail_cache.stats()["size"],
+        ("homepage_snapshot",): int(homepage_snapshot.get() is not None),
+        ("category_counts",): int(category_counts.get() is not None),
+        ("search_index",): len(post_search_index),
+    }
+
+def _detail_cache_events() -> Dict[tuple, float]:
+    stats = post_detail_cache.stats()
+    return {(event,): stats[event] for event in ("hits", "misses", "coalesced", "evictions", "expirations")}
+
+def _queue_depths() -> Dict[tuple, float]:
+    return {
+        ("like_buffer",): like_buffer.pending,
+        ("visit_ingest",): visit_ingest_buffer.pending,
+        ("cache_bus",): invalidation_bus.pending,
+        ("log",): log_queue.qsize(),
+    }
+
+metrics_registry.gauge_callback("cache_entries", "Entries held by in-process caches, 1 or 0 for single value caches", ("cache",), _cache_entries)
+metrics_registry.gauge_callback("post_detail_cache_events_total", "Post detail cache lookups and removals", ("event",),
+                                _detail_cache_events, kind="counter")
+metrics_registry.gauge_callback("queue_depth", "Items waiting in in-process buffers and queues", ("queue",), _queue_depths)
+metrics_registry.gauge_callback("log_records_dropped_total", "Log records dropped because the log queue was full", (),
+                                lambda: {(): queue_handler.dropped}, kind="counter")
+metrics_registry.gauge_callback("visits_dropped_total", "Visits dropped because the visit ingest queue was full", (),
+                                lambda: {(): visit_ingest_buffer.dropped}, kind="counter")
@@ -0,0 +1,11 @@
+from infrastructure.metrics.registry import metrics_registry, LATENCY_BUCKETS, QUERY_BUCKETS
+
+# Requests no route matched share one label, so scanners cannot grow the series count
+UNMATCHED_ROUTE = "unmatched"
+
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route"), LATENCY_BUCKETS)
+http_requests = metrics_registry.counter(
+    "http_requests_total", "Requests by route template and status", ("method", "route", "status"))
+db_statement_duration = metrics_registry.histogram(
+    "db_statement_duration_seconds", "SQL statement time in the driver by the repository method that issued it", ("source",), QUERY_BUCKETS)
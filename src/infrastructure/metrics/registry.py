@@ -0,0 +1,180 @@
+from bisect import bisect_left
+from threading import Lock, local
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import weakref
+
+Labels = Tuple[str, ...]
+
+# Seconds, from a cached detail read up to a cold homepage on a slow database
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class _ShardOwner:
+    """Kept in the owning thread's local storage only, so it is collected when that thread exits"""
+    __slots__ = ("__weakref__",)
+
+class ShardedMetric:
+    """Each thread writes to its own dict, so recording never takes a lock and never contends.
+
+    Only the owning thread mutates a shard. The scrape copies every shard with `list(dict.items())`, which runs
+    under the GIL in one step, then sums them. A shard is registered once per thread and folded into `_base`
+    when the thread exits, so short-lived threads do not leave shards behind; both paths take the lock.
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = local()
+        self._shards: List[dict] = []
+        # Totals of exited threads, values are replaced rather than mutated so a scrape's copy stays consistent
+        self._base: dict = {}
+        self._shards_lock = Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._local.owner = _ShardOwner()
+            weakref.finalize(self._local.owner, self._retire, shard)
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard: dict) -> None:
+        with self._shards_lock:
+            for labels, value in shard.items():
+                self._base[labels] = self._combine(self._base[labels], value) if labels in self._base else value
+            self._shards = [live for live in self._shards if live is not shard]
+
+    def _shard_items(self) -> Iterable[Tuple[Labels, object]]:
+        # Base and shard list are read together, a shard is counted either on its own or in the base, never twice
+        with self._shards_lock:
+            base, shards = list(self._base.items()), list(self._shards)
+        yield from base
+        for shard in shards:
+            yield from list(shard.items())
+
+    def _combine(self, total, value):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(ShardedMetric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _combine(self, total: float, value: float) -> float:
+        return total + value
+
+    def collect(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for labels, value in self._shard_items():
+            totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+                for labels, value in sorted(self.collect().items())]
+
+class Histogram(ShardedMetric):
+    """Per label set: one count per bucket plus the +Inf overflow, the sum, rendered cumulative like Prometheus"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # Bucket counts followed by the running sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def _combine(self, total: list, series: list) -> list:
+        return [left + right for left, right in zip(total, list(series))]
+
+    def collect(self) -> Dict[Labels, list]:
+        totals: Dict[Labels, list] = {}
+        for labels, series in self._shard_items():
+            total = totals.setdefault(labels, [0] * len(series[:-1]) + [0.0])
+            for index, value in enumerate(list(series)):
+                total[index] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, series in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+class CallbackMetric:
+    """Read at scrape time from state that already exists, such as pool sizes or queue depths"""
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str],
+                 callback: Callable[[], Dict[Labels, float]], kind: str = "gauge") -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.callback = callback
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+                for labels, value in sorted(self.callback().items())]
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def gauge_callback(self, name: str, documentation: str, label_names: Sequence[str],
+                       callback: Callable[[], Dict[Labels, float]], kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, label_names, callback, kind))
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics_registry = MetricsRegistry()
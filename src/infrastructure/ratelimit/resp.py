@@ -0,0 +1,104 @@
+from typing import List, Optional, Sequence, Union
+from urllib.parse import urlparse
+import socket
+
+Reply = Union[int, bytes, str, None, list]
+
+class RespError(Exception):
+    """Error reply (-ERR ...) from the server"""
+
+class RespClient:
+    """Minimal blocking RESP2 client, enough for counters on Redis or any server speaking its protocol.
+
+    Not thread-safe: give each thread its own client.
+    """
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, timeout: float = 1.0) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> "RespClient":
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db, timeout)
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.db:
+            self._send([("SELECT", self.db)])
+            self._read_reply()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+        self._sock = None
+        self._reader = None
+
+    @staticmethod
+    def _encode(command: Sequence) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            value = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    def _send(self, commands: List[Sequence]) -> None:
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+
+    def _read_reply(self) -> Reply:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by RESP server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RespError(f"Unexpected reply type {kind!r}")
+
+    def pipeline(self, *commands: Sequence) -> List[Reply]:
+        """Send every command in one write and read the replies in order, one round trip in total"""
+        try:
+            if self._sock is None:
+                self._connect()
+            try:
+                self._send(list(commands))
+            except OSError:
+                # The server dropped an idle connection; nothing was applied, so resend once on a fresh one
+                self.close()
+                self._connect()
+                self._send(list(commands))
+            replies, error = [], None
+            for _ in commands:
+                try:
+                    replies.append(self._read_reply())
+                except RespError as err:
+                    error = error or err
+                    replies.append(err)
+        except OSError:
+            self.close()
+            raise
+        if error is not None:
+            raise error
+        return replies
+
+    def execute(self, *command) -> Reply:
+        return self.pipeline(command)[0]
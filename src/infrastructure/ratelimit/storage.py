@@ -0,0 +1,302 @@
+from abc import abstractmethod
+from threading import Lock, local
+from time import time
+from typing import Dict, List, Optional, Tuple
+from limits.storage import Storage
+from infrastructure.ratelimit.resp import RespClient, RespError
+from infrastructure.log.logger import logger
+import sqlite3
+
+# Expired rows and entries are swept at most this often, keeping every hit O(1) amortized
+SWEEP_INTERVAL_SECONDS = 60
+
+class SlidingWindowCounterSupport:
+    """Sliding window counter: two fixed-window counts per key, the previous one weighted by its remaining overlap.
+
+    Storages only provide the atomic window primitives below. Method names follow the sliding window API
+    of `limits` 4.1 and later, so the strategy can be swapped for theirs once the lock moves past 4.0.1.
+    """
+    @abstractmethod
+    def _add_to_window(self, key: str, expiry: int, window: int, amount: int) -> Tuple[int, int]:
+        """Add `amount` to the current window of `key`, rolling it first if `window` moved on.
+        Return (previous window count, current window count after the add)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _remove_from_window(self, key: str, expiry: int, window: int, amount: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _read_window(self, key: str, expiry: int, window: int) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _latest_window(self, key: str) -> Optional[Tuple[int, int, int]]:
+        """Return (window, expiry, count) of the newest window stored for `key`, None when nothing is stored"""
+        raise NotImplementedError
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        now = time()
+        window = int(now // expiry)
+        try:
+            previous, current = self._add_to_window(key, expiry, window, amount)
+            weight = 1 - (now % expiry) / expiry
+            if previous * weight + current > limit:
+                # Optimistic add, rolled back when over the limit, so concurrent workers never need a lock between them
+                self._remove_from_window(key, expiry, window, amount)
+                return False
+        except self.base_exceptions as e:
+            # Fail open: an unreachable storage must not turn into 500s on every limited route
+            logger.error(f"❌ Rate limit storage error in acquire_sliding_window_entry(): {e}")
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        """Return (previous count, previous ttl, current count, current ttl) like `limits` does"""
+        now = time()
+        window = int(now // expiry)
+        previous, current = self._read_window(key, expiry, window)
+        return previous, (window + 1) * expiry - now, current, (window + 2) * expiry - now
+
+    # Fixed window API required by `limits.storage.Storage`, served from the current window
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        return self._add_to_window(key, expiry, int(time() // expiry), amount)[1]
+
+    def get(self, key: str) -> int:
+        latest = self._latest_window(key)
+        if latest is None:
+            return 0
+        window, expiry, count = latest
+        return count if window == int(time() // expiry) else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time()
+        latest = self._latest_window(key)
+        if latest is None or latest[0] != int(now // latest[1]):
+            return now
+        return (latest[0] + 1) * latest[1]
+
+
+class LocalWindowStorage(SlidingWindowCounterSupport, Storage):
+    """Per-process counters, for a single worker or local runs"""
+    STORAGE_SCHEME = ["local"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options) -> None:
+        super().__init__(uri, wrap_exceptions, **options)
+        self._lock = Lock()
+        # key -> [window, current count, previous count, expires_at]
+        self._windows: Dict[str, List] = {}
+        self._next_sweep = time() + SWEEP_INTERVAL_SECONDS
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def _roll(self, key: str, expiry: int, window: int) -> List:
+        entry = self._windows.get(key)
+        if entry is None or entry[0] < window - 1:
+            entry = self._windows[key] = [window, 0, 0, 0]
+        elif entry[0] == window - 1:
+            entry[:3] = [window, 0, entry[1]]
+        entry[3] = (window + 2) * expiry
+        return entry
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        for key in [key for key, entry in self._windows.items() if entry[3] <= now]:
+            del self._windows[key]
+
+    def _add_to_window(self, key: str, expiry: int, window: int, amount: int) -> Tuple[int, int]:
+        with self._lock:
+            self._sweep(time())
+            entry = self._roll(key, expiry, window)
+            entry[1] += amount
+            return entry[2], entry[1]
+
+    def _remove_from_window(self, key: str, expiry: int, window: int, amount: int) -> None:
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is not None and entry[0] == window:
+                entry[1] -= amount
+
+    def _read_window(self, key: str, expiry: int, window: int) -> Tuple[int, int]:
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < window - 1:
+                return 0, 0
+            if entry[0] == window - 1:
+                return entry[1], 0
+            return entry[2], entry[1]
+
+    def _latest_window(self, key: str) -> Optional[Tuple[int, int, int]]:
+        with self._lock:
+            entry = self._windows.get(key)
+            # expires_at is (window + 2) * expiry, so the window length comes back out of it
+            return None if entry is None else (entry[0], entry[3] // (entry[0] + 2), entry[1])
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> int:
+        with self._lock:
+            count = len(self._windows)
+            self._windows.clear()
+            return count
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+
+
+class SQLiteWindowStorage(SlidingWindowCounterSupport, Storage):
+    """Counters in a SQLite file, shared by every worker on one host: sqlite:////var/lib/bang/ratelimit.db"""
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, timeout: float = 5.0, **options) -> None:
+        super().__init__(uri, wrap_exceptions, **options)
+        self.path = uri[len("sqlite://"):].removeprefix("/") or ":memory:"
+        self.timeout = float(timeout)
+        self._local = local()
+        self._next_sweep = 0.0
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limit_window ("
+                         "key TEXT PRIMARY KEY, window_id INTEGER NOT NULL, current INTEGER NOT NULL, "
+                         "previous INTEGER NOT NULL, expires_at REAL NOT NULL)")
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _add_to_window(self, key: str, expiry: int, window: int, amount: int) -> Tuple[int, int]:
+        now = time()
+        with self._connection() as conn:
+            if now >= self._next_sweep:
+                self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+                conn.execute("DELETE FROM rate_limit_window WHERE expires_at <= ?", (now,))
+            # One statement rolls the window and adds, so it is atomic across processes
+            return conn.execute(
+                "INSERT INTO rate_limit_window (key, window_id, current, previous, expires_at) VALUES (?, ?, ?, 0, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "previous = CASE WHEN window_id = excluded.window_id THEN previous "
+                "WHEN window_id = excluded.window_id - 1 THEN current ELSE 0 END, "
+                "current = CASE WHEN window_id = excluded.window_id THEN current + excluded.current ELSE excluded.current END, "
+                "window_id = excluded.window_id, expires_at = excluded.expires_at "
+                "RETURNING previous, current",
+                (key, window, amount, (window + 2) * expiry),
+            ).fetchone()
+
+    def _remove_from_window(self, key: str, expiry: int, window: int, amount: int) -> None:
+        with self._connection() as conn:
+            conn.execute("UPDATE rate_limit_window SET current = current - ? WHERE key = ? AND window_id = ?", (amount, key, window))
+
+    def _read_window(self, key: str, expiry: int, window: int) -> Tuple[int, int]:
+        row = self._connection().execute("SELECT window_id, current, previous FROM rate_limit_window WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] < window - 1:
+            return 0, 0
+        if row[0] == window - 1:
+            return row[1], 0
+        return row[2], row[1]
+
+    def _latest_window(self, key: str) -> Optional[Tuple[int, int, int]]:
+        row = self._connection().execute("SELECT window_id, expires_at, current FROM rate_limit_window WHERE key = ?", (key,)).fetchone()
+        # expires_at is (window + 2) * expiry, so the window length comes back out of it
+        return None if row is None else (row[0], int(row[1]) // (row[0] + 2), row[2])
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM rate_limit_window").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM rate_limit_window WHERE key = ?", (key,))
+
+
+class RespWindowStorage(SlidingWindowCounterSupport, Storage):
+    """Counters on Redis or anything speaking RESP: resp://host:6379/0"""
+    STORAGE_SCHEME = ["resp"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, timeout: float = 1.0, key_prefix: str = "bang:rl", **options) -> None:
+        super().__init__(uri, wrap_exceptions, **options)
+        self.uri = uri
+        self.timeout = float(timeout)
+        self.key_prefix = key_prefix
+        self._local = local()
+
+    @property
+    def base_exceptions(self):
+        return (OSError, RespError)
+
+    def _client(self) -> RespClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = RespClient.from_url(self.uri, self.timeout)
+        return client
+
+    def _key(self, key: str, window: int | str) -> str:
+        return f"{self.key_prefix}:{key}:{window}"
+
+    def _add_to_window(self, key: str, expiry: int, window: int, amount: int) -> Tuple[int, int]:
+        current_key = self._key(key, window)
+        # Window keys outlive their window by one so the next one can still weigh them. The window length is kept
+        # next to them, window keys cannot be found again from `key` alone
+        current, _, previous, _ = self._client().pipeline(
+            ("INCRBY", current_key, amount),
+            ("PEXPIRE", current_key, 2 * expiry * 1000),
+            ("GET", self._key(key, window - 1)),
+            ("SET", self._key(key, "expiry"), expiry, "PX", 2 * expiry * 1000),
+        )
+        return int(previous or 0), current
+
+    def _remove_from_window(self, key: str, expiry: int, window: int, amount: int) -> None:
+        self._client().execute("DECRBY", self._key(key, window), amount)
+
+    def _read_window(self, key: str, expiry: int, window: int) -> Tuple[int, int]:
+        previous, current = self._client().execute("MGET", self._key(key, window - 1), self._key(key, window))
+        return int(previous or 0), int(current or 0)
+
+    def _latest_window(self, key: str) -> Optional[Tuple[int, int, int]]:
+        expiry = self._client().execute("GET", self._key(key, "expiry"))
+        if expiry is None:
+            return None
+        expiry = int(expiry)
+        window = int(time() // expiry)
+        return window, expiry, int(self._client().execute("GET", self._key(key, window)) or 0)
+
+    def check(self) -> bool:
+        try:
+            return self._client().execute("PING") == "PONG"
+        except (OSError, RespError):
+            return False
+
+    def reset(self) -> int:
+        """Delete every key under the prefix, SCAN walks the keyspace in batches so the server never blocks on it"""
+        client, cursor, count = self._client(), "0", 0
+        while True:
+            cursor, keys = client.execute("SCAN", cursor, "MATCH", f"{self.key_prefix}:*", "COUNT", 1000)
+            if keys:
+                count += client.execute("DEL", *keys)
+            if cursor in (b"0", "0"):
+                return count
+
+    def clear(self, key: str) -> None:
+        latest = self._latest_window(key)
+        if latest is not None:
+            window = latest[0]
+            self._client().execute("DEL", self._key(key, "expiry"), self._key(key, window), self._key(key, window - 1))
@@ -0,0 +1,158 @@
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+from infrastructure.env_variable import SEARCH_INDEX_PATH
+from infrastructure.log.logger import logger
+import heapq
+import math
+import orjson
+import os
+import re
+import unicodedata
+
+NGRAM_SIZE = 2
+# Title and summary matches count as several content matches, a cheap stand-in for BM25F field weights
+FIELD_WEIGHTS = (("title", 3), ("summary", 2), ("content", 1))
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Documents must contain at least this share of the query n-grams, which drops one-gram noise on longer queries
+MIN_SHOULD_MATCH = 0.5
+INDEX_FORMAT = 2
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str, unigrams: bool = False) -> List[str]:
+    """Overlapping character n-grams per word, so Korean compounds and partial words match without a morphological analyzer.
+
+    Documents are indexed with `unigrams` too, so a one-character query word still finds the longer words holding it.
+    """
+    grams = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if len(word) <= NGRAM_SIZE:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+        if unigrams and len(word) > 1:
+            grams.extend(word)
+    return grams
+
+class PostSearchIndex:
+    """In-memory inverted index over post title, summary and content, ranked with BM25.
+
+    Each document keeps its weighted term counts and post version, so postings can be removed on update and a
+    persisted index is reconciled against the table on restart by re-reading only posts whose version moved.
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = Lock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._documents: Dict[str, Tuple[int, int, Dict[str, int]]] = {}
+        self._total_length = 0
+        # BM25 length normalisation per document, recomputed lazily because every write moves the average length
+        self._norms: Optional[Dict[str, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _remove(self, post_id: str) -> None:
+        document = self._documents.pop(post_id, None)
+        if document is None:
+            return
+        _, length, terms = document
+        self._total_length -= length
+        self._norms = None
+        for term in terms:
+            postings = self._postings[term]
+            del postings[post_id]
+            if not postings:
+                del self._postings[term]
+
+    def _add(self, post_id: str, version: int, terms: Dict[str, int]) -> None:
+        length = sum(terms.values())
+        self._documents[post_id] = (version, length, terms)
+        self._total_length += length
+        self._norms = None
+        for term, frequency in terms.items():
+            self._postings[term][post_id] = frequency
+
+    def add(self, post) -> None:
+        """Index or re-index a row carrying id, version, title, summary and content"""
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            # Counting in C first, then weighting each distinct gram once, keeps long contents cheap to index
+            for gram, frequency in Counter(tokenize(getattr(post, field), unigrams=True)).items():
+                terms[gram] += frequency * weight
+        with self._lock:
+            self._remove(post.id)
+            self._add(post.id, post.version, dict(terms))
+
+    def remove(self, post_id: str) -> None:
+        with self._lock:
+            self._remove(post_id)
+
+    def stale_ids(self, versions: Iterable[Tuple[str, int]]) -> List[str]:
+        """Drop documents missing from `versions` and return the ids that must be (re)indexed"""
+        versions = dict(versions)
+        with self._lock:
+            for post_id in [post_id for post_id in self._documents if post_id not in versions]:
+                self._remove(post_id)
+            return [post_id for post_id, version in versions.items()
+                    if post_id not in self._documents or self._documents[post_id][0] != version]
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+        with self._lock:
+            count = len(self._documents)
+            if count == 0:
+                return []
+            norms = self._norms if self._norms is not None else self._compute_norms()
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                weight = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)) * (BM25_K1 + 1)
+                for post_id, frequency in postings.items():
+                    scores[post_id] = scores.get(post_id, 0.0) + weight * frequency / (frequency + norms[post_id])
+                    matched[post_id] = matched.get(post_id, 0) + 1
+        required = math.ceil(len(query_terms) * MIN_SHOULD_MATCH)
+        return heapq.nlargest(limit, ((post_id, score) for post_id, score in scores.items() if matched[post_id] >= required),
+                              key=lambda hit: hit[1])
+
+    def _compute_norms(self) -> Dict[str, float]:
+        average_length = self._total_length / len(self._documents)
+        self._norms = {post_id: BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                       for post_id, (_, length, _) in self._documents.items()}
+        return self._norms
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            payload = orjson.dumps({"format": INDEX_FORMAT, "ngram": NGRAM_SIZE, "documents": self._documents})
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(payload)
+        os.replace(temporary_path, self.path)
+
+    def load(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as file:
+                payload = orjson.loads(file.read())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.error(f"❌ Search index load failed, rebuilding from the post table: {e}")
+            return False
+        if payload.get("format") != INDEX_FORMAT or payload.get("ngram") != NGRAM_SIZE:
+            return False
+        with self._lock:
+            for post_id, (version, _, terms) in payload["documents"].items():
+                self._remove(post_id)
+                self._add(post_id, version, terms)
+        return True
+
+post_search_index = PostSearchIndex(path=SEARCH_INDEX_PATH)
@@ -0,0 +1,61 @@
+from threading import Lock, Timer
+from typing import Optional
+from infrastructure.env_variable import SENTRY_PROFILING
+from infrastructure.log.logger import logger
+
+PROFILING_OFF = "off"
+PROFILING_ON_DEMAND = "on-demand"
+PROFILING_ALWAYS = "always"
+MAX_PROFILE_SECONDS = 600
+
+def profiling_options(mode: str) -> dict:
+    """`sentry_sdk.init` options for SENTRY_PROFILING"""
+    if mode == PROFILING_ALWAYS:
+        # Profiles whenever a sampled transaction is open, the old auto start experiment needs a session rate now too
+        return {"profile_session_sample_rate": 1.0, "profile_lifecycle": "trace"}
+    if mode == PROFILING_ON_DEMAND:
+        # The profiler is set up but samples nothing until `start_profiler()`
+        return {"profile_session_sample_rate": 1.0, "profile_lifecycle": "manual"}
+    if mode != PROFILING_OFF:
+        raise ValueError(f"Unsupported SENTRY_PROFILING mode: {mode}")
+    return {}
+
+class OnDemandProfiler:
+    """Runs the continuous profiler for a bounded time in this worker, then stops it on a timer"""
+    def __init__(self, mode: str) -> None:
+        self.enabled = mode == PROFILING_ON_DEMAND
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    def start(self, seconds: int) -> int:
+        if not self.enabled:
+            raise ValueError("On-demand profiling is disabled, set SENTRY_PROFILING=on-demand")
+        seconds = min(seconds, MAX_PROFILE_SECONDS)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            else:
+                # Imported here, the SDK is only loaded when SENTRY_DSN is set
+                from sentry_sdk.profiler import start_profiler
+                start_profiler()
+            self._timer = Timer(seconds, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+        logger.info("Profiler started for %ss", seconds)
+        return seconds
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            self._timer = None
+            from sentry_sdk.profiler import stop_profiler
+            stop_profiler()
+        logger.info("Profiler stopped")
+
+on_demand_profiler = OnDemandProfiler(SENTRY_PROFILING)
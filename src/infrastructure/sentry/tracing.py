@@ -0,0 +1,89 @@
+from random import random
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional
+from starlette.routing import BaseRoute, Match
+from infrastructure.env_variable import (TRACES_SAMPLE_RATES, TRACES_GET_SAMPLE_RATE, TRACES_MAX_PER_SECOND,
+                                         TRACES_SLOW_REQUEST_MS, TRACES_BOOST_STATUS, TRACES_BOOST_SECONDS)
+from infrastructure.log.access_log import parse_sample_rates
+
+# Preflights and HEADs answer from the middleware stack alone, a trace of them never shows anything
+UNTRACED_METHODS = frozenset({"OPTIONS", "HEAD"})
+
+class AdaptiveTracesSampler:
+    """Sentry `traces_sampler`: low rates for healthy GETs, full tracing for routes that recently failed or ran slow.
+
+    Sentry decides when the request starts, before its status or latency exist, so errors and slow requests are kept
+    by reacting to them: `observe()` gets every finished request and traces its route in full for `boost_seconds`
+    after an error status or a slow response. Error events are sent regardless of this decision. Every decision,
+    boosted or not, goes through one token bucket so a traffic spike cannot turn into a tracing spike.
+    """
+    def __init__(self, rates: Dict[str, float], get_rate: float, max_per_second: float,
+                 slow_ms: float, boost_status: int, boost_seconds: float) -> None:
+        # Writes are rare and worth tracing in full unless a rule says otherwise
+        self.default_rate = rates.pop("*", 1.0)
+        self.rates = rates
+        self.get_rate = get_rate
+        self.max_per_second = max_per_second
+        self.slow_ms = slow_ms
+        self.boost_status = boost_status
+        self.boost_seconds = boost_seconds
+        self._routes: List[BaseRoute] = []
+        self._boosted_until: Dict[str, float] = {}
+        self._lock = Lock()
+        self._tokens = max_per_second
+        self._refilled_at = monotonic()
+        self.sampled = 0
+        self.capped = 0
+
+    def bind(self, routes: List[BaseRoute]) -> None:
+        self._routes = list(routes)
+
+    def route_template(self, scope: dict) -> Optional[str]:
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", None)
+        return None
+
+    def rate_for(self, method: str, route: Optional[str]) -> float:
+        if method in UNTRACED_METHODS:
+            return 0.0
+        if route is not None and self._boosted_until.get(route, 0.0) > monotonic():
+            return 1.0
+        rate = self.rates.get(f"{method} {route}", self.rates.get(route))
+        if rate is not None:
+            return rate
+        return self.get_rate if method == "GET" else self.default_rate
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.max_per_second, self._tokens + (now - self._refilled_at) * self.max_per_second)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def __call__(self, sampling_context: dict) -> float:
+        scope = sampling_context.get("asgi_scope")
+        if scope is None or scope.get("type") != "http":
+            return 0.0
+        parent_sampled = sampling_context.get("parent_sampled")
+        rate = float(parent_sampled) if parent_sampled is not None else self.rate_for(scope["method"], self.route_template(scope))
+        # The draw is made here rather than by Sentry, so only requests that will really be traced spend a token
+        if rate <= 0 or (rate < 1 and random() >= rate):
+            return 0.0
+        if not self._take_token():
+            self.capped += 1
+            return 0.0
+        self.sampled += 1
+        return 1.0
+
+    def observe(self, route: Optional[str], status_code: int, duration_ms: float) -> None:
+        if route is not None and (status_code >= self.boost_status or duration_ms >= self.slow_ms):
+            self._boosted_until[route] = monotonic() + self.boost_seconds
+
+traces_sampler = AdaptiveTracesSampler(parse_sample_rates(TRACES_SAMPLE_RATES), TRACES_GET_SAMPLE_RATE, TRACES_MAX_PER_SECOND,
+                                       TRACES_SLOW_REQUEST_MS, TRACES_BOOST_STATUS, TRACES_BOOST_SECONDS)
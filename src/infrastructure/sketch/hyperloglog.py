@@ -0,0 +1,63 @@
+import math
+import struct
+import zlib
+from hashlib import blake2b
+from typing import Iterable
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct("!BB")
+HASH_BITS = 64
+INVERSE_POWERS = [2.0 ** -rank for rank in range(HASH_BITS + 1)]
+
+class HyperLogLog:
+    """Fixed-size cardinality sketch with 2**precision one-byte registers.
+
+    The standard error is about 1.04 / sqrt(2**precision), 0.81% for the default precision of 14.
+    Two sketches with the same precision merge by taking the register-wise maximum,
+    so sketches built by different workers can be combined without double counting.
+    """
+    def __init__(self, precision: int = 14, registers: bytearray | None = None) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError("register count does not match precision")
+
+    def add(self, value: str) -> None:
+        hashed = int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = hashed >> (HASH_BITS - self.precision)
+        remaining_bits = HASH_BITS - self.precision
+        remaining = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(INVERSE_POWERS[rank] for rank in self.registers)
+        empty = self.registers.count(0)
+        if estimate <= 2.5 * self.size and empty:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = self.size * math.log(self.size / empty)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(FORMAT_VERSION, self.precision) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        version, precision = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported sketch format version {version}")
+        return cls(precision, bytearray(zlib.decompress(data[HEADER.size:])))
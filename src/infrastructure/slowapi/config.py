@@ -1,4 +1,8 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from infrastructure.env_variable import RATE_LIMIT_STORAGE_URI
+import infrastructure.ratelimit.sliding_window
+import infrastructure.ratelimit.storage
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+# local:// counts per process, sqlite:////path shares one host's workers, resp://host:port/db shares a fleet
+limiter = Limiter(key_func=get_remote_address, strategy="sliding-window-counter", storage_uri=RATE_LIMIT_STORAGE_URI)
@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from infrastructure.env_variable import DATABASE_URL, ASYNC_DATABASE_URL, DATABASE_READ_URL, ASYNC_DATABASE_READ_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_REPLICA_RETRY_SECONDS, DB_POOL_PRE_PING
+from infrastructure.sqlalchemy.pool import TimedAsyncQueuePool
+from infrastructure.sqlalchemy.unit_of_work import UnitOfWorkSession, REPLICA_ROUTER_KEY
+from infrastructure.sqlalchemy.replica import ReplicaRouter
+
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    scheme, separator, rest = url.partition("://")
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{scheme}', set ASYNC_DATABASE_URL")
+    return ASYNC_DRIVERS[scheme] + separator + rest
+
+if not (ASYNC_DATABASE_URL or DATABASE_URL):
+    raise ValueError("DATABASE_URL environment variable is not set")
+
+def pool_options(url: str) -> dict:
+    # aiosqlite does not use a sized pool, it is only meant for local runs
+    return {} if url.startswith("sqlite") else {"poolclass": TimedAsyncQueuePool, "pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+
+async_database_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(async_database_url, pool_pre_ping=DB_POOL_PRE_PING, **pool_options(async_database_url))
+AsyncSessionLocal = async_sessionmaker(sync_session_class=UnitOfWorkSession, autoflush=False, expire_on_commit=False, bind=async_engine)
+
+async_database_read_url = ASYNC_DATABASE_READ_URL or (to_async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None)
+async_read_engine = create_async_engine(async_database_read_url, pool_pre_ping=True,
+                                        **pool_options(async_database_read_url)) if async_database_read_url else None
+# Routes the sync engines underneath, read sessions connect from inside the async session's greenlet
+async_replica_router = ReplicaRouter(async_engine.sync_engine, async_read_engine.sync_engine if async_read_engine else None, DB_REPLICA_RETRY_SECONDS)
+AsyncReadSessionLocal = async_sessionmaker(sync_session_class=UnitOfWorkSession, autoflush=False, expire_on_commit=False, bind=async_engine,
+                                           info={REPLICA_ROUTER_KEY: async_replica_router}) if async_read_engine else None
@@ -1,10 +1,22 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from infrastructure.env_variable import DATABASE_URL
+from infrastructure.env_variable import DATABASE_URL, DATABASE_READ_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_REPLICA_RETRY_SECONDS, DB_POOL_PRE_PING
+from infrastructure.sqlalchemy.pool import TimedQueuePool
+from infrastructure.sqlalchemy.unit_of_work import UnitOfWorkSession, REPLICA_ROUTER_KEY
+from infrastructure.sqlalchemy.replica import ReplicaRouter
 
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-engine = create_engine(DATABASE_URL, pool_size=10, max_overflow=20)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pre-ping replaces connections the server closed while idle, such as the ones opened during warmup
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                       pool_pre_ping=DB_POOL_PRE_PING)
+SessionLocal = sessionmaker(class_=UnitOfWorkSession, autocommit=False, autoflush=False, bind=engine)
+
+# Optional read replica, e.g. a second SQLite file or a MySQL replica. Without it ReadSessionLocal is None
+read_engine = create_engine(DATABASE_READ_URL, poolclass=TimedQueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                            pool_pre_ping=True) if DATABASE_READ_URL else None
+replica_router = ReplicaRouter(engine, read_engine, DB_REPLICA_RETRY_SECONDS)
+ReadSessionLocal = sessionmaker(class_=UnitOfWorkSession, autoflush=False, bind=engine,
+                                info={REPLICA_ROUTER_KEY: replica_router}) if read_engine else None
 Base = declarative_base()
\ No newline at end of file
@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from typing import Collection, Iterator, List, NamedTuple
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+class QueryPlan(NamedTuple):
+    statement: str
+    plan: List[str]
+    uses_index: bool
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[list]:
+    """Collect (statement, parameters) for every SELECT sent to `engine` inside the block"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def explain(conn: Connection, statement: str, parameters, tables: Collection[str]) -> QueryPlan:
+    """EXPLAIN `statement`, `uses_index` is False when any of `tables` is read with a full scan"""
+    if conn.dialect.name == "sqlite":
+        details = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        # Scans of CTEs and subqueries (anon_1, CONSTANT ROW, ...) read materialized rows, not a table
+        full_scans = [detail for detail in details
+                      if detail.startswith("SCAN ") and "USING" not in detail and detail.split()[1] in tables]
+        return QueryPlan(statement, details, not full_scans)
+
+    rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().all()
+    details = [f"{row['table']} type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}" for row in rows]
+    # Derived tables and union results show up as <derived2>, <union1,2>
+    full_scans = [row for row in rows if row["table"] in tables and row["type"] == "ALL"]
+    return QueryPlan(statement, details, not full_scans)
@@ -0,0 +1,90 @@
+from typing import Callable, List, NamedTuple
+from sqlalchemy import Column, Integer, MetaData, String, Table, DateTime, func, select, insert, update, delete, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+from infrastructure.sqlalchemy.config import Base
+from infrastructure.sqlalchemy.model import Post, VisitLog, Visitor, DailyVisitor, VisitDailyStat, VisitTotalStat, VisitorSketch, CacheChange
+from infrastructure.log.logger import logger
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+)
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+def create_tables(*models) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection) -> None:
+        Base.metadata.create_all(bind=conn, tables=[model.__table__ for model in models], checkfirst=True)
+    return upgrade
+
+def create_indexes(*models) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection) -> None:
+        for model in models:
+            for index in model.__table__.indexes:
+                index.create(bind=conn, checkfirst=True)
+    return upgrade
+
+def add_columns(model, *names) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection) -> None:
+        existing = {column["name"] for column in inspect(conn).get_columns(model.__tablename__)}
+        for name in names:
+            if name not in existing:
+                column_spec = CreateColumn(model.__table__.c[name]).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {model.__tablename__} ADD COLUMN {column_spec}"))
+    return upgrade
+
+def add_post_validators(conn: Connection) -> None:
+    add_columns(Post, "version", "updated_at")(conn)
+    conn.execute(update(Post).where(Post.updated_at.is_(None)).values(updated_at=Post.created_at))
+
+def add_daily_visitors(conn: Connection) -> None:
+    create_tables(DailyVisitor)(conn)
+    conn.execute(insert(DailyVisitor).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite").from_select(
+        ["visit_date", "visitor_ip"], select(VisitLog.visit_date, VisitLog.visitor_ip).distinct()
+    ))
+    # Daily counts written before this table existed could count one IP once per worker
+    conn.execute(delete(VisitDailyStat))
+    conn.execute(insert(VisitDailyStat).from_select(
+        ["visit_date", "visitor_count"],
+        select(DailyVisitor.visit_date, func.count()).group_by(DailyVisitor.visit_date)
+    ))
+
+# Append only, every step must be idempotent because MySQL commits DDL implicitly
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create post and visit_log tables", create_tables(Post, VisitLog)),
+    Migration(2, "Create visitor rollup and sketch tables", create_tables(Visitor, VisitDailyStat, VisitTotalStat, VisitorSketch)),
+    Migration(3, "Index post.created_at, post.likes_count and visit_log(visit_date, visitor_ip)", create_indexes(Post, VisitLog)),
+    Migration(4, "Add post.version and post.updated_at", add_post_validators),
+    Migration(5, "Create cache_change table", create_tables(CacheChange)),
+    Migration(6, "Index post(category, created_at)", create_indexes(Post)),
+    Migration(7, "Create daily_visitor and recount visit_daily_stat from it", add_daily_visitors),
+]
+
+def current_version(conn: Connection) -> int:
+    return conn.execute(select(func.coalesce(func.max(schema_version.c.version), 0))).scalar()
+
+def migrate(engine: Engine, target: int | None = None) -> List[Migration]:
+    """Apply pending migrations up to `target` (latest by default) and return the ones applied"""
+    schema_metadata.create_all(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        version = current_version(conn)
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version or (target is not None and migration.version > target):
+            continue
+        with engine.begin() as conn:
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            migration.upgrade(conn)
+            conn.execute(insert(schema_version).values(version=migration.version, description=migration.description))
+        applied.append(migration)
+    return applied
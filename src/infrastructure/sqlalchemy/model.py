@@ -1,24 +1,91 @@
-from sqlalchemy import Column, String, Integer, DateTime, CHAR, Text, Date, func, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DateTime, CHAR, Text, Date, LargeBinary, Index, func, text, UniqueConstraint
+from sqlalchemy.dialects import sqlite
 from infrastructure.sqlalchemy.config import Base
 from datetime import datetime
 import uuid
 
+# Match the text CURRENT_TIMESTAMP writes on SQLite so bound datetimes compare correctly in local runs
+SECOND_PRECISION_DATETIME = DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"), "sqlite"
+)
+
 class Post(Base):
     __tablename__ = "post"
+    __table_args__ = (
+        Index("ix_post_created_at", "created_at"),
+        Index("ix_post_likes_count", "likes_count"),
+        # Category listings filter and sort on this alone, InnoDB appends the id tie-breaker from the primary key
+        Index("ix_post_category_created_at", "category", "created_at"),
+    )
 
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     summary = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)  
-    created_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+    created_at = Column(SECOND_PRECISION_DATETIME, nullable=False, server_default=func.current_timestamp())
     likes_count = Column(Integer, default=0)
     category = Column(String(50), nullable=False)  
     thumbnail_url = Column(String(2083), nullable=False)  
+    # Validators for conditional GETs, bumped by every write that changes what the post renders as
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    updated_at = Column(SECOND_PRECISION_DATETIME, default=func.current_timestamp(), onupdate=func.current_timestamp())
 
 
 class VisitLog(Base):
     __tablename__ = "visit_log"
-    
+    __table_args__ = (
+        Index("ix_visit_log_visit_date_visitor_ip", "visit_date", "visitor_ip"),
+    )
+
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     visitor_ip = Column(String(45), nullable=False)  
-    visit_date = Column(Date, nullable=False, server_default=func.current_date())
\ No newline at end of file
+    visit_date = Column(Date, nullable=False, server_default=func.current_date())
+
+
+class Visitor(Base):
+    __tablename__ = "visitor"
+
+    visitor_ip = Column(String(45), primary_key=True)
+    first_visit_date = Column(Date, nullable=False)
+
+
+class DailyVisitor(Base):
+    __tablename__ = "daily_visitor"
+
+    # One row per visitor per day, so workers flushing the same IP count it once
+    visit_date = Column(Date, primary_key=True)
+    visitor_ip = Column(String(45), primary_key=True)
+
+
+class VisitDailyStat(Base):
+    __tablename__ = "visit_daily_stat"
+
+    visit_date = Column(Date, primary_key=True)
+    visitor_count = Column(Integer, nullable=False, default=0)
+
+
+class VisitTotalStat(Base):
+    __tablename__ = "visit_total_stat"
+
+    id = Column(Integer, primary_key=True)
+    visitor_count = Column(Integer, nullable=False, default=0)
+
+
+
+class VisitorSketch(Base):
+    __tablename__ = "visitor_sketch"
+
+    sketch_key = Column(String(10), primary_key=True)
+    registers = Column(LargeBinary, nullable=False)
+    estimate = Column(Integer, nullable=False, default=0)
+
+
+class CacheChange(Base):
+    """Change log read by the database transport of the cache invalidation bus"""
+    __tablename__ = "cache_change"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    origin = Column(String(32), nullable=False)
+    kind = Column(String(16), nullable=False)
+    post_id = Column(CHAR(36))
+    created_at = Column(SECOND_PRECISION_DATETIME, nullable=False, server_default=func.current_timestamp())
@@ -0,0 +1,47 @@
+from threading import Lock
+from time import perf_counter
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Handed from the pool to the session that checked the connection out, see unit_of_work.py
+CHECKOUT_WAIT_KEY = "checkout_wait"
+
+class CheckoutWaitStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+class TimedCheckoutMixin:
+    """Times every checkout, queueing for a free slot and opening new connections included"""
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = CheckoutWaitStats()
+
+    def connect(self):
+        start = perf_counter()
+        connection = super().connect()
+        wait = perf_counter() - start
+        self.wait_stats.record(wait)
+        connection.info[CHECKOUT_WAIT_KEY] = wait
+        return connection
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
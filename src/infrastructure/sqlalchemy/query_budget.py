@@ -0,0 +1,18 @@
+from typing import Callable, Optional
+from starlette.routing import BaseRoute
+
+QUERY_COUNT_HEADER_NAME = "X-DB-Query-Count"
+
+def query_budget(max_statements: int) -> Callable:
+    """Declare the most SQL statements one request to the decorated route may issue, on a cold cache.
+
+    Place it directly under the router decorator so it marks the endpoint FastAPI registers.
+    `cli.py check-query-budgets` enforces it, development servers warn when a request goes over.
+    """
+    def declare(endpoint: Callable) -> Callable:
+        endpoint.query_budget = max_statements
+        return endpoint
+    return declare
+
+def budget_for(route: Optional[BaseRoute]) -> Optional[int]:
+    return getattr(getattr(route, "endpoint", None), "query_budget", None)
@@ -0,0 +1,78 @@
+from contextvars import ContextVar
+from time import perf_counter
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from infrastructure.metrics.instruments import db_statement_duration
+import functools
+import inspect
+
+# Statements issued outside a repository method, such as migrations or the cache bus transport
+UNLABELED_SOURCE = "other"
+
+class QueryStats:
+    """Statements executed and seconds spent in the driver, accumulated for one unit of work such as a request.
+
+    Stats nest: a statement counts towards `parent` too, so a harness wrapping a request sees what the middleware saw.
+    """
+    __slots__ = ("count", "seconds", "statements", "parent")
+
+    def __init__(self, record_statements: bool = False, parent: Optional["QueryStats"] = None) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+        self.parent = parent
+
+    def add(self, statement: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            if stats.statements is not None:
+                stats.statements.append(statement)
+            stats = stats.parent
+
+# Set by the request middleware, copied into threadpool workers and async engine greenlets with the rest of the context
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+current_statement_source: ContextVar[str] = ContextVar("current_statement_source", default=UNLABELED_SOURCE)
+
+def label_statements(cls):
+    """Class decorator: time the SQL of every public method under `ClassName.method`"""
+    for name, method in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(method):
+            setattr(cls, name, _labeled(f"{cls.__name__}.{name}", method))
+    return cls
+
+def _labeled(source: str, method):
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def labeled_coroutine(*args, **kwargs):
+            token = current_statement_source.set(source)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                current_statement_source.reset(token)
+        return labeled_coroutine
+
+    @functools.wraps(method)
+    def labeled(*args, **kwargs):
+        token = current_statement_source.set(source)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            current_statement_source.reset(token)
+    return labeled
+
+# Listening on the Engine class covers the primary, the replica and the engines behind the async ones
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the execution context, so a statement that raises leaves nothing behind
+    context._query_started = perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = perf_counter() - context._query_started
+    db_statement_duration.observe(elapsed, (current_statement_source.get(),))
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
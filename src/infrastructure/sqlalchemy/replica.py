@@ -0,0 +1,32 @@
+from time import monotonic
+from typing import Optional
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from infrastructure.log.logger import logger
+
+class ReplicaRouter:
+    """Connects read sessions to the replica, or to the primary while the replica is failing.
+
+    The replica engine pings every connection it hands out, so a failed checkout is the health check.
+    After one the replica is skipped for `retry_seconds`, then tried again by the next read.
+    """
+    def __init__(self, primary: Engine, replica: Optional[Engine], retry_seconds: float) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.retry_seconds = retry_seconds
+        self._down_until = 0.0
+        self.fallbacks = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.replica is not None and monotonic() >= self._down_until
+
+    def connect_for_read(self) -> Connection:
+        if self.healthy:
+            try:
+                return self.replica.connect()
+            except DBAPIError as e:
+                self._down_until = monotonic() + self.retry_seconds
+                logger.error(f"❌ Read replica unavailable, reading from the primary for {self.retry_seconds}s: {e}")
+        self.fallbacks += 1
+        return self.primary.connect()
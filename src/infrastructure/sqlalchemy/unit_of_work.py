@@ -0,0 +1,87 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from infrastructure.sqlalchemy.pool import CHECKOUT_WAIT_KEY
+
+POOL_WAIT_KEY = "pool_wait"
+READ_ONLY_KEY = "read_only"
+CONNECTION_KEY = "connection"
+REPLICA_ROUTER_KEY = "replica_router"
+
+class UnitOfWorkSession(Session):
+    """Checks one connection out on first use and keeps it across commits until `close()`.
+
+    Sessions made with a replica router in `info` take that connection from the router instead.
+    """
+    def get_bind(self, mapper=None, **kwargs):
+        connection = self.info.get(CONNECTION_KEY)
+        if connection is None:
+            router = self.info.get(REPLICA_ROUTER_KEY)
+            engine = super().get_bind(mapper, **kwargs)
+            connection = self.info[CONNECTION_KEY] = router.connect_for_read() if router else engine.connect()
+        return connection
+
+    def close(self) -> None:
+        super().close()
+        connection = self.info.pop(CONNECTION_KEY, None)
+        if connection is not None:
+            connection.close()
+
+@event.listens_for(Session, "after_begin")
+def _collect_checkout_wait(session, transaction, connection) -> None:
+    session.info[POOL_WAIT_KEY] = session.info.get(POOL_WAIT_KEY, 0.0) + connection.info.pop(CHECKOUT_WAIT_KEY, 0.0)
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances) -> None:
+    if session.info.get(READ_ONLY_KEY):
+        raise RuntimeError("Read-only unit of work cannot write")
+
+class UnitOfWork:
+    """One session per request, shared by every repository the request builds.
+
+    The session checks a connection out on its first statement and holds it until the request ends, so a request
+    answered from caches never touches the pool and no request holds two connections. Repositories still commit
+    their own writes; anything left pending is committed on exit, while a read-only unit of work rejects flushes
+    and never commits.
+    """
+    def __init__(self, session_factory, read_only: bool = False, read_session_factory=None) -> None:
+        self.read_only = read_only
+        self.session = session_factory(info={READ_ONLY_KEY: read_only})
+        # Without a replica, reads share the primary session and its single connection
+        self.read_session = read_session_factory(info={READ_ONLY_KEY: True}) if read_session_factory else self.session
+
+    @property
+    def pool_wait(self) -> float:
+        """Seconds spent waiting for pooled connections, summed over every checkout of this unit of work"""
+        wait = self.session.info.get(POOL_WAIT_KEY, 0.0)
+        if self.read_session is not self.session:
+            wait += self.read_session.info.get(POOL_WAIT_KEY, 0.0)
+        return wait
+
+    def _has_changes(self) -> bool:
+        # A transaction that only read is released on close, a COMMIT for it would be a wasted round trip
+        return bool(self.session.new or self.session.dirty or self.session.deleted)
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None and not self.read_only and self._has_changes():
+                self.session.commit()
+        finally:
+            self.session.close()
+            if self.read_session is not self.session:
+                self.read_session.close()
+
+class AsyncUnitOfWork(UnitOfWork):
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None and not self.read_only and self._has_changes():
+                await self.session.commit()
+        finally:
+            await self.session.close()
+            if self.read_session is not self.session:
+                await self.read_session.close()
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from infrastructure.log.logger import logger
+
+class Readiness:
+    """Warmup progress of this worker. /healthz answers as soon as it serves, /readyz only once every step finished"""
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.ready = False
+        self.error: Optional[str] = None
+        self.steps: Dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        yield
+        elapsed_ms = round((perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self.steps[name] = elapsed_ms
+        logger.info(f"Warmup step {name} finished in {elapsed_ms}ms")
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self.ready = True
+            self.error = None
+
+    def mark_failed(self, error: Exception) -> None:
+        with self._lock:
+            self.error = str(error)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"ready": self.ready, "error": self.error, "steps_ms": dict(self.steps)}
+
+def prewarm_pool(engine: Engine, connections: int) -> int:
+    """Open up to `connections` pool connections side by side and make one round trip on each, returns how many"""
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    opened = []
+    try:
+        # Held open together, otherwise the pool hands the same connection back every time
+        for _ in range(min(connections, engine.pool.size())):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+async def prewarm_async_pool(engine: AsyncEngine, connections: int) -> int:
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    opened = []
+    try:
+        for _ in range(min(connections, engine.pool.size())):
+            connection = await engine.connect()
+            opened.append(connection)
+            await connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+readiness = Readiness()
@@ -0,0 +1,124 @@
+from datetime import date
+from queue import Queue, Empty, Full
+from threading import Lock
+from typing import Callable, Iterable, List, Optional, Tuple
+from infrastructure.buffer.periodic_flusher import PeriodicFlusher
+from infrastructure.env_variable import VISIT_FLUSH_INTERVAL_MS, VISIT_FLUSH_ROWS, VISIT_QUEUE_SIZE
+from infrastructure.log.logger import logger
+
+VisitRow = Tuple[str, date]
+
+class VisitIngestBuffer(PeriodicFlusher):
+    """Write-behind buffer for visit logs.
+
+    IPs are deduplicated against an in-process set for the current day, queued, and written by the
+    flusher thread in one multi-row INSERT every `flush_interval_ms` or as soon as `flush_rows` are queued.
+    The request path never touches the database: the IPs already stored for a new day are loaded by the
+    flusher thread, and a visit that finds the queue full is dropped and counted.
+    """
+    def __init__(self, max_queue: int, flush_rows: int, flush_interval_ms: int) -> None:
+        super().__init__("visit-ingest", flush_interval_ms)
+        self.flush_rows = flush_rows
+        self.dropped = 0
+        self._queue: "Queue[VisitRow]" = Queue(maxsize=max_queue)
+        self._seen_lock = Lock()
+        self._seen_date: Optional[date] = None
+        self._seen: set = set()
+        # Day whose stored visitors still have to be loaded into `_seen`
+        self._seed_date: Optional[date] = None
+        self._flush_handler: Optional[Callable[[List[VisitRow]], None]] = None
+        self._seed_loader: Optional[Callable[[date], Iterable[str]]] = None
+
+    def configure(self, flush_handler: Callable[[List[VisitRow]], None], seed_loader: Callable[[date], Iterable[str]]) -> None:
+        self._flush_handler = flush_handler
+        self._seed_loader = seed_loader
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def add(self, visitor_ip: str) -> bool:
+        """Queue a visit, returns False when the IP was already recorded today or the queue is full"""
+        today = date.today()
+        with self._seen_lock:
+            self._roll_over(today)
+            if visitor_ip in self._seen:
+                return False
+            self._seen.add(visitor_ip)
+
+        try:
+            self._queue.put_nowait((visitor_ip, today))
+        except Full:
+            # Shed the visit instead of blocking the request, forgetting the IP lets its next request retry
+            self.dropped += 1
+            self._forget([(visitor_ip, today)])
+            self.wake()
+            return False
+
+        if self._queue.qsize() >= self.flush_rows:
+            self.wake()
+        return True
+
+    def flush(self) -> None:
+        seed_date, stored = self._load_seed()
+        while True:
+            rows: List[VisitRow] = []
+            try:
+                while len(rows) < self.flush_rows:
+                    rows.append(self._queue.get_nowait())
+            except Empty:
+                pass
+            if not rows:
+                return
+            if stored:
+                # Queued before the day's stored visitors were known
+                rows = [row for row in rows if row[1] != seed_date or row[0] not in stored]
+                if not rows:
+                    continue
+            try:
+                self._flush_handler(rows)
+            except Exception:
+                self._forget(rows)
+                raise
+
+    def prime(self) -> None:
+        """Load today's visitors now instead of after the first visit"""
+        with self._seen_lock:
+            self._roll_over(date.today())
+        self._safe_flush()
+
+    def _roll_over(self, today: date) -> None:
+        if self._seen_date != today:
+            self._seen = set()
+            self._seen_date = today
+            self._seed_date = today
+            self.wake()
+
+    def _load_seed(self) -> Tuple[Optional[date], set]:
+        """Merge the IPs already stored for the current day into `_seen`, on the flusher thread"""
+        with self._seen_lock:
+            seed_date = self._seed_date
+        if seed_date is None or self._seed_loader is None:
+            return None, set()
+        try:
+            stored = set(self._seed_loader(seed_date))
+        except Exception as e:
+            # Retried on the next flush, the visitor tables ignore the duplicates written meanwhile
+            logger.error(f"❌ Unable to load today's visitors: {e}")
+            return None, set()
+        with self._seen_lock:
+            if self._seen_date == seed_date:
+                self._seen |= stored
+                self._seed_date = None
+        return seed_date, stored
+
+    def _forget(self, rows: List[VisitRow]) -> None:
+        # Let the next request from these IPs retry the write
+        with self._seen_lock:
+            for visitor_ip, visit_date in rows:
+                if visit_date == self._seen_date:
+                    self._seen.discard(visitor_ip)
+
+visit_ingest_buffer = VisitIngestBuffer(max_queue=VISIT_QUEUE_SIZE,
+                                        flush_rows=VISIT_FLUSH_ROWS,
+                                        flush_interval_ms=VISIT_FLUSH_INTERVAL_MS)
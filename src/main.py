@@ -1,28 +1,121 @@
 from fastapi import FastAPI
-from adapter.input.post_router import router as post_router
-from adapter.input.blog_router import router as blog_router
+from adapter.input.post_router import router as sync_post_router
+from adapter.input.blog_router import router as sync_blog_router
+from adapter.input.dependency import flush_like_buffer, flush_visit_buffer, load_visitor_ips, sync_search_index, apply_remote_post_change, prime_hot_paths
+from infrastructure.search.post_search_index import post_search_index
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.env_variable import CLIENT_DOMAIN, SENTRY_DSN
 from fastapi import Request
 from slowapi.middleware import SlowAPIMiddleware
 from infrastructure.log.logger import logger
+from infrastructure.log.access_log import access_logger, access_log_sampler
+from infrastructure.sqlalchemy.query_timing import QueryStats, current_query_stats
+from infrastructure.sqlalchemy.query_budget import query_budget, budget_for, QUERY_COUNT_HEADER_NAME
+from infrastructure.sentry.tracing import traces_sampler
+from infrastructure.sentry.profiling import profiling_options, on_demand_profiler
+from adapter.input.ops_router import router as ops_router
+from adapter.input.metrics_router import router as metrics_router
+from adapter.input.health_router import router as health_router
+from infrastructure.startup.readiness import readiness, prewarm_pool, prewarm_async_pool
+from infrastructure.metrics.instruments import http_request_duration, http_requests, UNMATCHED_ROUTE
+from infrastructure.metrics.collectors import watch_pool
+from infrastructure.sqlalchemy.config import engine, read_engine
 from infrastructure.slowapi.config import limiter
-from infrastructure.env_variable import SERVER_ENV
-from fastapi.responses import Response
-import sentry_sdk
-
-sentry_sdk.init(
-    dsn=SENTRY_DSN,
-    traces_sample_rate=1.0,
-    _experiments={
-        "continuous_profiling_auto_start": True,
-    },
-)
+from infrastructure.env_variable import SERVER_ENV, DATABASE_MODE, CACHE_BUS_URL, SENTRY_PROFILING, METRICS_ENABLED, METRICS_TOKEN, QUERY_COUNT_HEADER
+from infrastructure.env_variable import DB_POOL_PREWARM, WARMUP_RETRY_SECONDS
+from fastapi.responses import Response, ORJSONResponse
+from infrastructure.visit.ingest_buffer import visit_ingest_buffer
+from infrastructure.like.like_buffer import like_buffer
+from infrastructure.cache.invalidation_bus import invalidation_bus
+from infrastructure.cache.bus_transport import transport_from_url
+from contextlib import asynccontextmanager
+from time import perf_counter
+import asyncio
+import logging
+
+if SENTRY_DSN:
+    # Imported only when configured, the SDK and its integrations add about 100ms to every start
+    import sentry_sdk
+    sentry_sdk.init(
+        dsn=SENTRY_DSN,
+        traces_sampler=traces_sampler,
+        **profiling_options(SENTRY_PROFILING),
+    )
+
+if DATABASE_MODE == "async":
+    from adapter.input.async_post_router import router as post_router
+    from adapter.input.async_blog_router import router as blog_router
+    from infrastructure.sqlalchemy.async_config import async_engine, async_read_engine
+    watch_pool("async_primary", async_engine.pool)
+    if async_read_engine is not None:
+        watch_pool("async_replica", async_read_engine.pool)
+else:
+    post_router, blog_router = sync_post_router, sync_blog_router
+
+# The sync pool serves the background flushers in both modes
+watch_pool("primary", engine.pool)
+if read_engine is not None:
+    watch_pool("replica", read_engine.pool)
 
 docs_url = None if SERVER_ENV == "Product" else "/docs"
 redoc_url = None if SERVER_ENV == "Product" else "/redoc"
 openapi_url = None if SERVER_ENV == "Product" else "/openapi.json"
 
+def load_search_index() -> None:
+    loaded = post_search_index.load()
+    logger.info(f"Search index {'loaded' if loaded else 'built'}, {sync_search_index()} posts (re)indexed, {len(post_search_index)} total")
+
+async def warm_up() -> None:
+    """Runs after startup while /readyz answers 503, retried until the database answers"""
+    while True:
+        try:
+            with readiness.step("pool"):
+                opened = await asyncio.to_thread(prewarm_pool, engine, DB_POOL_PREWARM)
+                if read_engine is not None:
+                    opened += await asyncio.to_thread(prewarm_pool, read_engine, DB_POOL_PREWARM)
+                if DATABASE_MODE == "async":
+                    opened += await prewarm_async_pool(async_engine, DB_POOL_PREWARM)
+                    if async_read_engine is not None:
+                        opened += await prewarm_async_pool(async_read_engine, DB_POOL_PREWARM)
+            logger.info(f"{opened} pool connections opened")
+            with readiness.step("hot_paths"):
+                await asyncio.to_thread(prime_hot_paths)
+            # The bus is already running, so an edit made elsewhere while this runs is re-indexed rather than missed
+            with readiness.step("search_index"):
+                await asyncio.to_thread(load_search_index)
+            readiness.mark_ready()
+            return
+        except Exception as e:
+            readiness.mark_failed(e)
+            logger.error(f"❌ Warmup failed, retrying in {WARMUP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    visit_ingest_buffer.configure(flush_handler=flush_visit_buffer, seed_loader=load_visitor_ips)
+    visit_ingest_buffer.start()
+    like_buffer.configure(flush_handler=flush_like_buffer)
+    like_buffer.start()
+    if CACHE_BUS_URL:
+        invalidation_bus.configure(transport=transport_from_url(CACHE_BUS_URL), handler=apply_remote_post_change)
+        invalidation_bus.start()
+    # The server accepts connections only once this yields, so warmup runs beside it and /readyz gates the traffic
+    warmup = asyncio.create_task(warm_up())
+    yield
+    warmup.cancel()
+    on_demand_profiler.stop()
+    like_buffer.stop()
+    # After the like buffer, so its last flush still reaches the other workers
+    invalidation_bus.stop()
+    visit_ingest_buffer.stop()
+    # A half-built index is not worth keeping, the next start rebuilds it
+    if readiness.ready:
+        post_search_index.save()
+    if DATABASE_MODE == "async":
+        await async_engine.dispose()
+        if async_read_engine is not None:
+            await async_read_engine.dispose()
+
 app = FastAPI(
     title="My Blog API",
     description="A FastAPI backend for managing blog posts and user interactions.",
@@ -35,6 +128,8 @@ app = FastAPI(
     docs_url=docs_url,  
     redoc_url=redoc_url, 
     openapi_url=openapi_url,  
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -46,6 +141,7 @@ app.add_middleware(
 )
 
 @app.options("/{full_path:path}")
+@query_budget(0)
 async def preflight_handler(full_path: str):
     response = Response(status_code=204)
     return response
@@ -70,10 +166,56 @@ async def security_headers_middleware(request: Request, call_next):
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"Request: {request.method} {request.url}")
-    response = await call_next(request)
-    logger.info(f"Response: {response.status_code}")
-    return response
+    logging_enabled = access_logger.isEnabledFor(logging.INFO)
+    if not logging_enabled and not SENTRY_DSN and not METRICS_ENABLED and not QUERY_COUNT_HEADER:
+        return await call_next(request)
+
+    query_stats = QueryStats(record_statements=QUERY_COUNT_HEADER, parent=current_query_stats.get())
+    token = current_query_stats.set(query_stats)
+    started = perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        if QUERY_COUNT_HEADER:
+            response.headers[QUERY_COUNT_HEADER_NAME] = str(query_stats.count)
+        return response
+    finally:
+        current_query_stats.reset(token)
+        duration_ms = (perf_counter() - started) * 1000
+        # The matched route's template keeps ids out of the field, unmatched requests fall back to the raw path
+        route = request.scope.get("route")
+        if QUERY_COUNT_HEADER:
+            budget = budget_for(route)
+            if budget is not None and query_stats.count > budget:
+                logger.warning(f"{request.method} {route.path} issued {query_stats.count} SQL statements, over its budget of {budget}: "
+                               + " | ".join(query_stats.statements))
+        if METRICS_ENABLED:
+            route_label = route.path if route is not None else UNMATCHED_ROUTE
+            http_request_duration.observe(duration_ms / 1000, (request.method, route_label))
+            http_requests.inc((request.method, route_label, str(status_code)))
+        if SENTRY_DSN:
+            traces_sampler.observe(route.path if route is not None else None, status_code, duration_ms)
+        path = route.path if route is not None else request.url.path
+        sample_rate = access_log_sampler.sample_rate(request.method, path, status_code, duration_ms) if logging_enabled else 0
+        if sample_rate:
+            access_logger.info("%s %s %s", request.method, path, status_code, extra={
+                "method": request.method,
+                "path": path,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 2),
+                "db_ms": round(query_stats.seconds * 1000, 2),
+                "db_queries": query_stats.count,
+                "pool_wait_ms": round(getattr(request.state, "pool_wait", 0.0) * 1000, 2),
+                "sample_rate": sample_rate,
+            })
 
 app.include_router(post_router, tags=["Post API"])
-app.include_router(blog_router, tags=["Blog API"])
\ No newline at end of file
+app.include_router(blog_router, tags=["Blog API"])
+app.include_router(ops_router)
+app.include_router(health_router)
+if METRICS_ENABLED and SERVER_ENV == "Product" and not METRICS_TOKEN:
+    logger.warning("METRICS_ENABLED without METRICS_TOKEN, /metrics is not mounted in Product")
+elif METRICS_ENABLED:
+    app.include_router(metrics_router)
+traces_sampler.bind(app.routes)
\ No newline at end of file
@@ -0,0 +1,44 @@
+from core.async_usecase import AsyncPostUseCase
+from core.validator import Validator
+from core.domain import Category
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse
+
+class AsyncPostApplicationService:
+    def __init__(self, usecase: AsyncPostUseCase):
+        self.usecase = usecase
+
+    async def create_post(self, post_create_request: PostCreateRequest) -> PostCreateResponse:
+        return await self.usecase.create_post(post_create_request)
+
+    async def delete_post(self, post_id:str, authentication_code) -> None:
+        await self.usecase.delete_post(post_id, authentication_code)
+
+    async def update_post(self, post_id:str, post_update_request: PostUpdateRequest) -> PostUpdateResponse:
+        return await self.usecase.update_post(post_id, post_update_request)
+
+    async def get_post_detail(self, post_id:str) -> dict:
+        return await self.usecase.get_post_detail(post_id)
+
+    async def get_post_detail_with_validator(self, post_id:str) -> tuple:
+        return await self.usecase.get_post_detail_with_validator(post_id)
+
+    async def get_post_validator(self, post_id:str) -> Validator:
+        return await self.usecase.get_post_validator(post_id)
+
+    async def get_detail_cache_stats(self, authentication_code:str) -> dict:
+        return await self.usecase.get_detail_cache_stats(authentication_code)
+
+    async def add_like_post(self, post_id:str) -> None:
+        await self.usecase.add_like_post(post_id)
+    
+    async def get_post_page(self, limit:int, cursor:str | None = None, category:Category | None = None) -> dict:
+        return await self.usecase.get_post_page(limit, cursor, category)
+    
+    async def get_category_counts(self) -> dict:
+        return await self.usecase.get_category_counts()
+    
+    async def search_posts(self, query:str, limit:int) -> list:
+        return await self.usecase.search_posts(query, limit)
+    
+    async def get_homepage_posts(self) -> dict:
+        return await self.usecase.get_homepage_posts()
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from core.validator import Validator
+from core.domain import Category
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse
+
+class AsyncPostService(ABC):
+    @abstractmethod
+    async def create_post(self, post_create_request:PostCreateRequest) -> PostCreateResponse:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_post(self, post_id:str, authentication_code:str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_post(self, post_id:str, post_update_request:PostUpdateRequest) -> PostUpdateResponse:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_post_detail(self, post_id:str) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_post_detail_with_validator(self, post_id:str) -> tuple:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_post_validator(self, post_id:str) -> Validator:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_detail_cache_stats(self, authentication_code:str) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_like_post(self, post_id:str) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_post_page(self, limit:int, cursor:str | None = None, category:Category | None = None) -> dict:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_category_counts(self) -> dict:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def search_posts(self, query:str, limit:int) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_homepage_posts(self) -> dict:
+        raise NotImplementedError
@@ -0,0 +1,12 @@
+from core.async_usecase import AsyncVisitUseCase
+from adapter.dto.visit_dto import VisitCreateRequest
+
+class AsyncVisitApplicationService:
+    def __init__(self, usecase: AsyncVisitUseCase):
+        self.usecase = usecase
+        
+    async def create_visit(self, visit_create_request:VisitCreateRequest) -> None:
+        await self.usecase.create_visit(visit_create_request)
+        
+    async def get_visitor_stats(self) -> dict:
+        return await self.usecase.get_visitor_stats()
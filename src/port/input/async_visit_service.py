@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from adapter.dto.visit_dto import VisitCreateRequest
+
+class AsyncVisitService(ABC):
+    @abstractmethod
+    async def create_visit(self, visit_create_request:VisitCreateRequest) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_visitor_stats(self) -> dict:
+        raise NotImplementedError
@@ -1,6 +1,7 @@
 from core.usecase import PostUseCase
-from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse, PostDetailResponse
-from core.domain import Post
+from core.validator import Validator
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse
+from core.domain import Post, Category
 
 class PostApplicationService:
     def __init__(self, usecase: PostUseCase):
@@ -15,18 +16,30 @@ class PostApplicationService:
     def update_post(self, post_id:str, post_update_request: PostUpdateRequest) -> PostUpdateResponse:
         return self.usecase.update_post(post_id, post_update_request)
 
-    def get_post_detail(self, post_id:str) -> PostDetailResponse:
+    def get_post_detail(self, post_id:str) -> dict:
         return self.usecase.get_post_detail(post_id)
 
+    def get_post_detail_with_validator(self, post_id:str) -> tuple:
+        return self.usecase.get_post_detail_with_validator(post_id)
+
+    def get_post_validator(self, post_id:str) -> Validator:
+        return self.usecase.get_post_validator(post_id)
+
+    def get_detail_cache_stats(self, authentication_code:str) -> dict:
+        return self.usecase.get_detail_cache_stats(authentication_code)
+
     def add_like_post(self, post_id:str) -> None:
         self.usecase.add_like_post(post_id)
 
-    def get_all_post(self) -> list:
-        return self.usecase.get_all_post()
+    def get_post_page(self, limit:int, cursor:str | None = None, category:Category | None = None) -> dict:
+        return self.usecase.get_post_page(limit, cursor, category)
+    
+    def get_category_counts(self) -> dict:
+        return self.usecase.get_category_counts()
     
-    def get_popular_posts(self) -> list:
-        return self.usecase.get_popular_posts()
+    def search_posts(self, query:str, limit:int) -> list:
+        return self.usecase.search_posts(query, limit)
     
-    def get_latest_posts(self) -> list:
-        return self.usecase.get_latest_posts()
+    def get_homepage_posts(self) -> dict:
+        return self.usecase.get_homepage_posts()
 
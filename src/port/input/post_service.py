@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse, PostDetailResponse
-from adapter.dto.blog_dto import PostDetail, PostSummary
+from core.validator import Validator
+from core.domain import Category
+from adapter.dto.post_dto import PostCreateRequest, PostCreateResponse, PostUpdateRequest, PostUpdateResponse
+from adapter.dto.blog_dto import PostSummary
 from typing import List
 
 class PostService(ABC):
@@ -17,7 +19,19 @@ class PostService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_post_detail(self, post_id:str) -> PostDetailResponse:
+    def get_post_detail(self, post_id:str) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_post_detail_with_validator(self, post_id:str) -> tuple:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_post_validator(self, post_id:str) -> Validator:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_detail_cache_stats(self, authentication_code:str) -> dict:
         raise NotImplementedError
 
     @abstractmethod
@@ -25,13 +39,17 @@ class PostService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_all_post(self) -> List[PostDetail]:
+    def get_post_page(self, limit:int, cursor:str | None = None, category:Category | None = None) -> dict:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def get_category_counts(self) -> dict:
         raise NotImplementedError
     
     @abstractmethod
-    def get_popular_posts(self) -> List[PostSummary]:
+    def search_posts(self, query:str, limit:int) -> List[PostSummary]:
         raise NotImplementedError
     
     @abstractmethod
-    def get_latest_posts(self) -> List[PostSummary]:
+    def get_homepage_posts(self) -> dict:
         raise NotImplementedError
\ No newline at end of file
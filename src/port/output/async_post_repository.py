@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from infrastructure.sqlalchemy.model import Post
+from core.pagination import PostCursor
+
+class AsyncPostRepository(ABC):
+    @abstractmethod
+    async def save(self, post:Post) -> Post:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def delete_by_id(self, post_id:str) -> str:
+        """Return the deleted post's category"""
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def find_by_id(self, post_id:str) -> Post:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def find_version_by_id(self, post_id:str):
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def update_post_likes_by_id(self, post_id:str) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_homepage_rows(self, limit:int, popular_limit:int) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_posts_page(self, limit:int, cursor:PostCursor | None = None, category:str | None = None) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def count_posts_by_category(self) -> dict:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def find_summaries_by_ids(self, post_ids:list) -> list:
+        raise NotImplementedError
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+
+class AsyncVisitRepository(ABC):
+    @abstractmethod
+    async def get_today_visitor_count(self) -> int:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_total_visitor_count(self) -> int:
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def get_visitor_sketch_estimate(self, sketch_key:str) -> int:
+        raise NotImplementedError
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from infrastructure.sqlalchemy.model import Post
+from core.pagination import PostCursor
 
 class PostRepository(ABC):
     @abstractmethod
@@ -7,25 +8,46 @@ class PostRepository(ABC):
         raise NotImplementedError
     
     @abstractmethod
-    def delete_by_id(self, post_id:str) -> None:
+    def delete_by_id(self, post_id:str) -> str:
+        """Return the deleted post's category"""
         raise NotImplementedError
     
     @abstractmethod
     def find_by_id(self, post_id:str) -> Post:
         raise NotImplementedError
     
+    @abstractmethod
+    def find_version_by_id(self, post_id:str):
+        raise NotImplementedError
+    
     @abstractmethod
     def update_post_likes_by_id(self, post_id:str) -> None:
         raise NotImplementedError
     
     @abstractmethod
-    def get_all_post(self) -> list:
+    def update_posts_likes(self, deltas:dict) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def get_homepage_rows(self, limit:int, popular_limit:int) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def get_posts_page(self, limit:int, cursor:PostCursor | None = None, category:str | None = None) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def count_posts_by_category(self) -> dict:
         raise NotImplementedError
     
     @abstractmethod
-    def get_popular_posts(self) -> list:
+    def find_summaries_by_ids(self, post_ids:list) -> list:
         raise NotImplementedError
     
     @abstractmethod
-    def get_latest_posts(self) -> list:
-        raise NotImplementedError
\ No newline at end of file
+    def get_post_versions(self) -> list:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def find_search_documents(self, post_ids:list) -> list:
+        raise NotImplementedError
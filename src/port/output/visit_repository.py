@@ -1,11 +1,36 @@
 from abc import ABC, abstractmethod
 from infrastructure.sqlalchemy.model import VisitLog
+from datetime import date
 
 class VisitRepository(ABC):
     @abstractmethod
     def save(self, visit_log:VisitLog) -> VisitLog:
         raise NotImplementedError
     
+    @abstractmethod
+    def save_all(self, visit_logs:list, record_stats:bool = True) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def merge_visitor_sketches(self, sketches:dict) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def get_visitor_sketch_estimate(self, sketch_key:str) -> int:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def rebuild_visitor_stats(self) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def iter_visits(self, batch_size:int = 10000):
+        raise NotImplementedError
+    
+    @abstractmethod
+    def find_visitor_ips_by_date(self, visit_date:date) -> list:
+        raise NotImplementedError
+    
     @abstractmethod
     def exist_by_ip_and_date(self, ip) -> VisitLog:
         raise NotImplementedError